@@ -3,33 +3,181 @@ API client for handling authentication and API communication.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import sys
 import json
+import gzip
+import time
+import base64
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 
 # Import configuration
 sys.path.append('..')
 import config
+from utils.cache import StaleWhileRevalidateCache
+from utils.metrics import HTTP_ERRORS, UPLOADED_VIDEOS, stage_timer
+
+# Headers similar to successful Postman request
+DEFAULT_HEADERS = {
+    'Accept': '*/*',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'User-Agent': 'PythonRequests'
+}
+
+class AuthenticationError(Exception):
+    """
+    Raised when the API client cannot obtain an access token.
+    """
+
+class ApiClient:
+    """
+    Client for the backend API with a long-lived pooled session and a cached access token.
+    
+    The token is reused until shortly before it expires. Concurrent callers that need
+    a new token wait for a single sign-in instead of each signing in themselves, and a
+    request answered with 401 refreshes the token and is retried once.
+    """
+    
+    def __init__(self, pool_size: int = None):
+        """
+        Args:
+            pool_size (int): Keep-alive connections kept per host
+        """
+        # Use configuration default if not provided
+        if pool_size is None:
+            pool_size = max(4, config.UPLOAD_PARALLELISM)
+        
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        self._token: Optional[str] = None
+        self._token_expires_at = 0.0
+        self._token_lock = threading.Lock()
+    
+    def get_token(self, force_refresh: bool = False, rejected_token: str = None) -> Optional[str]:
+        """
+        Returns a valid access token, signing in only if the cached one is missing or expired.
+        
+        Args:
+            force_refresh (bool): Sign in even if the cached token has not expired
+            rejected_token (str): Token the API just rejected; if another caller already
+                                  replaced it, the new token is returned without signing in
+        
+        Returns:
+            str: Authentication token or None on error
+        """
+        with self._token_lock:
+            if self._token and rejected_token is not None and self._token != rejected_token:
+                return self._token
+            
+            if self._token and not force_refresh and time.time() < self._token_expires_at:
+                return self._token
+            
+            self._token = None
+            self._token_expires_at = 0.0
+            
+            try:
+                with stage_timer("auth"):
+                    response = self.session.post(config.API_URL_TO_AUTHENTICATE, json=config.API_USER, timeout=30)
+                if response.status_code == 200:
+                    token = response.json().get('accessToken')
+                    if token:
+                        self._token = token
+                        # Refresh a little early so a token does not expire mid-request
+                        self._token_expires_at = _token_expiry(token) - config.API_TOKEN_REFRESH_MARGIN
+                        print("Authenticated with the API.")
+                    return token
+                else:
+                    HTTP_ERRORS.inc(target="api_auth", status=str(response.status_code))
+                    print(f"Authentication error: {response.status_code} - {response.text}")
+                    return None
+            except Exception as e:
+                HTTP_ERRORS.inc(target="api_auth", status=type(e).__name__)
+                print(f"Error during authentication: {str(e)}")
+                return None
+    
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Sends an authenticated request, refreshing the token and retrying once on 401.
+        
+        Args:
+            method (str): HTTP method
+            url (str): Request URL
+            **kwargs: Passed to requests.Session.request
+        
+        Returns:
+            requests.Response: API response
+        
+        Raises:
+            AuthenticationError: If no token could be obtained
+            requests.RequestException: If the request fails before returning a response
+        """
+        extra_headers = kwargs.pop('headers', None) or {}
+        
+        token = self.get_token()
+        for attempt in range(2):
+            if not token:
+                raise AuthenticationError("Could not get token")
+            
+            headers = dict(extra_headers)
+            headers['x-access-token'] = token
+            headers['Cookie'] = f'accessToken={token}'
+            
+            response = self.session.request(method, url, headers=headers, **kwargs)
+            if response.status_code != 401 or attempt:
+                return response
+            
+            print("API returned 401, refreshing token and retrying.")
+            token = self.get_token(force_refresh=True, rejected_token=token)
+        
+        return response
+
+def _token_expiry(token: str) -> float:
+    """
+    Reads the expiry time of a JWT access token.
+    
+    Returns:
+        float: Expiry in epoch seconds; API_TOKEN_TTL from now if the token has no readable "exp" claim
+    """
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))['exp'])
+    except Exception:
+        return time.time() + config.API_TOKEN_TTL
+
+_client: Optional[ApiClient] = None
+_client_lock = threading.Lock()
+
+def get_api_client() -> ApiClient:
+    """
+    Returns the process-wide API client, creating it on first use.
+    
+    Returns:
+        ApiClient: Shared client
+    """
+    global _client
+    
+    with _client_lock:
+        if _client is None:
+            _client = ApiClient()
+        return _client
 
 def authenticate() -> Optional[str]:
     """
-    Authenticates with the API and gets an access token.
+    Gets an access token, reusing the cached token of the shared client while it is valid.
     
     Returns:
         str: Authentication token or None on error
     """
-    try:
-        response = requests.post(config.API_URL_TO_AUTHENTICATE, json=config.API_USER)
-        if response.status_code == 200:
-            data = response.json()
-            print(data.get('accessToken'))
-            return data.get('accessToken')
-        else:
-            print(f"Authentication error: {response.status_code} - {response.text}")
-            return None
-    except Exception as e:
-        print(f"Error during authentication: {str(e)}")
-        return None
+    return get_api_client().get_token()
 
 def get_courses_from_api() -> Optional[List[Dict[str, Any]]]:
     """
@@ -38,78 +186,153 @@ def get_courses_from_api() -> Optional[List[Dict[str, Any]]]:
     Returns:
         list: List containing school, course, and lecture information or None on error
     """
-    token = authenticate()
-    if not token:
-        print("Could not get token. Unable to retrieve schools and courses.")
-        return None
-    
     try:
-        # Add headers similar to successful Postman request
-        headers = {
-            'x-access-token': token,
-            'Cookie': f'accessToken={token}',
-            'Accept': '*/*',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'User-Agent': 'PythonRequests'
-        }
-        
         print(f"Sending API request: {config.API_URL_TO_GET_COURSES}")
-        print(f"Token: {token}")
         
-        response = requests.get(config.API_URL_TO_GET_COURSES, headers=headers)
+        with stage_timer("courses_fetch"):
+            response = get_api_client().request('GET', config.API_URL_TO_GET_COURSES, timeout=60)
         
         print(f"API response: Status Code: {response.status_code}")
         
         if response.status_code == 200:
             return response.json()
         else:
+            HTTP_ERRORS.inc(target="api_courses", status=str(response.status_code))
             print(f"Error getting schools and courses: {response.status_code} - {response.text}")
             return None
+    except AuthenticationError:
+        print("Could not get token. Unable to retrieve schools and courses.")
+        return None
     except Exception as e:
+        HTTP_ERRORS.inc(target="api_courses", status=type(e).__name__)
         print(f"Error during API request for schools and courses: {str(e)}")
         return None
 
-def save_lecture_videos_to_api(lecture_videos: List[Dict[str, Any]]) -> bool:
+_courses_cache = StaleWhileRevalidateCache(
+    get_courses_from_api, config.COURSES_CACHE_TTL, config.COURSES_CACHE_MAX_STALE, name="courses"
+)
+
+def get_courses_cached(force_refresh: bool = False, allow_stale: bool = True) -> Optional[List[Dict[str, Any]]]:
+    """
+    Gets school, course, and lecture information, reusing a recent response.
+    
+    Concurrent callers share a single upstream request. An expired tree is served
+    while one background refresh runs, unless `allow_stale` is False.
+    
+    Args:
+        force_refresh (bool): Fetch the tree again even if the cached one is fresh
+        allow_stale (bool): Accept an expired tree instead of waiting for the refresh
+    
+    Returns:
+        list: List containing school, course, and lecture information or None on error
+    """
+    return _courses_cache.get(force_refresh=force_refresh, allow_stale=allow_stale)
+
+def save_lecture_videos_to_api(lecture_videos: List[Dict[str, Any]], chunk_size: int = None) -> Dict[str, Any]:
     """
-    Saves prepared lecture videos to the API.
+    Saves prepared lecture videos to the API in gzip-compressed chunks.
+    
+    Chunks of `chunk_size` videos are sent in parallel (UPLOAD_PARALLELISM at a time)
+    over a pooled session. Each chunk is retried on its own with exponential backoff,
+    so one failing chunk does not throw away the others.
     
     Args:
         lecture_videos (list): List of lecture videos to save
+        chunk_size (int): Number of videos per request
         
     Returns:
-        bool: True if successful, False otherwise
+        dict: Upload report with "success" (True if every chunk was saved),
+              "chunk_size", "chunks" (per-chunk "index", "start", "end", "ok",
+              "attempts", "status_code", "error") and "failed_chunks" (indexes)
     """
-    token = authenticate()
-    if not token:
+    # Use configuration default if not provided
+    if chunk_size is None:
+        chunk_size = config.UPLOAD_CHUNK_SIZE
+    chunk_size = max(1, chunk_size)
+    
+    report = {"success": False, "chunk_size": chunk_size, "chunks": [], "failed_chunks": []}
+    
+    if not authenticate():
         print("Could not get token. Unable to save videos.")
-        return False
+        report["failed_chunks"] = list(range((len(lecture_videos) + chunk_size - 1) // chunk_size))
+        return report
     
-    try:
-        # Add headers similar to successful Postman request
-        headers = {
-            'x-access-token': token,
-            'Cookie': f'accessToken={token}',
-            'Content-Type': 'application/json',
-            'Accept': '*/*',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'User-Agent': 'PythonRequests'
-        }
-        
-        print(f"Sending API request: {config.API_URL_TO_SAVE_LECTURE_VIDEOS}")
-        print(f"Number of videos to save: {len(lecture_videos)}")
-        
-        response = requests.post(config.API_URL_TO_SAVE_LECTURE_VIDEOS, json=lecture_videos, headers=headers)
+    headers = {'Content-Type': 'application/json'}
+    if config.UPLOAD_GZIP:
+        headers['Content-Encoding'] = 'gzip'
+    
+    chunks = [
+        (index, start, min(start + chunk_size, len(lecture_videos)))
+        for index, start in enumerate(range(0, len(lecture_videos), chunk_size))
+    ]
+    
+    print(f"Sending API request: {config.API_URL_TO_SAVE_LECTURE_VIDEOS}")
+    print(f"Number of videos to save: {len(lecture_videos)} in {len(chunks)} chunks")
+    
+    def send(chunk):
+        index, start, end = chunk
+        return _send_chunk(index, start, end, lecture_videos[start:end], headers)
+    
+    with stage_timer("upload"), ThreadPoolExecutor(max_workers=max(1, config.UPLOAD_PARALLELISM)) as executor:
+        report["chunks"] = list(executor.map(send, chunks))
+    
+    for chunk in report["chunks"]:
+        UPLOADED_VIDEOS.inc(chunk["end"] - chunk["start"], outcome="saved" if chunk["ok"] else "failed")
+    
+    report["failed_chunks"] = [chunk["index"] for chunk in report["chunks"] if not chunk["ok"]]
+    report["success"] = not report["failed_chunks"]
+    
+    if report["failed_chunks"]:
+        print(f"Error saving videos: chunks {report['failed_chunks']} failed.")
+    
+    return report
+
+def _send_chunk(index: int, start: int, end: int, videos: List[Dict[str, Any]],
+                headers: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Posts one chunk of lecture videos, retrying network errors, 429 and 5xx responses with backoff.
+    
+    Returns:
+        dict: Chunk report
+    """
+    body = json.dumps(videos, ensure_ascii=False).encode("utf-8")
+    if config.UPLOAD_GZIP:
+        body = gzip.compress(body)
+    
+    chunk_report = {"index": index, "start": start, "end": end, "ok": False,
+                    "attempts": 0, "status_code": None, "error": None}
+    
+    for attempt in range(config.UPLOAD_MAX_RETRIES + 1):
+        if attempt:
+            # Exponential backoff with jitter so parallel chunks do not retry in lockstep
+            time.sleep(config.UPLOAD_RETRY_BACKOFF * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5))
+        chunk_report["attempts"] = attempt + 1
         
-        print(f"API response: Status Code: {response.status_code}")
+        try:
+            with stage_timer("upload_chunk"):
+                response = get_api_client().request(
+                    'POST', config.API_URL_TO_SAVE_LECTURE_VIDEOS, data=body, headers=headers, timeout=config.UPLOAD_TIMEOUT
+                )
+        except (requests.RequestException, AuthenticationError) as e:
+            HTTP_ERRORS.inc(target="api_save", status=type(e).__name__)
+            chunk_report["error"] = str(e)
+            print(f"Error during API request to save chunk {index}: {str(e)}")
+            continue
+        
+        chunk_report["status_code"] = response.status_code
         
         if response.status_code == 200:
-            print(f"API response: {response.json()}")
-            return True
-        else:
-            print(f"Error saving videos: {response.status_code} - {response.text}")
-            return False
-    except Exception as e:
-        print(f"Error during API request to save videos: {str(e)}")
-        return False 
\ No newline at end of file
+            chunk_report["ok"] = True
+            chunk_report["error"] = None
+            print(f"Chunk {index} ({end - start} videos) saved. API response: {response.text[:200]}")
+            return chunk_report
+        
+        chunk_report["error"] = response.text[:500]
+        HTTP_ERRORS.inc(target="api_save", status=str(response.status_code))
+        print(f"Error saving chunk {index}: {response.status_code} - {response.text[:200]}")
+        
+        # Other client errors will not succeed on retry
+        if response.status_code < 500 and response.status_code != 429:
+            break
+    
+    return chunk_report
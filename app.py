@@ -3,16 +3,19 @@ Flask application for YouTube embedding service.
 """
 
 import os
-import json
-from flask import Flask, jsonify, request
-from api.client import get_courses_from_api, save_lecture_videos_to_api
-from youtube.processor import get_lecture_videos
-from utils.scheduler import save_results_to_json
-import threading
+from flask import Flask, Response, jsonify, request
+from api.client import get_courses_cached
+from utils.crawler_process import CrawlerCancelled, run_crawl
+from utils.jobs import Job, JobManager
+from utils.metrics import REGISTRY, metrics_summary
+from utils.video_index import VideoIndex
 import time
 
 app = Flask(__name__)
 
+# Found videos, kept in memory and reloaded when the file changes
+video_index = VideoIndex("lecture_videos.json")
+
 # Global variable to store the last job result
 last_job_result = {
     "status": "No job run yet",
@@ -20,9 +23,22 @@ last_job_result = {
     "video_count": 0
 }
 
-def run_job():
+def run_job(job: Job = None):
     """
     Main job function to search for YouTube videos and save them to the API.
+    
+    The courses are fetched here (sharing the /api/courses cache); the search runs in
+    the crawler process, see utils.crawler_process.
+    
+    Args:
+        job (Job): Job this run belongs to, used to report progress and to cancel the search
+    
+    Returns:
+        dict: Result of the run (also stored in last_job_result)
+    
+    Raises:
+        CrawlerCancelled: If the job was cancelled
+        RuntimeError: If the schools could not be fetched or the crawl failed
     """
     global last_job_result
     
@@ -30,44 +46,33 @@ def run_job():
     print(f"Starting YouTube video search process... {start_time}")
     
     try:
-        # Get schools on each run (to refresh token)
-        current_schools = get_courses_from_api()
+        # Get schools on each run (a tree fetched within COURSES_CACHE_TTL is reused)
+        current_schools = get_courses_cached(allow_stale=False)
         
         if not current_schools:
-            last_job_result = {
-                "status": "Error: Could not get schools",
-                "timestamp": time.strftime('%Y-%m-%d %H:%M:%S'),
-                "video_count": 0
-            }
-            return
-        
-        # Search for YouTube videos for all schools and lectures
-        print("Searching for YouTube videos for all schools and lectures...")
+            # Raised so the job is marked as failed; recorded as "Error: Could not get schools" below
+            raise RuntimeError("Could not get schools")
         
-        # Search for videos per lecture
-        lecture_videos = get_lecture_videos(current_schools, max_results_per_lecture=10)
+        # Search for videos and save the changed ones in the crawler process
+        result = run_crawl(
+            current_schools,
+            progress=job.update_progress if job else None,
+            cancel_event=job.cancel_event if job else None
+        )
         
-        # Show results
-        print(f"\nFound a total of {len(lecture_videos)} videos.")
+        last_job_result = dict(result, timestamp=time.strftime('%Y-%m-%d %H:%M:%S'))
         
-        # Save results to API
-        if lecture_videos:
-            save_result = save_lecture_videos_to_api(lecture_videos)
-            status = "Success" if save_result else "Error saving to API"
-        else:
-            status = "No videos found"
-            
-        # Optional: Save results to JSON
-        save_results_to_json(lecture_videos)
+        print(f"Process completed. {time.strftime('%Y-%m-%d %H:%M:%S')}")
+        return last_job_result
         
+    except CrawlerCancelled as e:
         last_job_result = {
-            "status": status,
+            "status": "Cancelled",
             "timestamp": time.strftime('%Y-%m-%d %H:%M:%S'),
-            "video_count": len(lecture_videos)
+            "video_count": 0
         }
-        
-        print(f"Process completed. {time.strftime('%Y-%m-%d %H:%M:%S')}")
-        
+        print(f"Job cancelled: {str(e)}")
+        raise
     except Exception as e:
         last_job_result = {
             "status": f"Error: {str(e)}",
@@ -75,6 +80,10 @@ def run_job():
             "video_count": 0
         }
         print(f"Error in job: {str(e)}")
+        raise
+
+# Runs one crawl at a time; triggers during a run coalesce into one queued run
+job_manager = JobManager(run_job)
 
 @app.route('/')
 def home():
@@ -82,8 +91,11 @@ def home():
         "service": "YouTube Embed API",
         "status": "running",
         "endpoints": [
-            "/status - Get the status of the last job",
+            "/status - Get the status of the last job and the progress of the running one",
             "/run - Trigger a new job",
+            "/jobs/<job_id> - Get a job",
+            "/jobs/<job_id>/cancel - Cancel a job",
+            "/metrics - Stage timings and counters in the Prometheus text format",
             "/api/courses - Get courses from the API",
             "/api/videos - Get found videos"
         ]
@@ -91,31 +103,85 @@ def home():
 
 @app.route('/status')
 def status():
-    return jsonify(last_job_result)
+    jobs = job_manager.snapshot()
+    return jsonify(dict(
+        last_job_result,
+        current_job=jobs["current"].to_dict() if jobs["current"] else None,
+        queued_job=jobs["queued"].to_dict() if jobs["queued"] else None,
+        metrics=metrics_summary()
+    ))
+
+@app.route('/metrics')
+def metrics():
+    # Prometheus text exposition format
+    return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
 
 @app.route('/run', methods=['POST'])
 def trigger_job():
-    # Start the job in a separate thread to avoid blocking the request
-    thread = threading.Thread(target=run_job)
-    thread.daemon = True
-    thread.start()
-    return jsonify({"status": "Job started", "timestamp": time.strftime('%Y-%m-%d %H:%M:%S')})
+    # Start the job in the background, or coalesce into the run queued behind the active one
+    job = job_manager.submit()
+    return jsonify({
+        "status": "Job started" if job.status == "running" else "Job queued",
+        "job_id": job.id,
+        "timestamp": time.strftime('%Y-%m-%d %H:%M:%S')
+    }), 202
+
+@app.route('/jobs/<job_id>')
+def get_job(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    return jsonify(job.to_dict())
 
 @app.route('/api/courses')
 def get_courses():
-    courses = get_courses_from_api()
+    force_refresh = request.args.get('refresh', '').lower() == 'true'
+    courses = get_courses_cached(force_refresh=force_refresh)
     if courses:
         return jsonify(courses)
     return jsonify({"error": "Could not get courses"}), 500
 
 @app.route('/api/videos')
 def get_videos():
+    # Optional filtering and pagination: ?lectureId=...&offset=...&limit=...
+    lecture_id = request.args.get('lectureId')
     try:
-        with open("lecture_videos.json", "r") as f:
-            videos = json.load(f)
-        return jsonify(videos)
+        offset = int(request.args.get('offset', 0))
+        limit = request.args.get('limit')
+        limit = int(limit) if limit is not None else None
+    except ValueError:
+        return jsonify({"error": "offset and limit must be integers"}), 400
+    if offset < 0 or (limit is not None and limit < 0):
+        return jsonify({"error": "offset and limit must not be negative"}), 400
+    
+    try:
+        result = video_index.query(lecture_id=lecture_id, offset=offset, limit=limit)
     except Exception as e:
         return jsonify({"error": f"Could not get videos: {str(e)}"}), 500
+    
+    headers = {
+        "ETag": result["etag"],
+        "X-Total-Count": str(result["total"]),
+        "Vary": "Accept-Encoding"
+    }
+    
+    # The data only changes when the file does, so clients can revalidate cheaply
+    if result["etag"] in request.headers.get("If-None-Match", ""):
+        return Response(status=304, headers=headers)
+    
+    body = result["body"]
+    if "gzip" in request.headers.get("Accept-Encoding", "") and len(body) > 1024:
+        body = video_index.gzip_body(result)
+        headers["Content-Encoding"] = "gzip"
+    
+    return Response(body, mimetype="application/json", headers=headers)
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
@@ -0,0 +1,3 @@
+"""
+Benchmarks for measuring the performance of the YouTube embedding application.
+"""
@@ -0,0 +1,80 @@
+"""
+Benchmark comparing per-query latency of cold-started Chrome sessions against a warm driver pool.
+
+Usage:
+    python -m benchmarks.driver_pool_benchmark [--queries 10] [--url URL]
+"""
+
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+from typing import Callable, List
+
+sys.path.append('..')
+from benchmarks.stats import percentile
+from youtube.driver_pool import DriverPool, create_driver
+
+DEFAULT_URL = "https://www.youtube.com/results?search_query=python+tutorial"
+
+
+def cold_query(url: str) -> None:
+    """
+    Starts a fresh Chrome, loads the page and quits, like the old per-query behaviour.
+    """
+    user_data_dir = tempfile.mkdtemp(prefix="chrome_profile_")
+    driver = create_driver(user_data_dir)
+    try:
+        driver.get(url)
+    finally:
+        driver.quit()
+        shutil.rmtree(user_data_dir, ignore_errors=True)
+
+
+def measure(run_query: Callable[[], None], queries: int) -> List[float]:
+    """
+    Runs a query function several times and returns each run's latency in seconds.
+    """
+    latencies = []
+    for _ in range(queries):
+        start = time.perf_counter()
+        run_query()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(label: str, latencies: List[float]) -> None:
+    print(f"{label:<12} mean={statistics.mean(latencies):.3f}s "
+          f"median={statistics.median(latencies):.3f}s p95={percentile(latencies, 0.95):.3f}s n={len(latencies)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queries", type=int, default=10, help="Number of queries per mode")
+    parser.add_argument("--url", default=DEFAULT_URL, help="Page loaded by every query")
+    args = parser.parse_args()
+
+    cold = measure(lambda: cold_query(args.url), args.queries)
+
+    pool = DriverPool(size=1)
+    try:
+        # Start the session once so the warm numbers exclude the first launch
+        pool.release(pool.acquire())
+
+        def warm_query() -> None:
+            with pool.driver() as driver:
+                driver.get(args.url)
+
+        warm = measure(warm_query, args.queries)
+    finally:
+        pool.close()
+
+    report("cold start", cold)
+    report("warm pool", warm)
+    print(f"Speed-up: {statistics.mean(cold) / statistics.mean(warm):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Offline end-to-end benchmark of the lecture search and the full job against the stub server.
+
+Starts benchmarks.stub_server (recorded YouTube fixtures plus the backend API) and
+runs get_lecture_videos() and main.job() against it with the HTTP search backend.
+Caches, delta sync and checkpoints are disabled so every run does the same work.
+Reports throughput, p50/p95 per-lecture latency and peak RSS. With --mode both, each
+pipeline runs in its own process, since the peak RSS (ru_maxrss) covers a whole
+process; it includes the stub server, which runs in the same process.
+
+The YouTube rate limiter is off unless --client-rate is given; with the stub's
+--rate-limit it shows how close the adaptive rate gets to the stub's limit.
+
+Usage:
+    python -m benchmarks.e2e_benchmark [--lectures 40] [--runs 3] [--workers 4]
+                                       [--latency 0.02] [--jitter 0.01] [--error-rate 0.0]
+                                       [--rate-limit 0] [--client-rate 0] [--mode both]
+"""
+
+import io
+import os
+import sys
+import time
+import shutil
+import socket
+import argparse
+import tempfile
+import resource
+import threading
+import subprocess
+from contextlib import redirect_stdout
+from typing import Callable, Dict, List
+
+sys.path.append('..')
+from benchmarks.stats import percentile
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux, and the peak since the process started
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def configure(base_url: str, workers: int, client_rate: float, work_dir: str) -> None:
+    """
+    Points the application at the stub server. Must run before the application modules are imported.
+    """
+    os.environ.update({
+        "YOUTUBE_BASE_URL": base_url,
+        "API_BASE_URL": base_url,
+        "SEARCH_BACKEND": "http",
+        "SEARCH_FALLBACK_BACKEND": "",
+        "SEARCH_WORKERS": str(workers),
+        "EMBED_CACHE_PATH": "",
+        "LECTURE_STATE_PATH": "",
+        "CHECKPOINT_PATH": "",
+        "COURSES_CACHE_TTL": "0",
+        "YOUTUBE_RATE_LIMIT": str(client_rate),
+        "YOUTUBE_THROTTLE_BACKOFF": "1",
+        "UPLOAD_RETRY_BACKOFF": "0.1"
+    })
+    os.chdir(work_dir)
+
+
+def measure(label: str, run: Callable[[], None], runs: int, latencies: List[float],
+            lecture_count: int, verbose: bool) -> Dict[str, float]:
+    """
+    Runs a pipeline several times and summarizes its per-lecture latencies.
+    """
+    durations = []
+    latencies.clear()
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        if verbose:
+            run()
+        else:
+            with redirect_stdout(io.StringIO()):
+                run()
+        durations.append(time.perf_counter() - start)
+
+    total = sum(durations)
+    result = {
+        "runs": runs,
+        "mean_run_s": total / runs,
+        "lectures_per_s": lecture_count * runs / total if total else 0.0,
+        "p50_lecture_s": percentile(latencies, 0.50) if latencies else 0.0,
+        "p95_lecture_s": percentile(latencies, 0.95) if latencies else 0.0,
+        "peak_rss_mb": peak_rss_mb()
+    }
+    print(f"{label:<14} run={result['mean_run_s']:.2f}s throughput={result['lectures_per_s']:.1f} lectures/s "
+          f"p50={result['p50_lecture_s']:.3f}s p95={result['p95_lecture_s']:.3f}s "
+          f"peak_rss={result['peak_rss_mb']:.1f}MB n={len(latencies)}")
+    return result
+
+
+def run_benchmarks(args: argparse.Namespace, port: int) -> None:
+    # Runs a single pipeline; main() starts a process per pipeline for --mode both
+    # Imported after configure() so config picks up the stub URLs
+    import main as job_module
+    from youtube import processor
+    from benchmarks.stub_server import StubServer
+    from utils.metrics import LECTURES
+
+    latencies: List[float] = []
+    latencies_lock = threading.Lock()
+    search_lecture_videos = processor.search_lecture_videos
+
+    def timed_search(lecture, max_results):
+        start = time.perf_counter()
+        try:
+            return search_lecture_videos(lecture, max_results)
+        finally:
+            with latencies_lock:
+                latencies.append(time.perf_counter() - start)
+
+    processor.search_lecture_videos = timed_search
+
+    with StubServer(port=port, lecture_count=args.lectures, latency=args.latency,
+                    jitter=args.jitter, error_rate=args.error_rate, rate_limit=args.rate_limit) as server:
+        print(f"Stub server on {server.url}: {args.lectures} lectures, latency={args.latency}s "
+              f"jitter={args.jitter}s error_rate={args.error_rate} rate_limit={args.rate_limit}/s, "
+              f"{args.workers} workers, client rate {args.client_rate}/s")
+
+        if args.mode == "lectures":
+            measure("lecture search",
+                    lambda: processor.get_lecture_videos(server.courses, max_results_per_lecture=args.max_results),
+                    args.runs, latencies, args.lectures, args.verbose)
+
+        if args.mode == "job":
+            saved_before = server.saved_rows
+            measure("full job", job_module.job, args.runs, latencies, args.lectures, args.verbose)
+            print(f"{'':<14} rows saved by the stub API: {(server.saved_rows - saved_before) / args.runs:.0f} per run")
+
+        if args.rate_limit:
+            print(f"{'':<14} requests throttled by the stub: {server.throttled_requests}, "
+                  f"lecture searches left for the next run: {LECTURES.total(outcome='throttled'):.0f}")
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lectures", type=int, default=40, help="Lectures in the stub course tree")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per pipeline")
+    parser.add_argument("--workers", type=int, default=4, help="SEARCH_WORKERS for the runs")
+    parser.add_argument("--max-results", type=int, default=10, help="Videos searched per lecture")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds every stub response is delayed")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Maximum extra random stub delay in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of stub requests answered with 503")
+    parser.add_argument("--rate-limit", type=float, default=0.0,
+                        help="YouTube requests per second the stub answers before returning 429 (0 disables)")
+    parser.add_argument("--client-rate", type=float, default=0.0,
+                        help="Initial YOUTUBE_RATE_LIMIT of the application (0 disables the rate limiter)")
+    parser.add_argument("--mode", choices=("lectures", "job", "both"), default="both",
+                        help="Run get_lecture_videos(), the full job, or both")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline's own output")
+    args = parser.parse_args()
+
+    if args.mode == "both":
+        # One process per pipeline, so each peak RSS covers only its own pipeline
+        for mode in ("lectures", "job"):
+            completed = subprocess.run([sys.executable, "-m", "benchmarks.e2e_benchmark", *sys.argv[1:], "--mode", mode])
+            if completed.returncode:
+                sys.exit(completed.returncode)
+        return
+
+    port = free_port()
+    original_dir = os.getcwd()
+    work_dir = tempfile.mkdtemp(prefix="e2e_benchmark_")
+    configure(f"http://127.0.0.1:{port}", args.workers, args.client_rate, work_dir)
+    try:
+        run_benchmarks(args, port)
+    finally:
+        os.chdir(original_dir)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Comparison of the lazy and eager EMBED_CHECK_MODE on randomly generated result sets.
+
+Runs search_with_backend() in both modes over the same generated result pages and
+embeddability verdicts, without a browser or network, and verifies that both modes
+return the same videos. Reports how many embed checks each mode needed.
+
+Usage:
+    python -m benchmarks.embed_check_benchmark [--sets 3000] [--seed 1]
+"""
+
+import io
+import sys
+import random
+import argparse
+from contextlib import redirect_stdout
+from typing import Any, Dict, Iterator, List
+
+sys.path.append('..')
+import config
+from youtube import search
+from youtube.backends import SearchBackend
+
+
+class GeneratedBackend(SearchBackend):
+    """
+    Yields pre-generated raw result pages in the shape NEW_RESULTS_SCRIPT returns.
+    """
+
+    name = "generated"
+
+    def __init__(self, pages: List[List[Dict[str, Any]]]):
+        self.pages = pages
+
+    def search_pages(self, query: str, stats: Dict[str, float] = None) -> Iterator[List[Dict[str, Any]]]:
+        yield from self.pages
+
+
+def generate_result_set(rng: random.Random) -> Dict[str, Any]:
+    """
+    Generates result pages, verdicts and search settings for one comparison.
+
+    View counts come from a small range so ties are common, and videos repeat
+    across pages like they do on YouTube.
+    """
+    video_count = rng.randint(0, 60)
+    verdicts = {f"vid{i}": rng.random() < rng.choice([0.2, 0.5, 0.9]) for i in range(video_count)}
+    views = {video_id: rng.randint(0, 20) * rng.choice([1, 1000]) for video_id in verdicts}
+
+    pages = []
+    for _ in range(rng.randint(0, 12)):
+        page = []
+        for _ in range(rng.randint(0, 10)):
+            if not verdicts:
+                break
+            video_id = rng.choice(list(verdicts))
+            page.append({
+                "title": f"Video {video_id}",
+                "href": f"/watch?v={video_id}&pp=x",
+                "view_spans": [f"{views[video_id]} views"]
+            })
+        pages.append(page)
+
+    return {
+        "pages": pages,
+        "verdicts": verdicts,
+        "max_results": rng.randint(1, 12),
+        "min_scrolls": rng.randint(0, 4),
+        "max_scrolls": rng.randint(1, 12),
+        "adaptive_scroll": rng.random() < 0.5
+    }
+
+
+def run_search(mode: str, result_set: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Runs search_with_backend() in one EMBED_CHECK_MODE and returns its result and check count.
+    """
+    checked = []
+
+    def check_embeddable_batch(video_ids: List[str]) -> Dict[str, bool]:
+        unique_ids = list(dict.fromkeys(video_ids))
+        checked.extend(unique_ids)
+        return {video_id: result_set["verdicts"][video_id] for video_id in unique_ids}
+
+    config.EMBED_CHECK_MODE = mode
+    config.MIN_SCROLLS = result_set["min_scrolls"]
+    config.MAX_SCROLLS = result_set["max_scrolls"]
+    config.ADAPTIVE_SCROLL = result_set["adaptive_scroll"]
+    search.check_embeddable_batch = check_embeddable_batch
+
+    with redirect_stdout(io.StringIO()):
+        videos = search.search_with_backend(GeneratedBackend(result_set["pages"]), "query",
+                                            result_set["max_results"])
+    return {"video_ids": [video["video_id"] for video in videos], "checks": len(checked)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sets", type=int, default=3000, help="Number of generated result sets")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    original_check = search.check_embeddable_batch
+    settings = (config.EMBED_CHECK_MODE, config.MIN_SCROLLS, config.MAX_SCROLLS, config.ADAPTIVE_SCROLL)
+    mismatches = 0
+    checks = {"eager": 0, "lazy": 0}
+
+    try:
+        for index in range(args.sets):
+            result_set = generate_result_set(rng)
+            eager = run_search("eager", result_set)
+            lazy = run_search("lazy", result_set)
+            checks["eager"] += eager["checks"]
+            checks["lazy"] += lazy["checks"]
+
+            if eager["video_ids"] != lazy["video_ids"]:
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"Set {index}: eager {eager['video_ids']} != lazy {lazy['video_ids']}")
+    finally:
+        search.check_embeddable_batch = original_check
+        config.EMBED_CHECK_MODE, config.MIN_SCROLLS, config.MAX_SCROLLS, config.ADAPTIVE_SCROLL = settings
+
+    saved = 1 - checks["lazy"] / checks["eager"] if checks["eager"] else 0
+    print(f"{args.sets} result sets, {mismatches} with different results.")
+    print(f"Embed checks: eager {checks['eager']}, lazy {checks['lazy']} ({saved:.0%} fewer).")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark of per-scroll result extraction time: full-page BeautifulSoup parsing versus incremental extraction.
+
+Loads a synthetic search results page into headless Chrome and appends a batch of
+result items per simulated scroll. Full parsing cost grows with the number of items
+on the page, while incremental extraction should stay flat.
+
+Usage:
+    python -m benchmarks.extraction_benchmark [--scrolls 30] [--items-per-scroll 20]
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+import shutil
+
+sys.path.append('..')
+from youtube.driver_pool import create_driver
+from youtube.parsing import NEW_RESULTS_SCRIPT, extract_result_items, parse_result_item
+
+# Appends `count` result items shaped like YouTube's search result renderers
+ADD_ITEMS_SCRIPT = """
+const count = arguments[0];
+const start = document.querySelectorAll('div#dismissible').length;
+const container = document.getElementById('contents');
+for (let i = start; i < start + count; i++) {
+    const item = document.createElement('ytd-video-renderer');
+    item.innerHTML =
+        '<div id="dismissible" class="style-scope ytd-video-renderer">' +
+        '<div class="text-wrapper style-scope"><div id="meta" class="style-scope">' +
+        '<a id="video-title" class="yt-simple-endpoint style-scope" title="Lecture video ' + i + '"' +
+        ' href="/watch?v=vid' + i + '&pp=abc" aria-label="Lecture video ' + i + ' by Channel ' + (i * 37) + ' views">' +
+        '<yt-formatted-string class="style-scope">Lecture video ' + i + '</yt-formatted-string></a>' +
+        '<div id="metadata-line" class="style-scope">' +
+        '<span class="inline-metadata-item style-scope">' + (i * 37) + ' views</span>' +
+        '<span class="inline-metadata-item style-scope">2 years ago</span></div>' +
+        '<div class="metadata-snippet-container style-scope">' + 'Description text. '.repeat(10) + '</div>' +
+        '</div></div></div>';
+    container.appendChild(item);
+}
+"""
+
+PAGE = "data:text/html,<html><body><div id='contents'></div></body></html>"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scrolls", type=int, default=30, help="Number of simulated scrolls (MAX_SCROLLS)")
+    parser.add_argument("--items-per-scroll", type=int, default=20, help="Result items added per scroll")
+    args = parser.parse_args()
+
+    user_data_dir = tempfile.mkdtemp(prefix="chrome_profile_")
+    driver = create_driver(user_data_dir)
+    try:
+        driver.get(PAGE)
+        print(f"{'scroll':>6} {'items':>6} {'full (ms)':>10} {'incremental (ms)':>17}")
+
+        for scroll in range(1, args.scrolls + 1):
+            driver.execute_script(ADD_ITEMS_SCRIPT, args.items_per_scroll)
+
+            start = time.perf_counter()
+            full_items = extract_result_items(driver.page_source)
+            [parse_result_item(item) for item in full_items]
+            full_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            new_items = driver.execute_script(NEW_RESULTS_SCRIPT)
+            [parse_result_item(item) for item in new_items]
+            incremental_ms = (time.perf_counter() - start) * 1000
+
+            print(f"{scroll:>6} {len(full_items):>6} {full_ms:>10.1f} {incremental_ms:>17.1f}")
+    finally:
+        driver.quit()
+        shutil.rmtree(user_data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark of search page loads in Chrome with and without blocking images, media and fonts.
+
+For each mode, the same search pages are loaded in a fresh headless Chrome. Reports
+the bytes received (from DevTools network events), the number of requests, the time
+until the first results render and the page's JS heap size.
+
+Usage:
+    python -m benchmarks.resource_blocking_benchmark [--queries 5] [--settle 3]
+"""
+
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+from typing import Dict, List
+
+sys.path.append('..')
+import config
+from youtube.backends import SeleniumSearchBackend
+from youtube.driver_pool import create_driver
+
+DEFAULT_QUERIES = [
+    "python tutorial", "linear algebra lecture", "organic chemistry basics",
+    "world history documentary", "calculus derivatives", "physics kinematics",
+    "english grammar lesson", "biology cell structure"
+]
+
+
+def network_usage(driver) -> Dict[str, int]:
+    """
+    Sums the network events logged since the last call.
+
+    Returns:
+        dict: "bytes" received, "requests" finished and "blocked" requests
+    """
+    usage = {"bytes": 0, "requests": 0, "blocked": 0}
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        if message["method"] == "Network.loadingFinished":
+            usage["bytes"] += int(message["params"].get("encodedDataLength", 0))
+            usage["requests"] += 1
+        elif message["method"] == "Network.loadingFailed" and message["params"].get("blockedReason"):
+            usage["blocked"] += 1
+    return usage
+
+
+def run_mode(block: bool, queries: List[str], settle: float) -> List[Dict[str, float]]:
+    """
+    Loads every query's search page in a new Chrome session and measures it.
+    """
+    user_data_dir = tempfile.mkdtemp(prefix="chrome_profile_")
+    driver = create_driver(user_data_dir, block_heavy_resources=block, log_network=True)
+    results = []
+
+    try:
+        for query in queries:
+            driver.get("about:blank")
+            network_usage(driver)
+
+            start = time.perf_counter()
+            driver.get(f"{config.YOUTUBE_BASE_URL}/results?search_query=" + query.replace(" ", "+"))
+            SeleniumSearchBackend._wait_for_results(driver, 0, config.PAGE_LOAD_TIMEOUT)
+            load_time = time.perf_counter() - start
+
+            # Let late requests (thumbnails, previews, fonts) arrive before counting
+            time.sleep(settle)
+            usage = network_usage(driver)
+            heap = driver.execute_script("return performance.memory ? performance.memory.usedJSHeapSize : 0;")
+
+            results.append(dict(usage, load_time=load_time, heap=heap))
+    finally:
+        driver.quit()
+        shutil.rmtree(user_data_dir, ignore_errors=True)
+
+    return results
+
+
+def report(label: str, results: List[Dict[str, float]]) -> None:
+    print(f"{label:<10} bytes={statistics.mean(r['bytes'] for r in results) / 1024:.0f}KB "
+          f"requests={statistics.mean(r['requests'] for r in results):.0f} "
+          f"blocked={statistics.mean(r['blocked'] for r in results):.0f} "
+          f"load={statistics.mean(r['load_time'] for r in results):.2f}s "
+          f"(median {statistics.median(r['load_time'] for r in results):.2f}s) "
+          f"js_heap={statistics.mean(r['heap'] for r in results) / 1024 / 1024:.1f}MB n={len(results)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queries", type=int, default=5, help="Number of search pages per mode")
+    parser.add_argument("--settle", type=float, default=3.0,
+                        help="Seconds to keep collecting requests after the first results render")
+    args = parser.parse_args()
+
+    queries = [DEFAULT_QUERIES[index % len(DEFAULT_QUERIES)] for index in range(args.queries)]
+
+    unblocked = run_mode(False, queries, args.settle)
+    blocked = run_mode(True, queries, args.settle)
+
+    report("unblocked", unblocked)
+    report("blocked", blocked)
+
+    saved = 1 - statistics.mean(r["bytes"] for r in blocked) / max(1, statistics.mean(r["bytes"] for r in unblocked))
+    print(f"Bytes saved: {saved:.0%}, load time speed-up: "
+          f"{statistics.mean(r['load_time'] for r in unblocked) / statistics.mean(r['load_time'] for r in blocked):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
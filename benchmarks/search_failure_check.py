@@ -0,0 +1,142 @@
+"""
+Check that a Selenium search whose results never render does not wipe a lecture's videos.
+
+Runs sync_lecture_videos() with delta sync on a temporary lecture state, using a
+fake WebDriver instead of Chrome. A lecture whose search page times out must end
+up failed and keep its previous videos; a lecture for which YouTube shows its
+"No results found" message must have its previous videos removed.
+
+Usage:
+    python -m benchmarks.search_failure_check
+"""
+
+import io
+import os
+import sys
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+from typing import Any, Dict, List
+
+sys.path.append('..')
+
+OLD_VIDEO = {
+    "lectureId": 1, "videoName": "Old video", "youtubeVideoID": "old00000001",
+    "url": "https://www.youtube.com/watch?v=old00000001",
+    "embedUrl": "https://www.youtube.com/embed/old00000001", "viewCount": 10
+}
+
+CATALOG = [{
+    "schoolType": "University",
+    "Courses": [{"courseName": "Course", "Lectures": [{"lectureId": 1, "lectureName": "Lecture"}]}]
+}]
+
+
+class FakeDriver:
+    """
+    WebDriver stand-in whose search page never renders results, or shows YouTube's no results message.
+    """
+
+    def __init__(self, no_results: bool):
+        self.no_results = no_results
+        self.current_url = "about:blank"
+
+    def get(self, url: str) -> None:
+        self.current_url = url
+
+    def execute_script(self, script: str, *args) -> Any:
+        # No result items ever render (RESULT_COUNT_SCRIPT, NEW_RESULTS_SCRIPT)
+        if "ytd-background-promo-renderer" in script:
+            return self.no_results
+        if script.strip().endswith(".length;"):
+            return 0
+        return []
+
+    def find_element(self, by: str, value: str) -> "FakeDriver":
+        return self
+
+    def send_keys(self, *keys) -> None:
+        pass
+
+    def quit(self) -> None:
+        pass
+
+
+def configure(work_dir: str) -> None:
+    """
+    Selects the Selenium backend with delta sync in `work_dir`. Must run before the application modules are imported.
+    """
+    os.environ.update({
+        "SEARCH_BACKEND": "selenium",
+        "SEARCH_FALLBACK_BACKEND": "",
+        "SEARCH_WORKERS": "1",
+        "PAGE_LOAD_TIMEOUT": "0.3",
+        "YOUTUBE_RATE_LIMIT": "0",
+        "CHROME_MEMORY_LIMIT_MB": "0",
+        "EMBED_CACHE_PATH": "",
+        "CHECKPOINT_PATH": "",
+        "LECTURE_FRESHNESS_HOURS": "0",
+        "LECTURE_STATE_PATH": os.path.join(work_dir, "lecture_state.sqlite3")
+    })
+
+
+def run_sync(no_results: bool) -> Dict[str, List[Any]]:
+    """
+    Runs one delta sync of the lecture with the fake driver and returns what changed.
+    """
+    from youtube import driver_pool, processor
+    from utils.lecture_state import get_lecture_state_store
+
+    store = get_lecture_state_store()
+    store.put_many({1: [OLD_VIDEO]})
+    driver_pool.create_driver = lambda user_data_dir: FakeDriver(no_results)
+
+    failed = set()
+    get_lecture_videos = processor.get_lecture_videos
+
+    def tracked_get_lecture_videos(*args, **kwargs):
+        result = get_lecture_videos(*args, **kwargs)
+        failed.update(kwargs.get("failed") or ())
+        return result
+
+    processor.get_lecture_videos = tracked_get_lecture_videos
+    try:
+        with redirect_stdout(io.StringIO()):
+            changed, _, _ = processor.sync_lecture_videos(CATALOG, lambda rows: True)
+    finally:
+        processor.get_lecture_videos = get_lecture_videos
+
+    return {
+        "failed": sorted(failed),
+        "changes": [(row["youtubeVideoID"], row["changeType"]) for row in changed],
+        "stored": [video["youtubeVideoID"] for video in store.get(1)["videos"]]
+    }
+
+
+def main() -> None:
+    work_dir = tempfile.mkdtemp(prefix="search_failure_check_")
+    configure(work_dir)
+    errors = []
+
+    try:
+        timeout = run_sync(no_results=False)
+        print(f"Page load timeout: {timeout}")
+        if timeout["failed"] != ["1"] or timeout["changes"] or timeout["stored"] != ["old00000001"]:
+            errors.append("a page load timeout must leave the lecture failed with its old videos")
+
+        no_results = run_sync(no_results=True)
+        print(f"No results message: {no_results}")
+        if no_results["failed"] or no_results["changes"] != [("old00000001", "removed")] or no_results["stored"]:
+            errors.append("YouTube's no results message must remove the lecture's old videos")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    for error in errors:
+        print(f"FAILED: {error}")
+    if errors:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
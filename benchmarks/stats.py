@@ -0,0 +1,20 @@
+"""
+Summary statistics shared by the benchmark scripts.
+"""
+
+from typing import List
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    Returns the value at `fraction` (0 to 1) of the sorted values, without interpolation.
+
+    Args:
+        values (list): Measurements, at least one
+        fraction (float): Percentile as a fraction, e.g. 0.95 for p95
+
+    Returns:
+        float: The nearest-rank percentile
+    """
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
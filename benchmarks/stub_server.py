@@ -0,0 +1,301 @@
+"""
+Local stub HTTP server emulating the YouTube and backend API endpoints used by the application.
+
+Serves recorded search result fixtures for offline runs of the HTTP search backend:
+- GET  /results             - search results page with ytInitialData
+- POST /youtubei/v1/search  - continuation pages, looked up by continuation token
+- GET  /embed/<video_id>    - embed page ("UNPLAYABLE" for non-embeddable fixtures)
+- GET  /oembed              - oEmbed response (401 for non-embeddable fixtures)
+
+and the backend API endpoints from config:
+- POST API_ENDPOINT_TO_AUTHENTICATE        - returns an access token
+- GET  API_ENDPOINT_TO_GET_COURSES         - a generated school/course/lecture tree
+- POST API_ENDPOINT_TO_SAVE_LECTURE_VIDEOS - accepts (gzip-compressed) lecture video rows
+
+Every request can be delayed (--latency, --jitter) and answered with a 503 at
+random (--error-rate) to emulate slow or flaky services. YouTube requests beyond
+--rate-limit per second are answered with 429 and Retry-After, like YouTube's
+throttling.
+
+Usage:
+    python -m benchmarks.stub_server [--port 8765] [--lectures 50] [--latency 0.05] [--error-rate 0.01]
+                                     [--rate-limit 10]
+
+Then point the application at it, e.g.
+    YOUTUBE_BASE_URL=http://127.0.0.1:8765 API_BASE_URL=http://127.0.0.1:8765 SEARCH_BACKEND=http SEARCH_FALLBACK_BACKEND= python app.py
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import gzip
+import base64
+import random
+import argparse
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Set
+from urllib.parse import urlparse, parse_qs
+
+sys.path.append('..')
+import config
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+YOUTUBE_FIXTURES_DIR = os.path.join(FIXTURES_DIR, "youtube")
+
+
+def load_not_embeddable() -> Set[str]:
+    with open(os.path.join(YOUTUBE_FIXTURES_DIR, "not_embeddable.json"), "r", encoding="utf-8") as f:
+        return set(json.load(f))
+
+
+def make_courses(lecture_count: int, lectures_per_course: int = 5, courses_per_school: int = 4) -> List[Dict[str, Any]]:
+    """
+    Generates a school/course/lecture tree in the shape returned by the courses endpoint.
+
+    Args:
+        lecture_count (int): Total number of lectures
+        lectures_per_course (int): Lectures per course
+        courses_per_school (int): Courses per school
+
+    Returns:
+        list: Schools with "Courses" and "Lectures"
+    """
+    schools = []
+    for lecture_index in range(lecture_count):
+        course_index = lecture_index // lectures_per_course
+        school_index = course_index // courses_per_school
+
+        if len(schools) <= school_index:
+            schools.append({"schoolId": school_index + 1, "schoolType": f"School {school_index + 1}", "Courses": []})
+        courses = schools[school_index]["Courses"]
+        if not courses or courses[-1]["courseId"] != course_index + 1:
+            courses.append({"courseId": course_index + 1, "courseName": f"Course {course_index + 1}", "Lectures": []})
+
+        courses[-1]["Lectures"].append({
+            "lectureId": lecture_index + 1,
+            "lectureName": f"Lecture {lecture_index + 1}"
+        })
+    return schools
+
+
+def make_token(ttl: int = 3600) -> str:
+    """
+    Returns an unsigned JWT-shaped token with an "exp" claim, like the backend's access tokens.
+    """
+    def encode(data: Dict[str, Any]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode("utf-8")).decode("ascii").rstrip("=")
+    return f"{encode({'alg': 'none', 'typ': 'JWT'})}.{encode({'sub': 'stub', 'exp': int(time.time()) + ttl})}.stub"
+
+
+# Paths of the emulated YouTube endpoints, which are subject to the rate limit
+YOUTUBE_PATHS = ("/results", "/youtubei/", "/embed/", "/oembed")
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """
+    Request handler serving the YouTube fixtures.
+    """
+
+    server: "StubServer"
+
+    def log_message(self, format, *args):
+        # Keep benchmark output readable
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if self._emulate_service(url.path):
+            return
+
+        if url.path == config.API_ENDPOINT_TO_GET_COURSES:
+            if self._authorized():
+                self._send(200, json.dumps(self.server.courses), "application/json")
+        elif url.path == "/results":
+            self._send_file(os.path.join(YOUTUBE_FIXTURES_DIR, "results.html"), "text/html; charset=utf-8")
+        elif url.path.startswith("/embed/"):
+            video_id = url.path[len("/embed/"):]
+            if video_id in self.server.not_embeddable:
+                body = '{"playabilityStatus": {"status": "UNPLAYABLE"}}'
+            else:
+                body = '{"playabilityStatus": {"status": "OK"}}'
+            self._send(200, f"<html><body><script>{body}</script></body></html>", "text/html; charset=utf-8")
+        elif url.path == "/oembed":
+            watch_url = parse_qs(url.query).get("url", [""])[0]
+            video_id = watch_url.split("v=")[-1]
+            if video_id in self.server.not_embeddable:
+                self._send(401, "Unauthorized", "text/plain")
+            else:
+                self._send(200, json.dumps({"title": video_id, "type": "video"}), "application/json")
+        else:
+            self._send(404, "Not Found", "text/plain")
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        if self._emulate_service(url.path):
+            return
+
+        if url.path == config.API_ENDPOINT_TO_AUTHENTICATE:
+            self._send(200, json.dumps({"accessToken": self.server.token}), "application/json")
+        elif url.path == config.API_ENDPOINT_TO_SAVE_LECTURE_VIDEOS:
+            if self._authorized():
+                if self.headers.get("Content-Encoding") == "gzip":
+                    body = gzip.decompress(body)
+                rows = json.loads(body or b"[]")
+                self.server.record_saved(len(rows))
+                self._send(200, json.dumps({"saved": len(rows)}), "application/json")
+        elif url.path == "/youtubei/v1/search":
+            token = json.loads(body or b"{}").get("continuation", "")
+            path = os.path.join(YOUTUBE_FIXTURES_DIR, f"continuation_{re.sub(r'[^A-Za-z0-9_]', '', token)}.json")
+            if os.path.exists(path):
+                self._send_file(path, "application/json")
+            else:
+                self._send(404, "{}", "application/json")
+        else:
+            self._send(404, "Not Found", "text/plain")
+
+    def _emulate_service(self, path: str) -> bool:
+        """
+        Applies the configured latency, YouTube rate limit and random errors.
+
+        Returns:
+            bool: True if an error response was sent instead of the real one
+        """
+        delay = self.server.latency + random.uniform(0, self.server.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        if path.startswith(YOUTUBE_PATHS) and self.server.over_rate_limit():
+            self.send_response(429)
+            self.send_header("Retry-After", "1")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return True
+        if self.server.error_rate and random.random() < self.server.error_rate:
+            self._send(503, "Service Unavailable", "text/plain")
+            return True
+        return False
+
+    def _authorized(self) -> bool:
+        if self.headers.get("x-access-token") == self.server.token:
+            return True
+        self._send(401, "Unauthorized", "text/plain")
+        return False
+
+    def _send_file(self, path: str, content_type: str) -> None:
+        with open(path, "r", encoding="utf-8") as f:
+            self._send(200, f.read(), content_type)
+
+    def _send(self, status: int, body: str, content_type: str) -> None:
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Threaded stub server that can run in the background of a benchmark.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, lecture_count: int = 20,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, rate_limit: float = 0.0):
+        """
+        Args:
+            host (str): Address to listen on
+            port (int): Port to listen on (0 picks a free one)
+            lecture_count (int): Number of lectures in the served course tree
+            latency (float): Seconds every response is delayed
+            jitter (float): Maximum extra random delay in seconds
+            error_rate (float): Fraction of requests answered with 503
+            rate_limit (float): YouTube requests per second above which 429 is answered (0 disables)
+        """
+        super().__init__((host, port), StubRequestHandler)
+        self.not_embeddable = load_not_embeddable()
+        self.courses = make_courses(lecture_count)
+        self.token = make_token()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.throttled_requests = 0
+        self._recent_requests = deque()
+        self._rate_lock = threading.Lock()
+        self.saved_rows = 0
+        self._saved_lock = threading.Lock()
+        self._thread = None
+
+    def over_rate_limit(self) -> bool:
+        """
+        Counts a YouTube request and returns True if it exceeds the rate limit over the last second.
+        """
+        if not self.rate_limit:
+            return False
+        with self._rate_lock:
+            now = time.monotonic()
+            while self._recent_requests and self._recent_requests[0] <= now - 1:
+                self._recent_requests.popleft()
+            if len(self._recent_requests) >= self.rate_limit:
+                self.throttled_requests += 1
+                return True
+            self._recent_requests.append(now)
+            return False
+
+    def record_saved(self, rows: int) -> None:
+        with self._saved_lock:
+            self.saved_rows += rows
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--lectures", type=int, default=20, help="Lectures in the served course tree")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds every response is delayed")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum extra random delay in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--rate-limit", type=float, default=0.0,
+                        help="YouTube requests per second above which 429 is answered (0 disables)")
+    args = parser.parse_args()
+
+    server = StubServer(args.host, args.port, lecture_count=args.lectures, latency=args.latency,
+                        jitter=args.jitter, error_rate=args.error_rate, rate_limit=args.rate_limit)
+    print(f"Stub server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Stub server stopped.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
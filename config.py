@@ -21,11 +21,73 @@ API_ENDPOINT_TO_SAVE_LECTURE_VIDEOS = "/rest/ulug-auth/v1/solver/save-lecture-vi
 API_URL_TO_GET_COURSES = API_BASE_URL + API_ENDPOINT_TO_GET_COURSES
 API_URL_TO_AUTHENTICATE = API_BASE_URL + API_ENDPOINT_TO_AUTHENTICATE
 API_URL_TO_SAVE_LECTURE_VIDEOS = API_BASE_URL + API_ENDPOINT_TO_SAVE_LECTURE_VIDEOS
+API_TOKEN_TTL = int(os.environ.get("API_TOKEN_TTL", "3600"))  # Seconds an access token is reused if it carries no expiry
+API_TOKEN_REFRESH_MARGIN = int(os.environ.get("API_TOKEN_REFRESH_MARGIN", "60"))  # Seconds before expiry at which the token is renewed
+COURSES_CACHE_TTL = float(os.environ.get("COURSES_CACHE_TTL", "300"))  # Seconds the school/course/lecture tree is served without refreshing
+COURSES_CACHE_MAX_STALE = float(os.environ.get("COURSES_CACHE_MAX_STALE", "3600"))  # Seconds an expired tree is still served while it refreshes in the background
+
+# Upload settings
+UPLOAD_CHUNK_SIZE = int(os.environ.get("UPLOAD_CHUNK_SIZE", "500"))  # Lecture videos per save request
+UPLOAD_PARALLELISM = int(os.environ.get("UPLOAD_PARALLELISM", "2"))  # Chunks sent at the same time
+UPLOAD_MAX_RETRIES = int(os.environ.get("UPLOAD_MAX_RETRIES", "3"))  # Retries per chunk after the first attempt
+UPLOAD_RETRY_BACKOFF = float(os.environ.get("UPLOAD_RETRY_BACKOFF", "2"))  # Seconds before the first retry, doubled on each retry
+UPLOAD_TIMEOUT = float(os.environ.get("UPLOAD_TIMEOUT", "60"))  # Seconds to wait for each save request
+UPLOAD_GZIP = os.environ.get("UPLOAD_GZIP", "true").lower() == "true"  # Send request bodies gzip-compressed
 
 # YouTube search settings
+YOUTUBE_BASE_URL = os.environ.get("YOUTUBE_BASE_URL", "https://www.youtube.com").rstrip("/")  # Base URL for search, embed and oEmbed requests
+SEARCH_BACKEND = os.environ.get("SEARCH_BACKEND", "selenium")  # "selenium" (headless Chrome) or "http" (ytInitialData over plain HTTP)
+SEARCH_FALLBACK_BACKEND = os.environ.get("SEARCH_FALLBACK_BACKEND", "selenium")  # Backend retried when SEARCH_BACKEND fails (empty disables)
 MAX_RESULTS_PER_LECTURE = int(os.environ.get("MAX_RESULTS_PER_LECTURE", "10"))  # Default max number of videos per lecture
 MIN_SCROLLS = int(os.environ.get("MIN_SCROLLS", "1"))  # Minimum number of scrolls when searching YouTube
 MAX_SCROLLS = int(os.environ.get("MAX_SCROLLS", "10"))  # Maximum number of scrolls when searching YouTube
+PAGE_LOAD_TIMEOUT = float(os.environ.get("PAGE_LOAD_TIMEOUT", "10"))  # Maximum seconds to wait for the first results after loading the search page
+SCROLL_WAIT_TIMEOUT = float(os.environ.get("SCROLL_WAIT_TIMEOUT", "5"))  # Maximum seconds to wait for new results after a scroll
+ADAPTIVE_SCROLL = os.environ.get("ADAPTIVE_SCROLL", "true").lower() == "true"  # Stop scrolling once a scroll adds no new results
+EXTRACTION_MODE = os.environ.get("EXTRACTION_MODE", "incremental")  # "incremental" reads only new results per scroll, "full" re-parses the whole page
+BLOCK_HEAVY_RESOURCES = os.environ.get("BLOCK_HEAVY_RESOURCES", "false").lower() == "true"  # Do not load images, media and fonts in Chrome during searches
+CHROME_MEMORY_LIMIT_MB = int(os.environ.get("CHROME_MEMORY_LIMIT_MB", "0"))  # Memory (PSS) ceiling of a Chrome process tree; above 80% the page is trimmed, above it scrolling stops and the browser is recycled (0 disables, set it from the measured peaks)
+CHROME_MEMORY_SAMPLE_INTERVAL = float(os.environ.get("CHROME_MEMORY_SAMPLE_INTERVAL", "0.5"))  # Seconds between browser memory samples during a query
+CHROME_RECYCLE_QUERIES = int(os.environ.get("CHROME_RECYCLE_QUERIES", "50"))  # Queries after which a Chrome session is replaced by a fresh one (0 disables)
+SEARCH_WORKERS = int(os.environ.get("SEARCH_WORKERS", "1"))  # Number of lecture searches run in parallel
+DRIVER_POOL_SIZE = int(os.environ.get("DRIVER_POOL_SIZE", str(SEARCH_WORKERS)))  # Number of warm Chrome sessions kept for searches
+EMBED_CHECK_MODE = os.environ.get("EMBED_CHECK_MODE", "lazy")  # "lazy" checks candidates by descending view count and stops early, "eager" checks every video as it is found
+EMBED_CHECK_CONCURRENCY = int(os.environ.get("EMBED_CHECK_CONCURRENCY", "8"))  # Maximum embeddability checks in flight at once
+
+# YouTube rate limiting settings
+YOUTUBE_RATE_LIMIT = float(os.environ.get("YOUTUBE_RATE_LIMIT", "5"))  # Initial requests per second to YouTube, adapted to throttling (0 disables the limiter)
+YOUTUBE_RATE_MIN = float(os.environ.get("YOUTUBE_RATE_MIN", "0.5"))  # Lowest requests per second the limiter slows down to
+YOUTUBE_RATE_MAX = float(os.environ.get("YOUTUBE_RATE_MAX", "20"))  # Highest requests per second the limiter speeds up to
+YOUTUBE_LATENCY_TARGET = float(os.environ.get("YOUTUBE_LATENCY_TARGET", "3"))  # Seconds per HTTP response above which the rate is lowered (0 disables)
+YOUTUBE_THROTTLE_BACKOFF = float(os.environ.get("YOUTUBE_THROTTLE_BACKOFF", "10"))  # Seconds all YouTube requests pause after a throttled response without Retry-After, doubled while throttling continues
+YOUTUBE_THROTTLE_RETRIES = int(os.environ.get("YOUTUBE_THROTTLE_RETRIES", "2"))  # Retries of a throttled embed check before its lecture is left for the next run
+
+# Embeddability cache settings
+EMBED_CACHE_PATH = os.environ.get("EMBED_CACHE_PATH", "embed_cache.sqlite3")  # SQLite file for cached embed checks (empty disables the cache)
+EMBED_CACHE_POSITIVE_TTL_HOURS = float(os.environ.get("EMBED_CACHE_POSITIVE_TTL_HOURS", "168"))  # How long an embeddable verdict is reused
+EMBED_CACHE_NEGATIVE_TTL_HOURS = float(os.environ.get("EMBED_CACHE_NEGATIVE_TTL_HOURS", "24"))  # How long a not-embeddable verdict is reused
+
+# Delta sync settings
+LECTURE_STATE_PATH = os.environ.get("LECTURE_STATE_PATH", "lecture_state.sqlite3")  # SQLite file with each lecture's last search (empty searches everything every run)
+LECTURE_FRESHNESS_HOURS = float(os.environ.get("LECTURE_FRESHNESS_HOURS", "72"))  # Lectures searched more recently than this are not searched again
+CHECKPOINT_PATH = os.environ.get("CHECKPOINT_PATH", "crawl_checkpoint.ndjson")  # Journal of finished lecture searches used to resume an interrupted run (empty disables)
+
+# Sharding settings
+SHARD = os.environ.get("SHARD", "")  # "i/N" to crawl only shard i (0-based) of N, written to SHARD_RESULTS_DIR (empty crawls everything)
+SHARD_RESULTS_DIR = os.environ.get("SHARD_RESULTS_DIR", "shard_results")  # Directory of the partial results merged by "main.py --merge N"
+SHARD_RUN_ID = os.environ.get("SHARD_RUN_ID", "")  # Run the partial results belong to; the merge only uses results of its own run (empty uses the current date)
+MERGE_SCHEDULE_TIME = os.environ.get("MERGE_SCHEDULE_TIME", "05:00")  # Daily time of the scheduled "main.py --merge N", after the shards started at SCHEDULE_TIME are done
+
+# Result file settings
+RESULTS_FORMAT = os.environ.get("RESULTS_FORMAT", "json")  # Format of lecture_videos.json: "json" (compact array) or "ndjson" (one video per line)
+
+# Crawler process settings
+CRAWLER_PROCESS = os.environ.get("CRAWLER_PROCESS", "true").lower() == "true"  # Run the web app's crawls in a separate worker process (false runs them in the job thread)
 
 # Schedule settings
-SCHEDULE_TIME = os.environ.get("SCHEDULE_TIME", "02:00")  # Daily job execution time 
\ No newline at end of file
+SCHEDULE_TIME = os.environ.get("SCHEDULE_TIME", "02:00")  # Daily job execution time
+SCHEDULER_MODE = os.environ.get("SCHEDULER_MODE", "daily")  # "daily" crawls everything at SCHEDULE_TIME, "continuous" refreshes the most stale lectures steadily
+REFRESH_SEARCHES_PER_HOUR = float(os.environ.get("REFRESH_SEARCHES_PER_HOUR", "120"))  # Budget of lecture searches per hour in continuous mode
+REFRESH_BATCH_SIZE = int(os.environ.get("REFRESH_BATCH_SIZE", "10"))  # Maximum number of lectures refreshed and saved together in continuous mode
+REFRESH_CATALOG_RELOAD_SECONDS = float(os.environ.get("REFRESH_CATALOG_RELOAD_SECONDS", "3600"))  # Seconds between catalog reloads in continuous mode 
+REFRESH_EXPORT_BATCHES = int(os.environ.get("REFRESH_EXPORT_BATCHES", "10"))  # Batches between rewrites of lecture_videos.json in continuous mode (also rewritten before every catalog reload)
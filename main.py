@@ -1,12 +1,29 @@
 """
 Main entry point for the YouTube embedding application.
+
+Usage:
+    python main.py [--once]                  # search every lecture and save (daily by default)
+    python main.py --shard i/N [--once]      # search only shard i of N, write a partial result
+    python main.py --merge N [--once]        # merge the N partial results and save them (daily at MERGE_SCHEDULE_TIME)
+    python main.py --continuous              # refresh the most stale lectures steadily instead of daily
 """
 
 import time
+import argparse
+import functools
 import urllib3
-from api.client import get_courses_from_api, save_lecture_videos_to_api
-from youtube.processor import get_lecture_videos
+import config
+from api.client import get_courses_cached, save_lecture_videos_to_api
+from youtube.processor import get_lecture_videos, save_search_results, sync_lecture_videos
+from utils.checkpoint import get_checkpoint_journal
+from utils.lecture_state import (
+    filter_lectures, get_lecture_state_store, iter_all_lecture_videos, iter_lectures, select_stale_lectures
+)
+from utils.refresh_scheduler import RefreshScheduler
 from utils.scheduler import save_results_to_json, run_scheduled_job
+from utils.sharding import (
+    current_run_id, merge_partial_results, parse_shard, remove_partial_results, select_shard, write_partial_result
+)
 
 def job():
     """
@@ -14,38 +31,204 @@ def job():
     """
     print(f"Starting YouTube video search process... {time.strftime('%Y-%m-%d %H:%M:%S')}")
     
-    # Get schools on each run (to refresh token)
-    current_schools = get_courses_from_api()
+    # Get schools on each run (a tree fetched within COURSES_CACHE_TTL is reused)
+    current_schools = get_courses_cached(allow_stale=False)
     
     if not current_schools:
         print("Could not get schools. Aborting.")
         return
     
-    # Search for YouTube videos for all schools and lectures
+    # Search for YouTube videos for stale and new lectures
     print("Searching for YouTube videos for all schools and lectures...")
     
-    # Search for max 10 videos per lecture
-    lecture_videos = get_lecture_videos(current_schools, max_results_per_lecture=10)
+    # Search for max 10 videos per lecture and save the changed ones to the API
+    changed_videos, lecture_videos, save_result = sync_lecture_videos(
+        current_schools, lambda videos: save_lecture_videos_to_api(videos)["success"],
+        max_results_per_lecture=10
+    )
+    
+    if changed_videos:
+        if save_result:
+            print("Videos successfully saved to API.")
+        else:
+            print("Error saving videos to API.")
+    
+    # Optional: Save results to JSON (the rows are streamed from the lecture state)
+    video_count = save_results_to_json(lecture_videos)
     
     # Show results
-    print(f"\nFound a total of {len(lecture_videos)} videos.")
+    print(f"\nFound a total of {video_count} videos, {len(changed_videos)} changed.")
+    
+    print(f"Process completed. {time.strftime('%Y-%m-%d %H:%M:%S')}")
+
+def shard_job(shard_index: int, shard_count: int, run_id: str = None):
+    """
+    Searches for YouTube videos for one shard of the lectures and writes a partial result.
+    
+    Nothing is saved to the API here; "main.py --merge N" saves the merged result of all
+    shards of the same run (SHARD_RUN_ID, or the date the shard started).
+    
+    With the lecture state store, only the stale and new lectures of the shard are searched,
+    like in the regular job; the merge keeps the stored results of the others.
+    """
+    # Fixed at the start, so a shard running past midnight still belongs to its run
+    run_id = run_id or current_run_id()
+    print(f"Starting shard {shard_index}/{shard_count} of run {run_id}... {time.strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    current_schools = get_courses_cached(allow_stale=False)
+    
+    if not current_schools:
+        print("Could not get schools. Aborting.")
+        return
+    
+    shard_schools = select_shard(current_schools, shard_index, shard_count)
+    
+    store = get_lecture_state_store()
+    if store is not None:
+        total_count = sum(1 for _ in iter_lectures(shard_schools))
+        shard_schools = select_stale_lectures(shard_schools, store)
+        stale_count = sum(1 for _ in iter_lectures(shard_schools))
+        print(f"{stale_count} of {total_count} lectures of the shard are stale or new and will be searched.")
+    
+    # Each shard keeps its own checkpoint journal, so shards on one machine do not mix
+    checkpoint = get_checkpoint_journal(f".shard-{shard_index}-of-{shard_count}")
+    failed = set()
+    lecture_videos = get_lecture_videos(shard_schools, max_results_per_lecture=10, checkpoint=checkpoint,
+                                        failed=failed)
+    
+    # Failed and throttled lectures are left out, so the merge keeps their previous results
+    if failed:
+        print(f"{len(failed)} lectures could not be searched and are left out of the partial result.")
+        shard_schools = filter_lectures(shard_schools, lambda lecture: str(lecture["lectureId"]) not in failed)
+    
+    write_partial_result(shard_schools, lecture_videos, shard_index, shard_count, run_id)
+    if checkpoint is not None:
+        checkpoint.clear()
+    
+    print(f"Shard completed. {time.strftime('%Y-%m-%d %H:%M:%S')}")
+
+def merge_job(shard_count: int, run_id: str = None):
+    """
+    Merges the partial results of all shards of a run and saves the changed lecture videos to the API.
+    
+    Partial results of other runs are neither merged nor removed.
+    """
+    run_id = run_id or current_run_id()
+    print(f"Merging {shard_count} shards of run {run_id}... {time.strftime('%Y-%m-%d %H:%M:%S')}")
     
-    # Save results to API
-    if lecture_videos:
-        save_result = save_lecture_videos_to_api(lecture_videos)
+    current_schools = get_courses_cached(allow_stale=False)
+    
+    if not current_schools:
+        print("Could not get schools. Aborting.")
+        return
+    
+    try:
+        lecture_ids, merged_videos = merge_partial_results(shard_count, run_id)
+    except FileNotFoundError as e:
+        print(f"{str(e)}. Aborting.")
+        return
+    
+    searched_schools = filter_lectures(current_schools, lambda lecture: str(lecture["lectureId"]) in lecture_ids)
+    changed_videos, lecture_videos, save_result = save_search_results(
+        current_schools, searched_schools, merged_videos,
+        lambda videos: save_lecture_videos_to_api(videos)["success"]
+    )
+    
+    if changed_videos:
         if save_result:
             print("Videos successfully saved to API.")
         else:
             print("Error saving videos to API.")
     
-    # Optional: Save results to JSON
-    save_results_to_json(lecture_videos)
+    # Keep the partial results for another merge attempt if saving failed
+    if save_result:
+        remove_partial_results(shard_count, run_id)
     
-    print(f"Process completed. {time.strftime('%Y-%m-%d %H:%M:%S')}")
+    video_count = save_results_to_json(lecture_videos)
+    print(f"\nFound a total of {video_count} videos, {len(changed_videos)} changed.")
+    
+    print(f"Merge completed. {time.strftime('%Y-%m-%d %H:%M:%S')}")
+
+def refresh_job(current_schools, due_schools):
+    """
+    Searches for YouTube videos for the lectures due in continuous mode and saves the changed ones to the API.
+    
+    lecture_videos.json is not written here but by export_job(), every few batches.
+    
+    Args:
+        current_schools (list): The whole school, course, and lecture catalog
+        due_schools (list): Tree of the lectures to refresh
+    """
+    failed = set()
+    lecture_videos = get_lecture_videos(due_schools, max_results_per_lecture=10, failed=failed)
+    
+    # Failed and throttled lectures keep their previous results and are retried later
+    if failed:
+        print(f"{len(failed)} lectures could not be searched and will be retried.")
+        due_schools = filter_lectures(due_schools, lambda lecture: str(lecture["lectureId"]) not in failed)
+    
+    changed_videos, _, save_result = save_search_results(
+        current_schools, due_schools, lecture_videos,
+        lambda videos: save_lecture_videos_to_api(videos)["success"]
+    )
+    
+    if changed_videos:
+        if save_result:
+            print(f"{len(changed_videos)} changed videos successfully saved to API.")
+        else:
+            print("Error saving videos to API.")
+
+def export_job(current_schools):
+    """
+    Writes the latest known videos of every lecture in the catalog to lecture_videos.json in continuous mode.
+    
+    Args:
+        current_schools (list): The whole school, course, and lecture catalog
+    """
+    video_count = save_results_to_json(iter_all_lecture_videos(current_schools, get_lecture_state_store()))
+    print(f"Exported {video_count} videos.")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search YouTube videos for lectures and save them to the API.")
+    parser.add_argument("--shard", default=config.SHARD,
+                        help="Search only shard i (0-based) of N, given as i/N (default: SHARD)")
+    parser.add_argument("--merge", type=int, metavar="N", help="Merge and save the partial results of N shards")
+    parser.add_argument("--run-id", default=config.SHARD_RUN_ID,
+                        help="Run the shard results belong to (default: SHARD_RUN_ID, or the current date)")
+    parser.add_argument("--once", action="store_true", help="Run once and exit instead of scheduling")
+    parser.add_argument("--continuous", action="store_true", default=config.SCHEDULER_MODE == "continuous",
+                        help="Refresh the most stale lectures steadily instead of all lectures daily "
+                             "(default: SCHEDULER_MODE)")
+    args = parser.parse_args()
+    
+    # Shards and merges always run on the daily schedule
+    continuous = args.continuous and not (args.once or args.merge or args.shard)
+    store = get_lecture_state_store() if continuous else None
+    if continuous and store is None:
+        parser.error("continuous refresh needs the lecture state store (LECTURE_STATE_PATH)")
+    
+    if args.merge:
+        run = functools.partial(merge_job, args.merge, args.run_id or None)
+    elif args.shard:
+        try:
+            run = functools.partial(shard_job, *parse_shard(args.shard), args.run_id or None)
+        except ValueError as e:
+            parser.error(str(e))
+    else:
+        run = job
+    
     # Disable SSL warnings (for development environment)
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
     
-    # Run scheduled job
-    run_scheduled_job(job) 
\ No newline at end of file
+    if args.once:
+        run()
+    elif continuous:
+        # Refresh due lectures until interrupted
+        RefreshScheduler(refresh_job, lambda: get_courses_cached(allow_stale=False), store,
+                         export_results=export_job).run()
+    elif args.merge:
+        # Merge after the shards started at SCHEDULE_TIME are done
+        run_scheduled_job(run, config.MERGE_SCHEDULE_TIME)
+    else:
+        # Run scheduled job
+        run_scheduled_job(run)
@@ -0,0 +1,98 @@
+"""
+In-process caches shared by the web endpoints and the job.
+"""
+
+import time
+import threading
+from typing import Any, Callable, Optional
+
+
+class StaleWhileRevalidateCache:
+    """
+    Caches the result of a loader function for `ttl` seconds.
+
+    Once the value is older than `ttl`, it is still served (for up to `max_stale`
+    more seconds) while a single background refresh runs. Concurrent callers that
+    find no usable value wait for one shared load instead of each calling the loader.
+    A loader that returns None or raises is treated as a failed load: the previous
+    value is kept and the next caller tries again.
+    """
+
+    def __init__(self, loader: Callable[[], Any], ttl: float, max_stale: float = None, name: str = "cache"):
+        """
+        Args:
+            loader (callable): Function returning a fresh value, or None on error
+            ttl (float): Seconds a loaded value is considered fresh
+            max_stale (float): Seconds a value may be served after it expires (unlimited if None)
+            name (str): Name used in log messages
+        """
+        self.loader = loader
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.name = name
+        self._lock = threading.Lock()
+        self._value: Any = None
+        self._loaded_at: Optional[float] = None
+        self._loading: Optional[threading.Event] = None
+
+    def get(self, force_refresh: bool = False, allow_stale: bool = True) -> Any:
+        """
+        Returns the cached value, loading or refreshing it as needed.
+
+        Args:
+            force_refresh (bool): Wait for a new load even if the cached value is fresh
+            allow_stale (bool): Serve an expired value while it is refreshed in the
+                                background; if False, wait for the refresh instead
+
+        Returns:
+            The cached value, or None if no load has succeeded yet
+        """
+        with self._lock:
+            age = None if self._loaded_at is None else time.monotonic() - self._loaded_at
+
+            if not force_refresh and age is not None and age < self.ttl:
+                return self._value
+
+            usable_stale = (age is not None and allow_stale and not force_refresh
+                            and (self.max_stale is None or age < self.ttl + self.max_stale))
+
+            loading = self._loading
+            start_load = loading is None
+            if start_load:
+                loading = self._loading = threading.Event()
+
+            if usable_stale:
+                if start_load:
+                    threading.Thread(target=self._load, args=(loading,), daemon=True).start()
+                return self._value
+
+        if start_load:
+            self._load(loading)
+        else:
+            # Another caller is already loading, share its result
+            loading.wait()
+
+        with self._lock:
+            return self._value
+
+    def invalidate(self) -> None:
+        """
+        Marks the cached value as expired so the next get() refreshes it.
+        """
+        with self._lock:
+            if self._loaded_at is not None:
+                self._loaded_at = float("-inf")
+
+    def _load(self, loading: threading.Event) -> None:
+        try:
+            value = self.loader()
+        except Exception as e:
+            print(f"Error refreshing {self.name}: {str(e)}")
+            value = None
+
+        with self._lock:
+            if value is not None:
+                self._value = value
+                self._loaded_at = time.monotonic()
+            self._loading = None
+        loading.set()
@@ -0,0 +1,151 @@
+"""
+Durable per-lecture checkpoints of a crawl, used to resume an interrupted run.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from typing import Any, Dict, List, Optional
+
+# Import configuration
+sys.path.append('..')
+import config
+
+
+class CheckpointJournal:
+    """
+    Append-only NDJSON journal with one line per finished lecture search.
+
+    Each line is flushed and fsynced as soon as the lecture finishes, so a crash
+    loses at most the searches that were in progress. A torn last line from a
+    crash mid-write is ignored when the journal is read back, and cut off before
+    the next line is appended.
+    """
+
+    def __init__(self, path: str = None, max_age_hours: float = None):
+        """
+        Args:
+            path (str): Journal file
+            max_age_hours (float): Checkpoints older than this are not resumed
+        """
+        # Use configuration defaults if not provided
+        if path is None:
+            path = config.CHECKPOINT_PATH
+        if max_age_hours is None:
+            max_age_hours = config.LECTURE_FRESHNESS_HOURS
+
+        self.path = path
+        self.max_age_hours = max_age_hours
+        self._lock = threading.Lock()
+        self._checked_tail = False
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Reads the checkpoints of the interrupted run.
+
+        Returns:
+            dict: Checkpoint by lecture ID (as str) with "query", "maxResults", "videos" and "at"
+        """
+        checkpoints: Dict[str, Dict[str, Any]] = {}
+        if not os.path.exists(self.path):
+            return checkpoints
+
+        cutoff = time.time() - self.max_age_hours * 3600
+        with self._lock, open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get("at", 0) >= cutoff:
+                    checkpoints[str(entry["lectureId"])] = entry
+        return checkpoints
+
+    def append(self, lecture: Dict[str, Any], max_results: int, videos: List[Dict[str, Any]]) -> None:
+        """
+        Durably records the result of one lecture search.
+
+        Args:
+            lecture (dict): Lecture with "lectureId" and "query" keys
+            max_results (int): Maximum number of videos the lecture was searched for
+            videos (list): Lecture video rows found
+        """
+        line = json.dumps({
+            "lectureId": lecture["lectureId"],
+            "query": lecture["query"],
+            "maxResults": max_results,
+            "videos": videos,
+            "at": time.time()
+        }, ensure_ascii=False)
+
+        with self._lock:
+            if not self._checked_tail:
+                self._truncate_torn_line()
+                self._checked_tail = True
+
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _truncate_torn_line(self) -> None:
+        """
+        Cuts off a last line without a trailing newline, left by a crash mid-write,
+        so the next line does not get appended to it.
+        """
+        try:
+            f = open(self.path, "rb+")
+        except FileNotFoundError:
+            return
+
+        with f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+
+            # Find the end of the last complete line
+            end = size
+            while end > 0:
+                start = max(0, end - 4096)
+                f.seek(start)
+                newline = f.read(end - start).rfind(b"\n")
+                if newline != -1:
+                    end = start + newline + 1
+                    break
+                end = start
+
+            f.truncate(end)
+            f.flush()
+            os.fsync(f.fileno())
+        print(f"Removed a torn last line ({size - end} bytes) from checkpoint journal {self.path}.")
+
+    def clear(self) -> None:
+        """
+        Removes the journal once the run's results are saved.
+        """
+        with self._lock:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+
+def get_checkpoint_journal(suffix: str = "") -> Optional[CheckpointJournal]:
+    """
+    Returns the crawl checkpoint journal.
+
+    Args:
+        suffix (str): Appended to CHECKPOINT_PATH, so that processes crawling different
+                      lectures (e.g. shards) keep separate journals
+
+    Returns:
+        CheckpointJournal: Journal, or None if checkpointing is disabled (empty CHECKPOINT_PATH)
+    """
+    if not config.CHECKPOINT_PATH:
+        return None
+    return CheckpointJournal(config.CHECKPOINT_PATH + suffix)
@@ -0,0 +1,247 @@
+"""
+Crawler worker process controlled by the web app through multiprocessing queues.
+
+The web process only imports this module; the search modules (Selenium, Beautiful
+Soup, the driver pool) are imported in the worker process, so the web app starts
+fast and a crawl does not compete with request handling for its GIL and memory.
+"""
+
+import sys
+import time
+import queue
+import atexit
+import threading
+import multiprocessing
+from typing import Any, Callable, Dict, List, Optional
+
+# Import configuration
+sys.path.append('..')
+import config
+from utils.metrics import REGISTRY
+
+# Seconds between checks of the job's cancel event and the worker's liveness while waiting for events
+EVENT_POLL_INTERVAL = 0.5
+
+# Seconds the worker gets to finish (and close its Chrome sessions) when stopped
+STOP_TIMEOUT = 10
+
+
+class CrawlerCancelled(Exception):
+    """
+    Raised when a crawl is cancelled before all lectures were searched.
+    """
+
+
+def crawl(schools: List[Dict[str, Any]], progress: Optional[Callable[[int, int, int], None]] = None,
+          cancel_event=None) -> Dict[str, Any]:
+    """
+    Searches for videos per lecture, saves the changed ones to the API and writes lecture_videos.json.
+
+    Runs in the crawler process, or in the calling thread if CRAWLER_PROCESS is disabled.
+
+    Args:
+        schools (list): List containing school, course, and lecture information
+        progress (callable): Receives (lectures done, lectures total, videos found) after each lecture search
+        cancel_event (threading.Event or multiprocessing.Event): Set to cancel the crawl
+
+    Returns:
+        dict: "status" and "video_count" of the crawl
+
+    Raises:
+        CrawlerCancelled: If `cancel_event` was set before all lectures were searched
+    """
+    # Imported here so that only the process running the crawl loads the search modules
+    from api.client import save_lecture_videos_to_api
+    from youtube.processor import SearchCancelled, sync_lecture_videos
+    from utils.scheduler import save_results_to_json
+
+    print("Searching for YouTube videos for all schools and lectures...")
+
+    try:
+        # Search for videos per lecture and save the changed ones to the API
+        changed_videos, lecture_videos, save_result = sync_lecture_videos(
+            schools, lambda videos: save_lecture_videos_to_api(videos)["success"],
+            max_results_per_lecture=10, progress=progress, cancel_event=cancel_event
+        )
+    except SearchCancelled as e:
+        raise CrawlerCancelled(str(e)) from None
+
+    # Optional: Save results to JSON (the rows are streamed from the lecture state)
+    video_count = save_results_to_json(lecture_videos)
+
+    # Show results
+    print(f"\nFound a total of {video_count} videos, {len(changed_videos)} changed.")
+
+    if changed_videos:
+        status = "Success" if save_result else "Error saving to API"
+    elif video_count:
+        status = "No changes to save"
+    else:
+        status = "No videos found"
+
+    return {"status": status, "video_count": video_count}
+
+
+def _worker_main(commands, events, cancel) -> None:
+    """
+    Entry point of the crawler process: runs crawls until it receives None.
+
+    Every event carries the worker's exported metrics, so the web app's /metrics
+    includes the crawl's stage timings and counters.
+    """
+    while True:
+        command = commands.get()
+        if command is None:
+            return
+
+        _, schools = command
+
+        def progress(lectures_done: int, lectures_total: int, videos_found: int) -> None:
+            events.put(("progress", (lectures_done, lectures_total, videos_found), REGISTRY.export()))
+
+        try:
+            events.put(("result", crawl(schools, progress, cancel), REGISTRY.export()))
+        except CrawlerCancelled as e:
+            events.put(("cancelled", str(e), REGISTRY.export()))
+        except Exception as e:
+            print(f"Error in crawl: {str(e)}")
+            events.put(("error", str(e), REGISTRY.export()))
+
+
+class CrawlerProcess:
+    """
+    Long-lived worker process that runs one crawl at a time on behalf of the web app.
+
+    The process is started on the first crawl and kept for later ones, so its Chrome
+    sessions and caches stay warm. If it dies, the crawl fails and the next crawl
+    starts a new process.
+    """
+
+    def __init__(self):
+        # "spawn" starts a fresh interpreter instead of forking the threaded web process
+        self._context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._process = None
+        self._commands = None
+        self._events = None
+        self._cancel = None
+
+    def run(self, schools: List[Dict[str, Any]], progress: Optional[Callable[[int, int, int], None]] = None,
+            cancel_event: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """
+        Runs a crawl in the worker process and waits for its result.
+
+        Args:
+            schools (list): List containing school, course, and lecture information
+            progress (callable): Receives (lectures done, lectures total, videos found) after each lecture search
+            cancel_event (threading.Event): Set to cancel the crawl; forwarded to the worker
+
+        Returns:
+            dict: "status" and "video_count" of the crawl, see crawl()
+
+        Raises:
+            CrawlerCancelled: If the crawl was cancelled
+            RuntimeError: If the crawl failed or the worker process died
+        """
+        with self._lock:
+            self._start()
+            self._cancel.clear()
+            self._commands.put(("crawl", schools))
+
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    self._cancel.set()
+
+                try:
+                    kind, payload, metrics = self._events.get(timeout=EVENT_POLL_INTERVAL)
+                except queue.Empty:
+                    if not self._process.is_alive():
+                        exitcode = self._process.exitcode
+                        self._process = None
+                        raise RuntimeError(f"Crawler process exited with code {exitcode}")
+                    continue
+
+                REGISTRY.load_external(f"crawler-{self._process.pid}", metrics)
+
+                if kind == "progress":
+                    if progress:
+                        progress(*payload)
+                elif kind == "result":
+                    return payload
+                elif kind == "cancelled":
+                    raise CrawlerCancelled(payload)
+                else:
+                    raise RuntimeError(payload)
+
+    def stop(self, timeout: float = STOP_TIMEOUT) -> None:
+        """
+        Asks the worker process to exit after its current crawl, terminating it after `timeout` seconds.
+        """
+        process = self._process
+        if process is None:
+            return
+
+        self._cancel.set()
+        self._commands.put(None)
+
+        # Keep reading events, the worker cannot exit while its queue buffer is unread
+        deadline = time.monotonic() + timeout
+        while process.is_alive() and time.monotonic() < deadline:
+            try:
+                self._events.get(timeout=EVENT_POLL_INTERVAL)
+            except queue.Empty:
+                pass
+        process.join(max(0.0, deadline - time.monotonic()))
+        if process.is_alive():
+            process.terminate()
+            process.join()
+        self._process = None
+
+    def _start(self) -> None:
+        if self._process is not None and self._process.is_alive():
+            return
+
+        # Fresh queues, so nothing from a dead worker is read by the new one
+        self._commands = self._context.Queue()
+        self._events = self._context.Queue()
+        self._cancel = self._context.Event()
+        self._process = self._context.Process(
+            target=_worker_main, args=(self._commands, self._events, self._cancel),
+            name="crawler", daemon=True
+        )
+        start = time.perf_counter()
+        self._process.start()
+        print(f"Started crawler process {self._process.pid} in {time.perf_counter() - start:.2f}s.")
+
+
+# Process-wide crawler process, started on the first crawl
+_crawler_process: Optional[CrawlerProcess] = None
+_crawler_process_lock = threading.Lock()
+
+
+def get_crawler_process() -> CrawlerProcess:
+    """
+    Returns the process-wide crawler process, which is stopped when the web app exits.
+    """
+    global _crawler_process
+    with _crawler_process_lock:
+        if _crawler_process is None:
+            _crawler_process = CrawlerProcess()
+            atexit.register(_crawler_process.stop)
+        return _crawler_process
+
+
+def run_crawl(schools: List[Dict[str, Any]], progress: Optional[Callable[[int, int, int], None]] = None,
+              cancel_event: Optional[threading.Event] = None) -> Dict[str, Any]:
+    """
+    Runs a crawl in the crawler process, or in the calling thread if CRAWLER_PROCESS is disabled.
+
+    Returns:
+        dict: "status" and "video_count" of the crawl, see crawl()
+
+    Raises:
+        CrawlerCancelled: If the crawl was cancelled
+    """
+    if config.CRAWLER_PROCESS:
+        return get_crawler_process().run(schools, progress, cancel_event)
+    return crawl(schools, progress, cancel_event)
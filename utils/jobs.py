@@ -0,0 +1,199 @@
+"""
+Background job manager that runs at most one crawl at a time.
+"""
+
+import time
+import uuid
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+# Number of recent progress updates used to compute the current throughput
+THROUGHPUT_WINDOW = 20
+
+
+class Job:
+    """
+    One requested run of the job function, with its progress and result.
+
+    Status goes from "queued" to "running" and ends as "succeeded", "failed" or "cancelled".
+    """
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex[:12]
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.cancel_event = threading.Event()
+        self.lectures_done = 0
+        self.lectures_total = 0
+        self.videos_found = 0
+        self._started_monotonic: Optional[float] = None
+        # (monotonic time, lectures done) of the recent progress updates
+        self._samples = deque(maxlen=THROUGHPUT_WINDOW)
+        self._lock = threading.Lock()
+
+    def update_progress(self, lectures_done: int, lectures_total: int, videos_found: int) -> None:
+        """
+        Records search progress; matches youtube.processor.ProgressCallback.
+        """
+        with self._lock:
+            if lectures_done > self.lectures_done:
+                self._samples.append((time.monotonic(), lectures_done))
+            self.lectures_done = lectures_done
+            self.lectures_total = lectures_total
+            self.videos_found = videos_found
+
+    def _start(self) -> None:
+        self.status = "running"
+        self.started_at = time.time()
+        self._started_monotonic = time.monotonic()
+
+    def lectures_per_minute(self) -> float:
+        """
+        Returns the throughput over the last THROUGHPUT_WINDOW progress updates
+        (since the start of the job until that many were received).
+
+        Counts the lectures the updates report as done, since one update can finish
+        several lectures (e.g. lectures sharing a query).
+        """
+        with self._lock:
+            if len(self._samples) == self._samples.maxlen:
+                elapsed = self._samples[-1][0] - self._samples[0][0]
+                done = self._samples[-1][1] - self._samples[0][1]
+            elif self._started_monotonic is not None and self._samples:
+                elapsed = self._samples[-1][0] - self._started_monotonic
+                done = self._samples[-1][1]
+            else:
+                return 0.0
+        return done / elapsed * 60 if elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the job as a JSON-serializable dict.
+        """
+        def timestamp(value: Optional[float]) -> Optional[str]:
+            return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(value)) if value else None
+
+        rate = self.lectures_per_minute()
+        remaining = max(0, self.lectures_total - self.lectures_done)
+        return {
+            "id": self.id,
+            "status": self.status,
+            "created_at": timestamp(self.created_at),
+            "started_at": timestamp(self.started_at),
+            "finished_at": timestamp(self.finished_at),
+            "progress": {
+                "lectures_done": self.lectures_done,
+                "lectures_total": self.lectures_total,
+                "videos_found": self.videos_found,
+                "lectures_per_minute": round(rate, 2),
+                "eta_seconds": round(remaining / rate * 60) if rate and self.status == "running" else None
+            },
+            "cancel_requested": self.cancel_event.is_set(),
+            "result": self.result,
+            "error": self.error
+        }
+
+
+class JobManager:
+    """
+    Runs submitted jobs one at a time on a background thread.
+
+    While a job runs, further submissions coalesce into a single queued job that
+    starts when the current one ends; submitting again returns that queued job.
+    """
+
+    def __init__(self, run: Callable[[Job], Any], history_size: int = 20):
+        """
+        Args:
+            run (callable): Job function; receives the Job, reports progress through
+                            job.update_progress, checks job.cancel_event and returns the result
+            history_size (int): Number of finished jobs kept for lookup
+        """
+        self.run = run
+        self.history_size = history_size
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Job] = {}
+        self._finished: deque = deque()
+        self._current: Optional[Job] = None
+        self._queued: Optional[Job] = None
+
+    def submit(self) -> Job:
+        """
+        Requests a run, starting it now if no job is active.
+
+        Returns:
+            Job: The started job, or the queued job this request was coalesced into
+        """
+        with self._lock:
+            if self._current is None:
+                job = self._current = self._register(Job())
+                job._start()
+                threading.Thread(target=self._work, args=(job,), daemon=True).start()
+                return job
+
+            if self._queued is None:
+                self._queued = self._register(Job())
+            return self._queued
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancels a queued job, or asks a running job to stop.
+
+        Returns:
+            Job: The job, or None if the ID is unknown
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+
+            job.cancel_event.set()
+            if job is self._queued:
+                self._queued = None
+                self._finish(job, "cancelled")
+            return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def snapshot(self) -> Dict[str, Optional[Job]]:
+        """
+        Returns the running and queued jobs.
+        """
+        with self._lock:
+            return {"current": self._current, "queued": self._queued}
+
+    def _work(self, job: Job) -> None:
+        while job is not None:
+            try:
+                job.result = self.run(job)
+                status = "succeeded"
+            except Exception as e:
+                job.error = str(e)
+                status = "cancelled" if job.cancel_event.is_set() else "failed"
+                print(f"Job {job.id} {status}: {str(e)}")
+
+            with self._lock:
+                self._finish(job, status)
+                # Start the coalesced job, if any, on this same thread
+                job = self._current = self._queued
+                self._queued = None
+                if job is not None:
+                    job._start()
+
+    def _register(self, job: Job) -> Job:
+        self._jobs[job.id] = job
+        return job
+
+    def _finish(self, job: Job, status: str) -> None:
+        job.status = status
+        job.finished_at = time.time()
+        self._finished.append(job)
+        while len(self._finished) > self.history_size:
+            self._jobs.pop(self._finished.popleft().id, None)
@@ -0,0 +1,275 @@
+"""
+Local state of previous lecture searches, used to sync only what changed.
+"""
+
+import sys
+import json
+import time
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Import configuration
+sys.path.append('..')
+import config
+
+# Lecture video fields compared to detect a changed row
+COMPARED_FIELDS = ("videoName", "url", "embedUrl", "viewCount")
+
+
+class LectureStateStore:
+    """
+    SQLite-backed store of the last search time and result set of each lecture, keyed by lectureId.
+    """
+
+    def __init__(self, path: str = None):
+        """
+        Args:
+            path (str): SQLite database file
+        """
+        # Use configuration default if not provided
+        if path is None:
+            path = config.LECTURE_STATE_PATH
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS lectures ("
+            "lecture_id TEXT PRIMARY KEY, "
+            "searched_at REAL NOT NULL, "
+            "videos TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, lecture_id: Any) -> Optional[Dict[str, Any]]:
+        """
+        Returns the stored state of a lecture.
+
+        Args:
+            lecture_id: Lecture ID
+
+        Returns:
+            dict: "searched_at" (epoch seconds) and "videos" (lecture video rows), or None if never searched
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT searched_at, videos FROM lectures WHERE lecture_id = ?", (str(lecture_id),)
+            ).fetchone()
+
+        if row is None:
+            return None
+        return {"searched_at": row[0], "videos": json.loads(row[1])}
+
+    def put(self, lecture_id: Any, videos: List[Dict[str, Any]], searched_at: float = None) -> None:
+        """
+        Stores the result set of a lecture search.
+
+        Args:
+            lecture_id: Lecture ID
+            videos (list): Lecture video rows found by the search
+            searched_at (float): Search time in epoch seconds, defaults to now
+        """
+        if searched_at is None:
+            searched_at = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO lectures (lecture_id, searched_at, videos) VALUES (?, ?, ?)",
+                (str(lecture_id), searched_at, json.dumps(videos, ensure_ascii=False))
+            )
+            self._conn.commit()
+
+    def put_many(self, results: Dict[Any, List[Dict[str, Any]]]) -> None:
+        """
+        Stores the result sets of several lecture searches in one transaction.
+
+        Args:
+            results (dict): Lecture video rows found by the search, by lecture ID
+        """
+        searched_at = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO lectures (lecture_id, searched_at, videos) VALUES (?, ?, ?)",
+                [(str(lecture_id), searched_at, json.dumps(videos, ensure_ascii=False))
+                 for lecture_id, videos in results.items()]
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def iter_lectures(schools: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Yields every lecture of a school/course/lecture tree.
+    """
+    for school in schools:
+        for course in school["Courses"]:
+            for lecture in course["Lectures"]:
+                yield lecture
+
+
+def filter_lectures(schools: List[Dict[str, Any]],
+                    predicate: Callable[[Dict[str, Any]], bool]) -> List[Dict[str, Any]]:
+    """
+    Filters a school/course/lecture tree down to the lectures matching a predicate.
+
+    Args:
+        schools (list): List containing school, course, and lecture information
+        predicate (callable): Returns True for the lectures to keep
+
+    Returns:
+        list: Tree of the same shape with only the matching lectures (empty courses and schools dropped)
+    """
+    filtered_schools = []
+
+    for school in schools:
+        filtered_courses = []
+
+        for course in school["Courses"]:
+            lectures = [lecture for lecture in course["Lectures"] if predicate(lecture)]
+            if lectures:
+                filtered_courses.append(dict(course, Lectures=lectures))
+
+        if filtered_courses:
+            filtered_schools.append(dict(school, Courses=filtered_courses))
+
+    return filtered_schools
+
+
+def select_stale_lectures(schools: List[Dict[str, Any]], store: LectureStateStore,
+                          freshness_hours: float = None) -> List[Dict[str, Any]]:
+    """
+    Filters a school/course/lecture tree down to the lectures that need a new search.
+
+    A lecture needs a search if it was never searched (e.g. newly added to the catalog)
+    or if its last search is older than the freshness window.
+
+    Args:
+        schools (list): List containing school, course, and lecture information
+        store (LectureStateStore): State of previous searches
+        freshness_hours (float): Age after which a lecture is searched again
+
+    Returns:
+        list: Tree of the same shape with only the stale lectures (empty courses and schools dropped)
+    """
+    # Use configuration default if not provided
+    if freshness_hours is None:
+        freshness_hours = config.LECTURE_FRESHNESS_HOURS
+
+    cutoff = time.time() - freshness_hours * 3600
+
+    def is_stale(lecture: Dict[str, Any]) -> bool:
+        state = store.get(lecture["lectureId"])
+        return state is None or state["searched_at"] < cutoff
+
+    return filter_lectures(schools, is_stale)
+
+
+def diff_search_results(store: LectureStateStore, searched_schools: List[Dict[str, Any]],
+                        lecture_videos: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[Any, List[Dict[str, Any]]]]:
+    """
+    Compares new search results with the stored ones.
+
+    Each changed row has a "changeType" of "added", "changed" or "removed". Removed
+    rows carry the last known values of the video. Nothing is stored here: pass the
+    returned results to store.put_many() once the changes are saved.
+
+    Every lecture in `searched_schools` counts as searched successfully, so a lecture
+    without rows has no videos any more. Leave lectures whose search failed out of
+    `searched_schools` (see get_lecture_videos()'s `failed`), so they keep their old
+    videos and stay stale until they are retried.
+
+    Args:
+        store (LectureStateStore): State of previous searches
+        searched_schools (list): Tree of the lectures that were searched successfully
+        lecture_videos (list): Lecture video rows found by the search
+
+    Returns:
+        tuple: Added, changed and removed lecture video rows, and the new result set of each lecture
+    """
+    videos_by_lecture: Dict[str, List[Dict[str, Any]]] = {}
+    for video in lecture_videos:
+        videos_by_lecture.setdefault(str(video["lectureId"]), []).append(video)
+
+    delta = []
+    results = {}
+
+    for lecture in iter_lectures(searched_schools):
+        lecture_id = lecture["lectureId"]
+        new_videos = videos_by_lecture.get(str(lecture_id), [])
+        state = store.get(lecture_id)
+        old_videos = state["videos"] if state else []
+
+        old_by_id = {video["youtubeVideoID"]: video for video in old_videos}
+        new_ids = set()
+
+        for video in new_videos:
+            new_ids.add(video["youtubeVideoID"])
+            old_video = old_by_id.get(video["youtubeVideoID"])
+            if old_video is None:
+                delta.append(dict(video, changeType="added"))
+            elif any(old_video.get(field) != video.get(field) for field in COMPARED_FIELDS):
+                delta.append(dict(video, changeType="changed"))
+
+        for video in old_videos:
+            if video["youtubeVideoID"] not in new_ids:
+                delta.append(dict(video, changeType="removed"))
+
+        results[lecture_id] = new_videos
+
+    return delta, results
+
+
+def iter_all_lecture_videos(schools: List[Dict[str, Any]], store: LectureStateStore,
+                            results: Dict[Any, List[Dict[str, Any]]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yields the latest known lecture video rows of every lecture in the catalog.
+
+    Rows are read from the store one lecture at a time while they are consumed
+    (e.g. by save_results_to_json()), so the whole catalog's rows are never held
+    in memory at once.
+
+    Args:
+        schools (list): List containing school, course, and lecture information
+        store (LectureStateStore): State of previous searches
+        results (dict): New result sets by lecture ID that override the stored ones
+
+    Yields:
+        dict: Lecture video rows in catalog order
+    """
+    if results is None:
+        results = {}
+
+    for lecture in iter_lectures(schools):
+        if lecture["lectureId"] in results:
+            yield from results[lecture["lectureId"]]
+            continue
+
+        state = store.get(lecture["lectureId"])
+        if state:
+            yield from state["videos"]
+
+
+_store: Optional[LectureStateStore] = None
+_store_lock = threading.Lock()
+
+
+def get_lecture_state_store() -> Optional[LectureStateStore]:
+    """
+    Returns the process-wide lecture state store, opening it on first use.
+
+    Returns:
+        LectureStateStore: Shared store, or None if delta sync is disabled (empty LECTURE_STATE_PATH)
+    """
+    global _store
+
+    if not config.LECTURE_STATE_PATH:
+        return None
+
+    with _store_lock:
+        if _store is None:
+            _store = LectureStateStore()
+        return _store
@@ -0,0 +1,319 @@
+"""
+Minimal in-process metrics (counters and histograms) with Prometheus text output.
+
+Metrics recorded in another process (e.g. the crawler worker) can be exported from
+there and loaded here, and are then included in the rendered output and summaries.
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+# Histogram buckets in seconds, from fast parses to slow page loads and uploads
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+LabelValues = Tuple[str, ...]
+
+
+class Counter:
+    """
+    Monotonically increasing count, optionally split by label values.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._external: Dict[str, Dict[LabelValues, float]] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def values(self) -> Dict[LabelValues, float]:
+        """
+        Returns the value of each series, including the values loaded from other processes.
+        """
+        with self._lock:
+            values = dict(self._values)
+            for external in self._external.values():
+                for key, value in external.items():
+                    values[key] = values.get(key, 0) + value
+        return values
+
+    def export(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def load_external(self, source: str, exported: Dict[LabelValues, float]) -> None:
+        with self._lock:
+            self._external[source] = dict(exported)
+
+    def total(self, **labels: str) -> float:
+        """
+        Returns the sum over all series matching the given labels.
+        """
+        return sum(value for key, value in self.values().items() if _matches(self.labelnames, key, labels))
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(self.values().items())]
+
+
+class Histogram:
+    """
+    Distribution of observed values in cumulative buckets, optionally split by label values.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per series: bucket counts (last one is +Inf), sum and count
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._external: Dict[str, Dict[LabelValues, Tuple[List[int], List[float]]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            counts, totals = self._series.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0, 0]))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            else:
+                counts[-1] += 1
+            totals[0] += value
+            totals[1] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """
+        Observes the duration of the `with` block in seconds, also when it raises.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def summary(self) -> Dict[LabelValues, Dict[str, float]]:
+        """
+        Returns "count", "sum" and "avg" per series.
+        """
+        return {
+            key: {"count": totals[1], "sum": totals[0], "avg": totals[0] / totals[1] if totals[1] else 0.0}
+            for key, (_, totals) in self.series().items()
+        }
+
+    def series(self) -> Dict[LabelValues, Tuple[List[int], List[float]]]:
+        """
+        Returns the bucket counts and [sum, count] of each series, including the
+        series loaded from other processes.
+        """
+        with self._lock:
+            merged = {key: (list(counts), list(totals)) for key, (counts, totals) in self._series.items()}
+            for external in self._external.values():
+                for key, (counts, totals) in external.items():
+                    if key not in merged:
+                        merged[key] = ([0] * (len(self.buckets) + 1), [0.0, 0])
+                    merged_counts, merged_totals = merged[key]
+                    for index, count in enumerate(counts):
+                        merged_counts[index] += count
+                    merged_totals[0] += totals[0]
+                    merged_totals[1] += totals[1]
+        return merged
+
+    def export(self) -> Dict[LabelValues, Tuple[List[int], List[float]]]:
+        with self._lock:
+            return {key: (list(counts), list(totals)) for key, (counts, totals) in self._series.items()}
+
+    def load_external(self, source: str, exported: Dict[LabelValues, Tuple[List[int], List[float]]]) -> None:
+        with self._lock:
+            self._external[source] = {key: (list(counts), list(totals)) for key, (counts, totals) in exported.items()}
+
+    def render(self) -> List[str]:
+        series = self.series()
+
+        lines = []
+        for key, (counts, totals) in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames + ('le',), key + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(totals[0])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {totals[1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Collection of metrics rendered together in the Prometheus text format.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """
+        Returns every metric in the Prometheus text exposition format (version 0.0.4).
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def export(self) -> Dict[str, object]:
+        """
+        Returns this process's own metric values, to be loaded into another process's registry.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.export() for metric in metrics}
+
+    def load_external(self, source: str, exported: Dict[str, object]) -> None:
+        """
+        Includes the values exported by another process, replacing earlier values from the same source.
+
+        Args:
+            source (str): Name of the other process, e.g. "crawler-<pid>"
+            exported (dict): Result of export() in that process
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+        for name, values in exported.items():
+            if name in metrics:
+                metrics[name].load_external(source, values)
+
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+
+def _label_key(labelnames: Tuple[str, ...], labels: Dict[str, str]) -> LabelValues:
+    if set(labels) != set(labelnames):
+        raise ValueError(f"Expected labels {labelnames}, got {tuple(labels)}")
+    return tuple(str(labels[name]) for name in labelnames)
+
+
+def _matches(labelnames: Tuple[str, ...], key: LabelValues, labels: Dict[str, str]) -> bool:
+    return all(key[labelnames.index(name)] == str(value) for name, value in labels.items())
+
+
+def _format_labels(labelnames: Tuple[str, ...], values: LabelValues) -> str:
+    if not labelnames:
+        return ""
+    pairs = []
+    for name, value in zip(labelnames, values):
+        escaped = value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+# Process-wide registry and the application's metrics
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "scrapper_stage_seconds", "Time spent per stage of a run", ["stage"]
+)
+QUERIES = REGISTRY.counter(
+    "scrapper_queries_total", "YouTube search queries by backend and outcome", ["backend", "outcome"]
+)
+RESULT_PAGES = REGISTRY.counter(
+    "scrapper_result_pages_total", "Search result pages read", ["backend"]
+)
+CANDIDATES = REGISTRY.counter(
+    "scrapper_candidates_total", "Distinct candidate videos seen in search results"
+)
+EMBED_CHECKS = REGISTRY.counter(
+    "scrapper_embed_checks_total", "Embeddability checks by result (embeddable, not_embeddable, error)", ["result"]
+)
+HTTP_ERRORS = REGISTRY.counter(
+    "scrapper_http_errors_total", "Failed HTTP requests by target and status (or exception)", ["target", "status"]
+)
+THROTTLED_REQUESTS = REGISTRY.counter(
+    "scrapper_youtube_throttled_total", "YouTube requests answered with a rate limit or consent/bot check page", ["target"]
+)
+LECTURES = REGISTRY.counter(
+    "scrapper_lectures_total", "Lecture searches by outcome (searched, shared, restored, failed, throttled)", ["outcome"]
+)
+BROWSER_PEAK_RSS = REGISTRY.histogram(
+    "scrapper_browser_peak_rss_bytes", "Peak memory (PSS) of the Chrome process tree per query",
+    buckets=[size * 1024 * 1024 for size in (64, 128, 192, 256, 320, 384, 448, 512, 768, 1024)]
+)
+MEMORY_ACTIONS = REGISTRY.counter(
+    "scrapper_browser_memory_actions_total", "Browser memory actions (trim, stop, recycle)", ["action"]
+)
+UPLOADED_VIDEOS = REGISTRY.counter(
+    "scrapper_uploaded_videos_total", "Lecture video rows sent to the API by outcome", ["outcome"]
+)
+
+
+def stage_timer(stage: str):
+    """
+    Returns a context manager timing one stage into STAGE_SECONDS.
+
+    Args:
+        stage (str): Stage name, e.g. "page_load" or "embed_check"
+    """
+    return STAGE_SECONDS.time(stage=stage)
+
+
+def metrics_summary() -> Dict[str, object]:
+    """
+    Summarizes the metrics for /status.
+
+    Returns:
+        dict: Per-stage "count", "total_seconds" and "avg_seconds", and the main counters
+    """
+    stages = {
+        key[0]: {"count": int(values["count"]), "total_seconds": round(values["sum"], 3),
+                 "avg_seconds": round(values["avg"], 3)}
+        for key, values in sorted(STAGE_SECONDS.summary().items())
+    }
+
+    checked = EMBED_CHECKS.total(result="embeddable") + EMBED_CHECKS.total(result="not_embeddable")
+    return {
+        "stages": stages,
+        "queries": int(QUERIES.total()),
+        "failed_queries": int(QUERIES.total(outcome="error")),
+        "candidates": int(CANDIDATES.total()),
+        "embed_checks": int(EMBED_CHECKS.total()),
+        "embeddable_ratio": round(EMBED_CHECKS.total(result="embeddable") / checked, 3) if checked else None,
+        "http_errors": int(HTTP_ERRORS.total()),
+        "throttled_requests": int(THROTTLED_REQUESTS.total()),
+        "browser_memory_actions": {key[0]: int(value) for key, value in sorted(MEMORY_ACTIONS.values().items())},
+        "uploaded_videos": int(UPLOADED_VIDEOS.total(outcome="saved"))
+    }
@@ -0,0 +1,267 @@
+"""
+Continuous refresh of the lectures whose search results are the most stale.
+"""
+
+import sys
+import time
+import heapq
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Import configuration
+sys.path.append('..')
+import config
+from utils.lecture_state import LectureStateStore, filter_lectures, iter_lectures
+
+# Due time of lectures that were never searched, which sorts before every overdue lecture
+NEW_LECTURE_DUE_AT = float("-inf")
+
+# Lectures with fewer videos than this share of MAX_RESULTS_PER_LECTURE ...
+FEW_RESULTS_FRACTION = 0.5
+# ... are refreshed this many times as often as the others
+FEW_RESULTS_WEIGHT = 2.0
+
+# Seconds before a lecture whose refresh did not record a result (failed save, throttling) is tried again
+RETRY_DELAY = 900
+
+# Seconds before a catalog load that failed is tried again
+CATALOG_RETRY_DELAY = 60
+
+# Receives the whole catalog and the tree of the lectures to refresh now
+RefreshFunction = Callable[[List[Dict[str, Any]], List[Dict[str, Any]]], None]
+# Receives the whole catalog and writes out the latest results of all its lectures
+ExportFunction = Callable[[List[Dict[str, Any]]], None]
+
+
+class RefreshScheduler:
+    """
+    Refreshes lectures one small batch at a time, in order of when they fall due.
+
+    A lecture is due LECTURE_FRESHNESS_HOURS divided by its weight after its last
+    search, so lectures with few videos are refreshed more often. Never searched
+    lectures are due before all others, however long other lectures have been
+    overdue. Lectures are kept in a heap ordered by due time, and refreshes are
+    spread out by a budget of searches per hour (a token bucket holding up to one
+    batch), so the load is steady instead of one daily burst.
+
+    A batch is only taken once the budget covers all due lectures up to a full batch,
+    so a backlog is worked off in full batches rather than one lecture per search
+    the budget allows. The results file is exported every REFRESH_EXPORT_BATCHES
+    batches and before each catalog reload, instead of after every batch.
+
+    The catalog is reloaded every REFRESH_CATALOG_RELOAD_SECONDS; a load that fails
+    is retried after CATALOG_RETRY_DELAY, keeping the previous catalog meanwhile.
+
+    Between batches the thread waits on a condition until the next lecture is due,
+    the budget covers the due lectures or the catalog is to be reloaded, whichever
+    comes first; stop() wakes it at once.
+    """
+
+    def __init__(self, refresh: RefreshFunction, load_catalog: Callable[[], Optional[List[Dict[str, Any]]]],
+                 store: LectureStateStore, searches_per_hour: float = None, batch_size: int = None,
+                 freshness_hours: float = None, catalog_reload_seconds: float = None,
+                 export_results: Optional[ExportFunction] = None, export_batches: int = None):
+        """
+        Args:
+            refresh (callable): Searches and saves a batch, see RefreshFunction
+            load_catalog (callable): Returns the school/course/lecture tree, or None on failure
+            store (LectureStateStore): State of previous searches, read for the due times
+            searches_per_hour (float): Budget of lecture searches per hour
+            batch_size (int): Maximum number of lectures refreshed together
+            freshness_hours (float): Age after which a lecture with weight 1 is due
+            catalog_reload_seconds (float): Seconds between reloads of the catalog
+            export_results (callable): Writes out the results of the catalog, see ExportFunction
+            export_batches (int): Batches between exports of the results
+        """
+        # Use configuration defaults if not provided
+        if searches_per_hour is None:
+            searches_per_hour = config.REFRESH_SEARCHES_PER_HOUR
+        if batch_size is None:
+            batch_size = config.REFRESH_BATCH_SIZE
+        if freshness_hours is None:
+            freshness_hours = config.LECTURE_FRESHNESS_HOURS
+        if catalog_reload_seconds is None:
+            catalog_reload_seconds = config.REFRESH_CATALOG_RELOAD_SECONDS
+        if export_batches is None:
+            export_batches = config.REFRESH_EXPORT_BATCHES
+
+        self.refresh = refresh
+        self.load_catalog = load_catalog
+        self.store = store
+        self.rate = searches_per_hour / 3600
+        self.batch_size = max(1, batch_size)
+        self.freshness = freshness_hours * 3600
+        self.catalog_reload_seconds = catalog_reload_seconds
+        self.export_results = export_results
+        self.export_batches = max(1, export_batches)
+
+        self._catalog: List[Dict[str, Any]] = []
+        self._reload_at = float("-inf")
+        self._heap: List[Tuple[float, float, str]] = []
+        self._due: Dict[str, float] = {}
+        self._tokens = float(self.batch_size)
+        self._tokens_at = time.monotonic()
+        self._unexported_batches = 0
+        self._stopped = False
+        self._condition = threading.Condition()
+
+    def priority(self, lecture: Dict[str, Any]) -> Tuple[float, float]:
+        """
+        Returns when a lecture is due (epoch seconds, NEW_LECTURE_DUE_AT if never searched) and its weight.
+        """
+        state = self.store.get(lecture["lectureId"])
+        if state is None:
+            return NEW_LECTURE_DUE_AT, 1.0
+
+        weight = 1.0
+        if len(state["videos"]) < config.MAX_RESULTS_PER_LECTURE * FEW_RESULTS_FRACTION:
+            weight = FEW_RESULTS_WEIGHT
+        return state["searched_at"] + self.freshness / weight, weight
+
+    def reload_catalog(self) -> None:
+        """
+        Loads the catalog and rebuilds the queue; keeps the previous catalog if loading fails.
+        """
+        catalog = self.load_catalog()
+        if not catalog:
+            delay = min(CATALOG_RETRY_DELAY, self.catalog_reload_seconds)
+            self._reload_at = time.monotonic() + delay
+            print(f"Could not load the catalog, keeping the previous one and retrying in {delay:.0f}s.")
+            return
+        self._reload_at = time.monotonic() + self.catalog_reload_seconds
+
+        heap = []
+        due = {}
+        for lecture in iter_lectures(catalog):
+            due_at, weight = self.priority(lecture)
+            lecture_id = str(lecture["lectureId"])
+            due[lecture_id] = due_at
+            heap.append((due_at, -weight, lecture_id))
+        heapq.heapify(heap)
+
+        with self._condition:
+            self._catalog = catalog
+            self._heap = heap
+            self._due = due
+
+        overdue = sum(1 for due_at in due.values() if due_at <= time.time())
+        # Searches per hour to keep every lecture fresh
+        needed = sum(-neg_weight for _, neg_weight, _ in heap) * 3600 / self.freshness if self.freshness else 0
+        print(f"Refresh queue: {len(heap)} lectures, {overdue} due now. Keeping them fresh needs about "
+              f"{needed:.0f} searches per hour, the budget is {self.rate * 3600:.0f}.")
+
+    def run(self) -> None:
+        """
+        Refreshes due lectures until stop() is called.
+        """
+        print(f"Continuous refresh started. {time.strftime('%Y-%m-%d %H:%M:%S')}")
+        while True:
+            if time.monotonic() >= self._reload_at:
+                self._export()
+                self.reload_catalog()
+
+            with self._condition:
+                if self._stopped:
+                    break
+                batch, wait = self._next_batch()
+                if not batch:
+                    self._condition.wait(wait)
+                    continue
+                catalog = self._catalog
+
+            self._refresh_batch(catalog, batch)
+            self._unexported_batches += 1
+            if self._unexported_batches >= self.export_batches:
+                self._export()
+
+        self._export()
+        print("Continuous refresh stopped.")
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    def _next_batch(self) -> Tuple[List[str], float]:
+        """
+        Takes the lectures to refresh now, or returns how long to wait.
+
+        Returns:
+            tuple: IDs of the due lectures, up to one batch (empty if none or if the
+                   budget does not cover them yet), and the seconds until the next
+                   lecture is due or the budget covers the due lectures
+        """
+        now = time.monotonic()
+        self._tokens = min(self.batch_size, self._tokens + (now - self._tokens_at) * self.rate)
+        self._tokens_at = now
+
+        # Drop entries of lectures that were rescheduled or left the catalog
+        while self._heap and self._due.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+        reload_in = max(0.0, self._reload_at - now)
+        if not self._heap:
+            return [], reload_in
+
+        due_in = self._heap[0][0] - time.time()
+        if due_in > 0:
+            return [], min(due_in, reload_in)
+
+        entries = []
+        while self._heap and len(entries) < self.batch_size:
+            entry = heapq.heappop(self._heap)
+            if self._due.get(entry[2]) != entry[0]:
+                continue
+            if entry[0] > time.time():
+                heapq.heappush(self._heap, entry)
+                break
+            entries.append(entry)
+
+        # Wait until the budget covers every due lecture of the batch
+        if self._tokens < len(entries):
+            for entry in entries:
+                heapq.heappush(self._heap, entry)
+            wait = (len(entries) - self._tokens) / self.rate if self.rate else reload_in
+            return [], min(wait, reload_in)
+
+        batch = []
+        for _, _, lecture_id in entries:
+            del self._due[lecture_id]
+            batch.append(lecture_id)
+        self._tokens -= len(batch)
+        return batch, 0.0
+
+    def _export(self) -> None:
+        """
+        Exports the results if batches were refreshed since the last export.
+        """
+        if self.export_results is None or not self._unexported_batches:
+            return
+        self._unexported_batches = 0
+
+        try:
+            self.export_results(self._catalog)
+        except Exception as e:
+            print(f"Error exporting results: {str(e)}")
+
+    def _refresh_batch(self, catalog: List[Dict[str, Any]], batch: List[str]) -> None:
+        ids = set(batch)
+        due_schools = filter_lectures(catalog, lambda lecture: str(lecture["lectureId"]) in ids)
+        started_at = time.time()
+        print(f"\nRefreshing {len(batch)} lectures... {time.strftime('%Y-%m-%d %H:%M:%S')}")
+
+        try:
+            self.refresh(catalog, due_schools)
+        except Exception as e:
+            print(f"Error refreshing lectures: {str(e)}")
+
+        # Queue the lectures again by their new state; those without a new result are retried later
+        with self._condition:
+            for lecture in iter_lectures(due_schools):
+                lecture_id = str(lecture["lectureId"])
+                due_at, weight = self.priority(lecture)
+                state = self.store.get(lecture["lectureId"])
+                if state is None or state["searched_at"] < started_at:
+                    due_at = time.time() + RETRY_DELAY
+                self._due[lecture_id] = due_at
+                heapq.heappush(self._heap, (due_at, -weight, lecture_id))
@@ -2,9 +2,11 @@
 Scheduler utility for running tasks on a schedule.
 """
 
+import os
 import time
 import json
-from typing import Callable, List, Dict, Any
+import tempfile
+from typing import Callable, Dict, Any, Iterable, Iterator
 import schedule
 import sys
 
@@ -12,18 +14,136 @@ import sys
 sys.path.append('..')
 import config
 
-def save_results_to_json(data: List[Dict[str, Any]], filename: str = "lecture_videos.json") -> None:
+# Size of the chunks read when streaming a results file back
+READ_CHUNK_SIZE = 64 * 1024
+
+def save_results_to_json(data: Iterable[Dict[str, Any]], filename: str = "lecture_videos.json",
+                         results_format: str = None) -> int:
     """
-    Saves results to a JSON file.
+    Saves results to a JSON file, one record at a time.
+    
+    Records are written as they are produced, so `data` can be a generator and is
+    never held in memory as a whole. The file is written next to its destination
+    and then renamed over it, so readers see either the old or the new file, never
+    a partial one.
     
     Args:
-        data (list): Data to save
+        data (iterable): Records to save
         filename (str): Name of the file to save to
+        results_format (str): "json" (compact JSON array) or "ndjson" (one record per line),
+                              defaults to config.RESULTS_FORMAT
+        
+    Returns:
+        int: Number of records written
     """
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # Use configuration default if not provided
+    if results_format is None:
+        results_format = config.RESULTS_FORMAT
+    if results_format not in ("json", "ndjson"):
+        raise ValueError(f"Unknown results format: {results_format}")
+    
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(filename) + ".", suffix=".tmp", dir=directory)
+    count = 0
+    
+    try:
+        # mkstemp creates the file readable by the owner only
+        os.chmod(temp_path, 0o644)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            if results_format == "json":
+                f.write("[")
+            
+            for record in data:
+                line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+                if results_format == "json":
+                    f.write(("," if count else "") + "\n" + line)
+                else:
+                    f.write(line + "\n")
+                count += 1
+            
+            if results_format == "json":
+                f.write("\n]\n")
+            
+            f.flush()
+            os.fsync(f.fileno())
+        
+        os.replace(temp_path, filename)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
     
     print(f"Results saved to {filename}.")
+    return count
+
+def iter_results_from_json(filename: str = "lecture_videos.json") -> Iterator[Dict[str, Any]]:
+    """
+    Reads a results file back one record at a time.
+    
+    Works with both formats written by save_results_to_json() (detected from the
+    first character) and with older pretty-printed files.
+    
+    Args:
+        filename (str): Name of the file to read
+        
+    Yields:
+        dict: The next record
+        
+    Raises:
+        ValueError: If the file is not valid JSON or NDJSON
+    """
+    decoder = json.JSONDecoder()
+    
+    with open(filename, "r", encoding="utf-8") as f:
+        buffer = ""
+        position = 0
+        in_array = None
+        finished = False
+        eof = False
+        
+        while True:
+            # Skip whitespace and separators between records
+            while position < len(buffer) and (buffer[position].isspace() or (in_array and buffer[position] == ",")):
+                position += 1
+            
+            if position < len(buffer):
+                if in_array is None:
+                    in_array = buffer[position] == "["
+                    if in_array:
+                        position += 1
+                    continue
+                
+                if in_array and buffer[position] == "]":
+                    finished = True
+                    position += 1
+                    continue
+                
+                if finished:
+                    raise ValueError(f"Unexpected data after the end of {filename}")
+                
+                try:
+                    record, end = decoder.raw_decode(buffer, position)
+                except ValueError:
+                    # The record may continue in the next chunk
+                    if eof:
+                        raise
+                else:
+                    position = end
+                    yield record
+                    continue
+            
+            if eof:
+                break
+            
+            chunk = f.read(READ_CHUNK_SIZE)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+        
+        if in_array and not finished:
+            raise ValueError(f"Unexpected end of {filename}")
 
 def run_scheduled_job(job_function: Callable, schedule_time: str = None) -> None:
     """
@@ -48,11 +168,12 @@ def run_scheduled_job(job_function: Callable, schedule_time: str = None) -> None
         print("Matched start time, running immediately...")
         job_function()
     
-    # Infinite loop to check scheduler
+    # Infinite loop to run the scheduler
     while True:
         try:
             schedule.run_pending()
-            time.sleep(60)  # Check every minute
+            # Sleep until the next run is due instead of checking every minute
+            time.sleep(max(1, schedule.idle_seconds() or 60))
         except KeyboardInterrupt:
             print("Program stopped by user.")
             break
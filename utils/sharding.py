@@ -0,0 +1,195 @@
+"""
+Partitioning of the lecture catalog into shards crawled by separate processes or machines.
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Import configuration
+sys.path.append('..')
+import config
+from utils.lecture_state import filter_lectures, iter_lectures
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """
+    Parses a shard specification.
+
+    Args:
+        spec (str): "i/N", shard i (0-based) of N
+
+    Returns:
+        tuple: Shard index and shard count
+
+    Raises:
+        ValueError: If the specification is malformed or out of range
+    """
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard {spec!r}, expected i/N") from None
+
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard {spec!r}, index must be between 0 and {count - 1}")
+    return index, count
+
+
+def shard_of(lecture_id: Any, shard_count: int) -> int:
+    """
+    Returns the shard a lecture belongs to.
+
+    Uses a hash of the lecture ID that is the same in every process and on every
+    machine (unlike Python's hash()), so all workers agree on the partition.
+    """
+    digest = hashlib.sha1(str(lecture_id).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shard_count
+
+
+def select_shard(schools: List[Dict[str, Any]], shard_index: int, shard_count: int) -> List[Dict[str, Any]]:
+    """
+    Filters a school/course/lecture tree down to the lectures of one shard.
+    """
+    return filter_lectures(schools, lambda lecture: shard_of(lecture["lectureId"], shard_count) == shard_index)
+
+
+def current_run_id() -> str:
+    """
+    Returns the ID of the current sharded run: SHARD_RUN_ID, or else today's date, so
+    the shards and the merge of one day agree without coordination.
+    """
+    return config.SHARD_RUN_ID or time.strftime("%Y-%m-%d")
+
+
+def partial_result_path(shard_index: int, shard_count: int, directory: str = None) -> str:
+    # Use configuration default if not provided
+    if directory is None:
+        directory = config.SHARD_RESULTS_DIR
+    return os.path.join(directory, f"lecture_videos.shard-{shard_index}-of-{shard_count}.json")
+
+
+def write_partial_result(shard_schools: List[Dict[str, Any]], lecture_videos: List[Dict[str, Any]],
+                         shard_index: int, shard_count: int, run_id: str = None, directory: str = None) -> str:
+    """
+    Writes the result of one shard's crawl.
+
+    The file lists the searched lecture IDs next to the videos, so the merge step
+    also knows about lectures that returned no videos, and is tagged with the run
+    ID. It is written to a temporary file first and renamed, so a merge never reads
+    a half-written result.
+
+    Args:
+        shard_schools (list): Tree of the lectures the shard searched
+        lecture_videos (list): Lecture video rows found
+        shard_index (int): Shard index
+        shard_count (int): Shard count
+        run_id (str): Run the result belongs to (defaults to current_run_id())
+        directory (str): Directory of the partial results
+
+    Returns:
+        str: Path of the written file
+    """
+    # Use default if not provided
+    if run_id is None:
+        run_id = current_run_id()
+
+    path = partial_result_path(shard_index, shard_count, directory)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    partial = {
+        "shard": shard_index,
+        "shardCount": shard_count,
+        "runId": run_id,
+        "createdAt": time.time(),
+        "lectureIds": [lecture["lectureId"] for lecture in iter_lectures(shard_schools)],
+        "videos": lecture_videos
+    }
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(partial, f, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+    print(f"Shard {shard_index}/{shard_count} of run {run_id}: saved {len(lecture_videos)} videos to {path}.")
+    return path
+
+
+def read_partial_result(shard_index: int, shard_count: int, directory: str = None) -> Optional[Dict[str, Any]]:
+    """
+    Reads one shard's partial result.
+
+    Returns:
+        dict: Partial result, or None if the shard has not written one
+    """
+    try:
+        with open(partial_result_path(shard_index, shard_count, directory), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def merge_partial_results(shard_count: int, run_id: str = None,
+                          directory: str = None) -> Tuple[Set[str], List[Dict[str, Any]]]:
+    """
+    Combines the partial results of all shards of one run.
+
+    Rows are de-duplicated by lecture and video ID, keeping the first one. Results
+    left from another run (e.g. yesterday's, while today's shards are still running)
+    count as missing, so they are never merged.
+
+    Args:
+        shard_count (int): Number of shards to merge
+        run_id (str): Run to merge (defaults to current_run_id())
+        directory (str): Directory of the partial results
+
+    Returns:
+        tuple: IDs (as str) of the searched lectures, and the merged lecture video rows
+
+    Raises:
+        FileNotFoundError: If a shard has not written its result for the run
+    """
+    # Use default if not provided
+    if run_id is None:
+        run_id = current_run_id()
+
+    partials = [read_partial_result(index, shard_count, directory) for index in range(shard_count)]
+    missing = [index for index, partial in enumerate(partials) if partial is None or partial.get("runId") != run_id]
+    if missing:
+        raise FileNotFoundError(f"Missing partial results of run {run_id} for shards {missing} of {shard_count}")
+
+    lecture_ids: Set[str] = set()
+    merged: List[Dict[str, Any]] = []
+    seen: Set[Tuple[str, str]] = set()
+
+    for partial in partials:
+        lecture_ids.update(str(lecture_id) for lecture_id in partial["lectureIds"])
+        for video in partial["videos"]:
+            key = (str(video["lectureId"]), video["youtubeVideoID"])
+            if key not in seen:
+                seen.add(key)
+                merged.append(video)
+
+    print(f"Merged {shard_count} shards of run {run_id}: {len(lecture_ids)} lectures, {len(merged)} videos.")
+    return lecture_ids, merged
+
+
+def remove_partial_results(shard_count: int, run_id: str = None, directory: str = None) -> None:
+    """
+    Removes the partial results of a run once its merged result is saved.
+
+    A file that a shard of another run has written in the meantime is kept.
+    """
+    # Use default if not provided
+    if run_id is None:
+        run_id = current_run_id()
+
+    for index in range(shard_count):
+        partial = read_partial_result(index, shard_count, directory)
+        if partial is not None and partial.get("runId") == run_id:
+            try:
+                os.remove(partial_result_path(index, shard_count, directory))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,107 @@
+"""
+In-memory index of the found lecture videos, used to serve /api/videos.
+"""
+
+import os
+import sys
+import json
+import gzip
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.append('..')
+from utils.scheduler import iter_results_from_json
+
+
+class VideoIndex:
+    """
+    Keeps the lecture videos file loaded in memory, indexed by lectureId.
+
+    The file is parsed again only when its modification time or size changes.
+    Serialized (and gzip-compressed) responses are cached per query until then.
+    """
+
+    def __init__(self, filename: str = "lecture_videos.json", cache_size: int = 256):
+        """
+        Args:
+            filename (str): Lecture videos file written by save_results_to_json() (JSON or NDJSON)
+            cache_size (int): Number of serialized responses kept in memory
+        """
+        self.filename = filename
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._version: Optional[Tuple[int, int]] = None
+        self._videos: List[Dict[str, Any]] = []
+        self._by_lecture: Dict[str, List[Dict[str, Any]]] = {}
+        self._responses: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+
+    def query(self, lecture_id: str = None, offset: int = 0, limit: int = None) -> Dict[str, Any]:
+        """
+        Returns a page of lecture videos as a serialized JSON response.
+
+        Args:
+            lecture_id (str): Only return videos of this lecture
+            offset (int): Number of matching videos to skip
+            limit (int): Maximum number of videos to return (all if None)
+
+        Returns:
+            dict: "body" (JSON bytes), "gzip_body" (compressed bytes, built on first use
+                  by gzip_body()), "total" (matching videos before paging) and "etag"
+        """
+        with self._lock:
+            self._reload_if_changed()
+
+            key = (lecture_id, offset, limit)
+            response = self._responses.get(key)
+            if response is not None:
+                self._responses.move_to_end(key)
+                return response
+
+            videos = self._videos if lecture_id is None else self._by_lecture.get(lecture_id, [])
+            page = videos[offset:] if limit is None else videos[offset:offset + limit]
+
+            response = {
+                "body": json.dumps(page, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+                "gzip_body": None,
+                "total": len(videos),
+                "etag": 'W/"%x-%x"' % self._version
+            }
+            self._responses[key] = response
+            if len(self._responses) > self.cache_size:
+                self._responses.popitem(last=False)
+            return response
+
+    def gzip_body(self, response: Dict[str, Any]) -> bytes:
+        """
+        Returns the gzip-compressed body of a response from query(), compressing it once.
+        """
+        with self._lock:
+            if response["gzip_body"] is None:
+                response["gzip_body"] = gzip.compress(response["body"], compresslevel=6)
+            return response["gzip_body"]
+
+    def _reload_if_changed(self) -> None:
+        stat = os.stat(self.filename)
+        version = (stat.st_mtime_ns, stat.st_size)
+        if version == self._version:
+            return
+
+        videos: List[Dict[str, Any]] = []
+        by_lecture: Dict[str, List[Dict[str, Any]]] = {}
+        try:
+            # Build the index while streaming the records in
+            for video in iter_results_from_json(self.filename):
+                videos.append(video)
+                by_lecture.setdefault(str(video.get("lectureId")), []).append(video)
+        except ValueError as e:
+            # Keep serving the last good data if the file is not valid
+            if self._version is None:
+                raise
+            print(f"Could not reload {self.filename}, serving previous data: {str(e)}")
+            return
+
+        self._videos = videos
+        self._by_lecture = by_lecture
+        self._responses.clear()
+        self._version = version
@@ -0,0 +1,415 @@
+"""
+Search backends that fetch YouTube search results page by page.
+"""
+
+import re
+import sys
+import json
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+from .driver_pool import get_driver_pool
+from .http_session import get_http_session
+from .memory_watchdog import MemoryWatchdog, driver_pid
+from .rate_limiter import YouTubeThrottled, get_rate_limiter, is_throttle_url, limited_request
+from .parsing import NEW_RESULTS_SCRIPT, extract_result_items
+
+# Import configuration
+sys.path.append('..')
+import config
+from utils.metrics import BROWSER_PEAK_RSS, HTTP_ERRORS, MEMORY_ACTIONS, THROTTLED_REQUESTS, stage_timer
+
+# Number of result items currently on the page
+RESULT_COUNT_SCRIPT = "return document.querySelectorAll('div#dismissible').length;"
+
+# Whether YouTube rendered its "No results found" message instead of result items
+NO_RESULTS_SCRIPT = "return document.querySelector('ytd-background-promo-renderer') !== null;"
+
+# Marks the rendered result items as read, like NEW_RESULTS_SCRIPT does, before the full page is parsed
+MARK_READ_SCRIPT = """
+document.querySelectorAll('div#dismissible:not([data-scraped])').forEach((element) => {
+    const titleElement = element.querySelector('a#video-title');
+    if (titleElement && titleElement.getAttribute('href')) {
+        element.setAttribute('data-scraped', '1');
+    }
+});
+"""
+
+# Removes the result items already read (marked) from the page, so the DOM stops growing with every scroll
+TRIM_RESULTS_SCRIPT = """
+const elements = document.querySelectorAll('div#dismissible[data-scraped]');
+elements.forEach((element) => (element.closest('ytd-video-renderer') || element).remove());
+return elements.length;
+"""
+
+# Share of CHROME_MEMORY_LIMIT_MB above which read results are trimmed from the page
+MEMORY_TRIM_FRACTION = 0.8
+
+
+class SearchBackend:
+    """
+    Base class of search backends.
+
+    A backend yields the raw result items of a query one page at a time (see
+    youtube.parsing for the item shape). For the browser a page is one scroll,
+    for plain HTTP it is one continuation. The caller decides when to stop and
+    closes the generator, which releases any resources the backend holds.
+    """
+
+    name = ""
+
+    def search_pages(self, query: str, stats: Dict[str, float] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yields the raw result items of a search query page by page.
+
+        Args:
+            query (str): Search query
+            stats (dict): Query stats; time spent waiting for pages is added to "wait_time"
+
+        Yields:
+            list: Raw result items of the next page
+        """
+        raise NotImplementedError
+
+
+class SeleniumSearchBackend(SearchBackend):
+    """
+    Loads the search page in headless Chrome and scrolls to load more results.
+
+    Instead of sleeping for a fixed time, it waits until the number of result items
+    grows or a timeout passes. With ADAPTIVE_SCROLL, a scroll that loads no new items
+    means the results are exhausted and ends the search.
+
+    A MemoryWatchdog samples the browser's memory (PSS) during the query and its peak is
+    recorded in the query stats ("peak_rss"). Above MEMORY_TRIM_FRACTION
+    of CHROME_MEMORY_LIMIT_MB the results already read are removed from the page before
+    the next scroll; if that does not bring it under the limit, scrolling stops. A browser
+    that went over the limit, or is still above the trim level after the query, is
+    recycled instead of being reused.
+
+    The page load and every scroll (which makes the page request the next results)
+    take a token from the shared YouTube rate limiter. Landing on a consent or bot
+    check page raises YouTubeThrottled. If the first results do not render within
+    PAGE_LOAD_TIMEOUT and YouTube did not show its "No results found" message, the
+    search fails instead of returning an empty result.
+    """
+
+    name = "selenium"
+
+    def search_pages(self, query: str, stats: Dict[str, float] = None) -> Iterator[List[Dict[str, Any]]]:
+        if stats is None:
+            stats = {"wait_time": 0.0}
+        pool = get_driver_pool()
+        incremental = config.EXTRACTION_MODE == "incremental"
+
+        # Take a warm WebDriver from the pool
+        with stage_timer("driver_acquire"):
+            driver = pool.acquire()
+        driver_broken = False
+        recycle = False
+
+        limit = config.CHROME_MEMORY_LIMIT_MB * 1024 * 1024
+        watchdog = MemoryWatchdog(driver_pid(driver)).start()
+        limiter = get_rate_limiter()
+
+        try:
+            # Go to YouTube search page and search for query (by relevance)
+            sent_at = limiter.acquire() if limiter else None
+            start = time.perf_counter()
+            with stage_timer("page_load"):
+                driver.get(f"{config.YOUTUBE_BASE_URL}/results?search_query=" + query.replace(" ", "+"))
+                # Note: CAMSAhAB parameter removed to use default relevance sorting
+
+                # Wait for the first results (or the no results message) to render
+                loaded = self._wait_for_first_results(driver, config.PAGE_LOAD_TIMEOUT)
+            stats["wait_time"] += time.perf_counter() - start
+
+            if loaded is None and is_throttle_url(driver.current_url):
+                if limiter:
+                    limiter.record(sent_at, "throttled")
+                THROTTLED_REQUESTS.inc(target="youtube_search")
+                raise YouTubeThrottled("YouTube showed a consent or bot check page instead of the search results")
+            if loaded is None:
+                # A page that never rendered is not an empty result
+                if limiter:
+                    limiter.record(sent_at, "error")
+                raise TimeoutException(f"Search results did not load within {config.PAGE_LOAD_TIMEOUT}s")
+            if limiter:
+                limiter.record(sent_at, "ok")
+            if not loaded:
+                print("YouTube found no results.")
+                return
+
+            while True:
+                with stage_timer("parse"):
+                    if incremental:
+                        items = driver.execute_script(NEW_RESULTS_SCRIPT)
+                    else:
+                        if limit:
+                            # The page source is read after marking, so it has every marked item
+                            driver.execute_script(MARK_READ_SCRIPT)
+                        items = extract_result_items(driver.page_source)
+                yield items
+
+                if limit and watchdog.rss > limit * MEMORY_TRIM_FRACTION:
+                    # Items rendered since the last read are not marked yet and stay
+                    trimmed = driver.execute_script(TRIM_RESULTS_SCRIPT)
+                    MEMORY_ACTIONS.inc(action="trim")
+                    print(f"Browser memory at {watchdog.rss / 1024 / 1024:.0f}MB, "
+                          f"removed {trimmed} read results from the page.")
+                    if watchdog.sample() > limit:
+                        MEMORY_ACTIONS.inc(action="stop")
+                        recycle = True
+                        print(f"Browser memory still above {config.CHROME_MEMORY_LIMIT_MB}MB. Stopping the scroll.")
+                        return
+
+                # Scroll down to load more videos
+                sent_at = limiter.acquire() if limiter else None
+                start = time.perf_counter()
+                with stage_timer("scroll_wait"):
+                    item_count = driver.execute_script(RESULT_COUNT_SCRIPT)
+                    driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.END)
+                    loaded = self._wait_for_results(driver, item_count, config.SCROLL_WAIT_TIMEOUT)
+                stats["wait_time"] += time.perf_counter() - start
+                if limiter:
+                    limiter.record(sent_at, "ok")
+
+                if not loaded and config.ADAPTIVE_SCROLL:
+                    print("Scroll loaded no new results, results are exhausted.")
+                    return
+        except Exception:
+            driver_broken = True
+            raise
+        finally:
+            peak = watchdog.stop()
+            if peak:
+                stats["peak_rss"] = max(stats.get("peak_rss", 0), peak)
+                BROWSER_PEAK_RSS.observe(peak)
+
+            # A browser that grew too large is replaced rather than reused
+            if limit and not driver_broken and (recycle or peak > limit or watchdog.rss > limit * MEMORY_TRIM_FRACTION):
+                MEMORY_ACTIONS.inc(action="recycle")
+                print(f"Recycling the browser (peak memory {peak / 1024 / 1024:.0f}MB).")
+                recycle = True
+
+            # Hand the driver back for the next query (a failed or recycled session is discarded)
+            pool.release(driver, discard=driver_broken or recycle)
+
+    @staticmethod
+    def _wait_for_first_results(driver, timeout: float) -> Optional[bool]:
+        """
+        Waits until the search page shows result items or YouTube's no results message.
+
+        Returns:
+            bool: True if results appeared, False if YouTube found no results,
+                  None if neither rendered before the timeout
+        """
+        def state(d) -> Optional[str]:
+            if d.execute_script(RESULT_COUNT_SCRIPT) > 0:
+                return "results"
+            # until() keeps waiting while the condition returns None
+            return "no_results" if d.execute_script(NO_RESULTS_SCRIPT) else None
+
+        try:
+            return WebDriverWait(driver, timeout, poll_frequency=0.1).until(state) == "results"
+        except TimeoutException:
+            return None
+
+    @staticmethod
+    def _wait_for_results(driver, item_count: int, timeout: float) -> bool:
+        """
+        Waits until the page has more than `item_count` result items.
+
+        Returns:
+            bool: True if new items appeared, False if the timeout passed first
+        """
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+                lambda d: d.execute_script(RESULT_COUNT_SCRIPT) > item_count
+            )
+            return True
+        except TimeoutException:
+            return False
+
+
+class HttpSearchBackend(SearchBackend):
+    """
+    Fetches the search page over plain HTTP and reads the embedded ytInitialData JSON.
+
+    Further pages are requested from the InnerTube search API with the
+    continuation token found in the previous page, instead of scrolling.
+    Every request goes through the shared YouTube rate limiter.
+    """
+
+    name = "http"
+
+    def search_pages(self, query: str, stats: Dict[str, float] = None) -> Iterator[List[Dict[str, Any]]]:
+        if stats is None:
+            stats = {"wait_time": 0.0}
+        session = get_http_session()
+
+        start = time.perf_counter()
+        with stage_timer("page_load"):
+            response = limited_request(
+                session, "GET", f"{config.YOUTUBE_BASE_URL}/results", "youtube_search",
+                params={"search_query": query}, timeout=10
+            )
+        stats["wait_time"] += time.perf_counter() - start
+        _raise_for_status(response, "youtube_search")
+        html = response.text
+
+        with stage_timer("parse"):
+            initial_data = extract_initial_data(html)
+            if initial_data is None:
+                raise ValueError("ytInitialData not found in search results page")
+
+            api_key = re.search(r'"INNERTUBE_API_KEY"\s*:\s*"([^"]+)"', html)
+            client_version = re.search(r'"INNERTUBE_CLIENT_VERSION"\s*:\s*"([^"]+)"', html)
+
+            items, token = parse_search_data(initial_data)
+        yield items
+
+        while token and api_key and client_version:
+            start = time.perf_counter()
+            with stage_timer("continuation"):
+                response = limited_request(
+                    session, "POST", f"{config.YOUTUBE_BASE_URL}/youtubei/v1/search", "youtube_continuation",
+                    params={"key": api_key.group(1)},
+                    json={
+                        "context": {"client": {"clientName": "WEB", "clientVersion": client_version.group(1)}},
+                        "continuation": token
+                    },
+                    timeout=10
+                )
+            stats["wait_time"] += time.perf_counter() - start
+            _raise_for_status(response, "youtube_continuation")
+
+            with stage_timer("parse"):
+                items, token = parse_search_data(response.json())
+            yield items
+
+
+def _raise_for_status(response, target: str) -> None:
+    """
+    Counts an HTTP error response in the metrics before raising it.
+    """
+    if response.status_code >= 400:
+        HTTP_ERRORS.inc(target=target, status=str(response.status_code))
+    response.raise_for_status()
+
+
+def extract_initial_data(html: str) -> Optional[Dict[str, Any]]:
+    """
+    Extracts the ytInitialData object embedded in a YouTube page.
+
+    Args:
+        html (str): HTML of the page
+
+    Returns:
+        dict: Decoded ytInitialData, or None if the page does not contain it
+    """
+    match = re.search(r'(?:var ytInitialData|window\["ytInitialData"\])\s*=\s*', html)
+    if not match:
+        return None
+
+    try:
+        data, _ = json.JSONDecoder().raw_decode(html, match.end())
+    except ValueError:
+        return None
+    return data
+
+
+def parse_search_data(data: Any) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Collects the videos and the continuation token from ytInitialData or a continuation response.
+
+    Args:
+        data: Decoded ytInitialData or InnerTube search response
+
+    Returns:
+        tuple: Raw result items in page order, and the next continuation token (or None)
+    """
+    items: List[Dict[str, Any]] = []
+    tokens: List[str] = []
+    _walk_search_data(data, items, tokens)
+    return items, (tokens[0] if tokens else None)
+
+
+def _walk_search_data(node: Any, items: List[Dict[str, Any]], tokens: List[str]) -> None:
+    if isinstance(node, list):
+        for child in node:
+            _walk_search_data(child, items, tokens)
+        return
+
+    if not isinstance(node, dict):
+        return
+
+    for key, value in node.items():
+        if key == "videoRenderer" and isinstance(value, dict):
+            item = _video_renderer_item(value)
+            if item is not None:
+                items.append(item)
+        elif key == "continuationItemRenderer" and isinstance(value, dict):
+            token = (value.get("continuationEndpoint", {})
+                     .get("continuationCommand", {})
+                     .get("token"))
+            if token:
+                tokens.append(token)
+        else:
+            _walk_search_data(value, items, tokens)
+
+
+def _video_renderer_item(renderer: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    video_id = renderer.get("videoId")
+    if not video_id:
+        return None
+
+    title = renderer.get("title", {})
+    title_text = _renderer_text(title)
+
+    # The results page shows the short form ("1.2M views"), so prefer it
+    view_text = (_renderer_text(renderer.get("shortViewCountText", {}))
+                 or _renderer_text(renderer.get("viewCountText", {})))
+
+    return {
+        'title': title_text,
+        'text': title_text,
+        'href': f'/watch?v={video_id}',
+        'aria_label': title.get("accessibility", {}).get("accessibilityData", {}).get("label", ""),
+        'view_spans': [view_text] if view_text else [],
+        'metadata_spans': []
+    }
+
+
+def _renderer_text(text: Dict[str, Any]) -> str:
+    if "simpleText" in text:
+        return text["simpleText"]
+    return "".join(run.get("text", "") for run in text.get("runs", []))
+
+
+SEARCH_BACKENDS = {
+    SeleniumSearchBackend.name: SeleniumSearchBackend,
+    HttpSearchBackend.name: HttpSearchBackend
+}
+
+
+def get_search_backend(name: str = None) -> SearchBackend:
+    """
+    Creates a search backend by name.
+
+    Args:
+        name (str): Backend name ("selenium" or "http"), defaults to config.SEARCH_BACKEND
+
+    Returns:
+        SearchBackend: Backend instance
+    """
+    # Use configuration default if not provided
+    if name is None:
+        name = config.SEARCH_BACKEND
+
+    if name not in SEARCH_BACKENDS:
+        raise ValueError(f"Unknown search backend: {name}")
+    return SEARCH_BACKENDS[name]()
@@ -0,0 +1,272 @@
+"""
+Pool of reusable headless Chrome WebDriver sessions.
+"""
+
+import os
+import sys
+import time
+import atexit
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+# Import configuration
+sys.path.append('..')
+import config
+from utils.metrics import MEMORY_ACTIONS, stage_timer
+
+# Requests blocked with BLOCK_HEAVY_RESOURCES: thumbnails, avatars, preview video and web fonts.
+# Search results are read from titles, links and view count text, which need none of them.
+BLOCKED_URL_PATTERNS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*://i.ytimg.com/*", "*://yt3.ggpht.com/*", "*://yt3.googleusercontent.com/*",
+    "*.mp4", "*.webm", "*.m4a", "*://*.googlevideo.com/*",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*://fonts.gstatic.com/*"
+]
+
+
+def create_driver(user_data_dir: str, block_heavy_resources: bool = None,
+                  log_network: bool = False) -> webdriver.Chrome:
+    """
+    Starts a new headless Chrome WebDriver session.
+
+    Args:
+        user_data_dir (str): Profile directory used only by this session
+        block_heavy_resources (bool): Skip loading images, media and fonts
+                                      (defaults to config.BLOCK_HEAVY_RESOURCES)
+        log_network (bool): Record DevTools network events in the "performance" log (for benchmarks)
+
+    Returns:
+        webdriver.Chrome: Started WebDriver
+    """
+    # Use configuration default if not provided
+    if block_heavy_resources is None:
+        block_heavy_resources = config.BLOCK_HEAVY_RESOURCES
+
+    # Configure Chrome settings
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")  # Run browser in invisible mode
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
+
+    # Additional settings
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-setuid-sandbox")
+    chrome_options.add_argument("--window-size=1920,1080")
+
+    if block_heavy_resources:
+        # Never load images, and never start preview playback
+        chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+        chrome_options.add_argument("--mute-audio")
+
+    if log_network:
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    # Heroku-specific configuration
+    chrome_driver_path = os.environ.get("CHROMEDRIVER_PATH", None)
+
+    if chrome_driver_path:
+        driver = webdriver.Chrome(executable_path=chrome_driver_path, options=chrome_options)
+    else:
+        driver = webdriver.Chrome(options=chrome_options)
+
+    if block_heavy_resources:
+        # Also drop media and font requests (and images requested by CSS or scripts)
+        # before they are sent; the block list stays active for the session's lifetime
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        except Exception:
+            driver.quit()
+            raise
+    return driver
+
+
+class DriverPool:
+    """
+    Keeps up to `size` warm WebDriver sessions and hands them out one query at a time.
+
+    Sessions are started lazily on first use. Each session gets its own profile
+    directory, so several of them can run side by side in the same process. A session
+    that served `max_queries` queries is quit on release and replaced by a fresh one
+    on demand, so memory Chrome leaks over many queries is given back.
+    """
+
+    def __init__(self, size: int = None, max_queries: int = None):
+        # Use configuration defaults if not provided
+        if size is None:
+            size = config.DRIVER_POOL_SIZE
+        if max_queries is None:
+            max_queries = config.CHROME_RECYCLE_QUERIES
+
+        self.size = max(1, size)
+        self.max_queries = max_queries
+        # Idle sessions, most recently used last; guarded by _available together with _created
+        self._idle: List[webdriver.Chrome] = []
+        self._user_data_dirs: Dict[int, str] = {}
+        self._query_counts: Dict[int, int] = {}
+        self._created = 0
+        # Notified whenever a session is released or destroyed, so waiters take it or start a new one
+        self._available = threading.Condition()
+        self._closed = False
+
+    def acquire(self, timeout: float = None) -> webdriver.Chrome:
+        """
+        Takes a session from the pool, starting a new one if the pool is not full yet.
+
+        Args:
+            timeout (float): Seconds to wait for a free session (None waits forever)
+
+        Returns:
+            webdriver.Chrome: WebDriver reserved for the caller
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._available:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Driver pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._created < self.size:
+                    # Reserve the slot, the session is started outside the lock
+                    self._created += 1
+                    break
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No WebDriver became available within {timeout} seconds")
+                self._available.wait(remaining)
+
+        user_data_dir = tempfile.mkdtemp(prefix="chrome_profile_")
+        try:
+            with stage_timer("driver_start"):
+                driver = create_driver(user_data_dir)
+        except Exception:
+            with self._available:
+                self._created -= 1
+                self._available.notify()
+            shutil.rmtree(user_data_dir, ignore_errors=True)
+            raise
+        self._user_data_dirs[id(driver)] = user_data_dir
+        return driver
+
+    def release(self, driver: webdriver.Chrome, discard: bool = False) -> None:
+        """
+        Returns a session to the pool after resetting its state.
+
+        Args:
+            driver (webdriver.Chrome): WebDriver obtained from acquire()
+            discard (bool): Quit the session instead of reusing it (e.g. after a crash)
+        """
+        queries = self._query_counts.get(id(driver), 0) + 1
+        self._query_counts[id(driver)] = queries
+        if not discard and self.max_queries and queries >= self.max_queries:
+            MEMORY_ACTIONS.inc(action="recycle")
+            print(f"WebDriver served {queries} queries, recycling it.")
+            discard = True
+
+        if not discard and not self._closed:
+            try:
+                self._reset(driver)
+                with self._available:
+                    # The pool may have been closed while the session was reset
+                    if not self._closed:
+                        self._idle.append(driver)
+                        self._available.notify()
+                        return
+            except Exception as e:
+                print(f"Could not reset WebDriver, discarding it: {str(e)}")
+
+        self._destroy(driver)
+
+    @contextmanager
+    def driver(self, timeout: float = None) -> Iterator[webdriver.Chrome]:
+        """
+        Context manager that acquires a session and releases it afterwards.
+
+        The session is discarded if the block raises, since its state is unknown.
+        """
+        driver = self.acquire(timeout=timeout)
+        try:
+            yield driver
+        except Exception:
+            self.release(driver, discard=True)
+            raise
+        else:
+            self.release(driver)
+
+    def close(self) -> None:
+        """
+        Quits every idle session. Sessions still in use are quit when released.
+        """
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            # Waiters raise instead of waiting for sessions that are not coming back
+            self._available.notify_all()
+
+        for driver in idle:
+            self._destroy(driver)
+
+    def _reset(self, driver: webdriver.Chrome) -> None:
+        """
+        Clears per-query state so the next query starts from a clean page.
+        """
+        # Close any extra tabs a page might have opened
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        driver.execute_script(
+            "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+        )
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.get("about:blank")
+
+    def _destroy(self, driver: webdriver.Chrome) -> None:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+        # Free the slot and wake a waiter, which starts a new session in its place
+        with self._available:
+            self._created -= 1
+            self._available.notify()
+
+        # Try to clean up the session's profile directory
+        self._query_counts.pop(id(driver), None)
+        user_data_dir = self._user_data_dirs.pop(id(driver), None)
+        if user_data_dir:
+            shutil.rmtree(user_data_dir, ignore_errors=True)
+
+
+_pool: Optional[DriverPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool() -> DriverPool:
+    """
+    Returns the process-wide driver pool, creating it on first use.
+
+    Returns:
+        DriverPool: Shared pool sized by config.DRIVER_POOL_SIZE
+    """
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+            atexit.register(_pool.close)
+        return _pool
@@ -0,0 +1,172 @@
+"""
+Persistent on-disk cache of video embeddability checks.
+"""
+
+import sys
+import time
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+# Import configuration
+sys.path.append('..')
+import config
+
+
+class EmbedCache:
+    """
+    SQLite-backed cache of embeddability verdicts keyed by YouTube video ID.
+
+    Positive and negative verdicts expire after separate TTLs, since a video that
+    is embeddable today is likely to stay so, while a negative may be temporary.
+
+    The database may be shared by several processes (e.g. shards). SQLite errors
+    such as a locked database are treated as misses and skipped writes, so the
+    cache never fails a check.
+    """
+
+    def __init__(self, path: str = None, positive_ttl: float = None, negative_ttl: float = None):
+        """
+        Args:
+            path (str): SQLite database file
+            positive_ttl (float): Seconds an embeddable verdict stays valid
+            negative_ttl (float): Seconds a not-embeddable verdict stays valid
+        """
+        # Use configuration defaults if not provided
+        if path is None:
+            path = config.EMBED_CACHE_PATH
+        if positive_ttl is None:
+            positive_ttl = config.EMBED_CACHE_POSITIVE_TTL_HOURS * 3600
+        if negative_ttl is None:
+            negative_ttl = config.EMBED_CACHE_NEGATIVE_TTL_HOURS * 3600
+
+        self.path = path
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embed_checks ("
+            "video_id TEXT PRIMARY KEY, "
+            "embeddable INTEGER NOT NULL, "
+            "checked_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self.evict_expired()
+
+    def get(self, video_id: str) -> Optional[bool]:
+        """
+        Looks up a cached verdict.
+
+        Args:
+            video_id (str): YouTube video ID
+
+        Returns:
+            bool: Cached verdict, or None if missing, expired or unreadable
+        """
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT embeddable, checked_at FROM embed_checks WHERE video_id = ?", (video_id,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"Could not read the embed cache for Video ID {video_id}: {str(e)}")
+                row = None
+
+            if row is not None:
+                embeddable = bool(row[0])
+                ttl = self.positive_ttl if embeddable else self.negative_ttl
+                if time.time() - row[1] <= ttl:
+                    self.hits += 1
+                    return embeddable
+
+            self.misses += 1
+            return None
+
+    def set(self, video_id: str, embeddable: bool) -> None:
+        """
+        Stores a verdict for a video.
+
+        Args:
+            video_id (str): YouTube video ID
+            embeddable (bool): Result of the embeddability check
+        """
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO embed_checks (video_id, embeddable, checked_at) VALUES (?, ?, ?)",
+                    (video_id, int(embeddable), time.time())
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"Could not write the embed cache for Video ID {video_id}: {str(e)}")
+                self._conn.rollback()
+
+    def evict_expired(self) -> int:
+        """
+        Deletes verdicts older than their TTL.
+
+        Returns:
+            int: Number of evicted entries
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM embed_checks WHERE "
+                "(embeddable = 1 AND checked_at < ?) OR (embeddable = 0 AND checked_at < ?)",
+                (now - self.positive_ttl, now - self.negative_ttl)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns hit/miss counters since creation or the last reset_stats().
+
+        Returns:
+            dict: "hits", "misses" and "saved_requests" (up to two HTTP requests per hit)
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "saved_requests": self.hits * 2
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[EmbedCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_embed_cache() -> Optional[EmbedCache]:
+    """
+    Returns the process-wide embed cache, opening it on first use.
+
+    Returns:
+        EmbedCache: Shared cache, or None if caching is disabled (empty EMBED_CACHE_PATH)
+                    or the cache could not be opened (tried again on the next call)
+    """
+    global _cache
+
+    if not config.EMBED_CACHE_PATH:
+        return None
+
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = EmbedCache()
+            except sqlite3.Error as e:
+                print(f"Could not open the embed cache: {str(e)}")
+        return _cache
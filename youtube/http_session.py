@@ -0,0 +1,50 @@
+"""
+Shared HTTP session for requests to YouTube.
+"""
+
+import sys
+import threading
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+
+# Import configuration
+sys.path.append('..')
+import config
+
+# Headers of a desktop browser, so YouTube serves the same pages it serves to Chrome
+DEFAULT_HEADERS = {
+    'User-Agent': ('Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
+                   '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'),
+    'Accept-Language': 'en-US,en;q=0.9'
+}
+
+_http_session: Optional[requests.Session] = None
+_http_lock = threading.Lock()
+
+def get_http_session() -> requests.Session:
+    """
+    Returns the shared HTTP session used for YouTube requests.
+    
+    The session keeps enough keep-alive connections per host for every concurrent
+    embed check and search, so they reuse connections instead of opening new ones.
+    
+    Returns:
+        requests.Session: Shared session
+    """
+    global _http_session
+    
+    with _http_lock:
+        if _http_session is None:
+            session = requests.Session()
+            session.headers.update(DEFAULT_HEADERS)
+            # Skip the cookie consent interstitial served to some regions
+            session.cookies.set('CONSENT', 'YES+1', domain='.youtube.com')
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=config.EMBED_CHECK_CONCURRENCY + config.SEARCH_WORKERS
+            )
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _http_session = session
+        return _http_session
@@ -0,0 +1,168 @@
+"""
+Memory watchdog for the headless Chrome process tree, based on /proc.
+"""
+
+import os
+import sys
+import threading
+from typing import Dict, List, Optional
+
+# Import configuration
+sys.path.append('..')
+import config
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def process_tree_pids(root_pid: int) -> List[int]:
+    """
+    Returns a process and all of its descendants.
+
+    Args:
+        root_pid (int): PID of the root process (for a WebDriver session, chromedriver)
+
+    Returns:
+        list: PIDs of the tree, the root first
+    """
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces and parentheses, the fields after it do not
+        fields = stat[stat.rindex(b")") + 2:].split()
+        children.setdefault(int(fields[1]), []).append(int(entry))
+
+    pids = [root_pid]
+    for pid in pids:
+        pids.extend(children.get(pid, []))
+    return pids
+
+
+def process_memory(pid: int) -> Optional[int]:
+    """
+    Returns the proportional set size (PSS) of a process in bytes.
+
+    PSS charges each shared page to the processes sharing it in equal parts, so the
+    PSS of several processes adds up to the memory they really use together. Falls
+    back to the RSS on kernels without /proc/<pid>/smaps_rollup (before 4.14).
+
+    Returns:
+        int: Bytes, or None if the process is gone
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "rb") as f:
+            for line in f:
+                if line.startswith(b"Pss:"):
+                    return int(line.split()[1]) * 1024
+    except FileNotFoundError:
+        if not os.path.exists(f"/proc/{pid}"):
+            return None
+    except (OSError, IndexError, ValueError):
+        pass
+
+    try:
+        with open(f"/proc/{pid}/statm", "rb") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def process_tree_memory(root_pid: int) -> Optional[int]:
+    """
+    Returns the memory of a process tree in bytes, the sum of its processes' PSS.
+
+    Memory shared between Chrome's processes (libraries, the zygotes' pages) is
+    counted once, unlike a sum of RSS, which counts it in every process and
+    overstates the tree's memory several times.
+
+    Returns:
+        int: Bytes, or None if the process is gone or /proc is not available
+    """
+    if not os.path.exists(f"/proc/{root_pid}"):
+        return None
+
+    total = 0
+    for pid in process_tree_pids(root_pid):
+        # None if the process exited while the tree was read
+        total += process_memory(pid) or 0
+    return total
+
+
+def driver_pid(driver) -> Optional[int]:
+    """
+    Returns the PID of a WebDriver session's chromedriver process, the root of its Chrome processes.
+    """
+    try:
+        return driver.service.process.pid
+    except AttributeError:
+        return None
+
+
+class MemoryWatchdog:
+    """
+    Samples the memory (PSS) of a browser's process tree on a background thread while a query runs.
+
+    The search loop reads `rss` and `peak` to decide whether to trim the page, stop
+    scrolling or recycle the browser. Without /proc (or a known PID), every reading is 0
+    and no limit is ever reached.
+    """
+
+    def __init__(self, pid: Optional[int], interval: float = None):
+        """
+        Args:
+            pid (int): Root PID of the browser process tree
+            interval (float): Seconds between samples (defaults to config.CHROME_MEMORY_SAMPLE_INTERVAL)
+        """
+        # Use configuration default if not provided
+        if interval is None:
+            interval = config.CHROME_MEMORY_SAMPLE_INTERVAL
+
+        self.pid = pid
+        self.interval = interval
+        self.rss = 0
+        self.peak = 0
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> int:
+        """
+        Reads the current memory of the tree and updates the peak.
+
+        Returns:
+            int: Bytes (0 if unknown)
+        """
+        rss = process_tree_memory(self.pid) if self.pid else None
+        self.rss = rss or 0
+        self.peak = max(self.peak, self.rss)
+        return self.rss
+
+    def start(self) -> "MemoryWatchdog":
+        if self.pid and self.interval > 0:
+            self.sample()
+            self._thread = threading.Thread(target=self._run, name="memory-watchdog", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> int:
+        """
+        Stops sampling after a last sample.
+
+        Returns:
+            int: Peak bytes seen while sampling
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.pid:
+            self.sample()
+        return self.peak
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.sample()
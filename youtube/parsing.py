@@ -0,0 +1,159 @@
+"""
+Parsing of YouTube search result items into video information.
+
+Every search backend turns its results into raw items of the same shape
+(title, text, href, aria_label, view_spans, metadata_spans), which
+parse_result_item() converts into video information.
+"""
+
+import re
+from typing import List, Dict, Any, Optional
+from bs4 import BeautifulSoup
+
+# In-page script returning the result items added since its last call.
+# Items are marked once read, so each call only touches newly rendered results.
+# Items whose title link has not rendered yet are left for the next call.
+NEW_RESULTS_SCRIPT = """
+const items = [];
+document.querySelectorAll('div#dismissible:not([data-scraped])').forEach((element) => {
+    const titleElement = element.querySelector('a#video-title');
+    if (!titleElement || !titleElement.getAttribute('href')) {
+        return;
+    }
+    element.setAttribute('data-scraped', '1');
+    const texts = (selector) => Array.from(element.querySelectorAll(selector), (span) => span.textContent);
+    items.push({
+        title: titleElement.getAttribute('title') || '',
+        text: titleElement.textContent,
+        href: titleElement.getAttribute('href'),
+        aria_label: titleElement.getAttribute('aria-label') || '',
+        view_spans: texts('span.style-scope'),
+        metadata_spans: texts('span.inline-metadata-item')
+    });
+});
+return items;
+"""
+
+def extract_result_items(page_source: str) -> List[Dict[str, Any]]:
+    """
+    Parses the full page with BeautifulSoup and returns the raw data of every result item.
+    
+    Produces the same item shape as NEW_RESULTS_SCRIPT, but re-reads all items on every call.
+    
+    Args:
+        page_source (str): HTML of the search results page
+        
+    Returns:
+        list: Raw result items
+    """
+    soup = BeautifulSoup(page_source, 'html.parser')
+    items = []
+    
+    for element in soup.find_all('div', {'id': 'dismissible'}):
+        title_element = element.find('a', {'id': 'video-title'})
+        if not title_element:
+            continue
+        
+        items.append({
+            'title': title_element.get('title', ''),
+            'text': title_element.text,
+            'href': title_element.get('href', ''),
+            'aria_label': title_element.get('aria-label', ''),
+            'view_spans': [span.text for span in element.find_all('span', {'class': 'style-scope'})],
+            'metadata_spans': [span.text for span in element.find_all('span', {'class': 'inline-metadata-item'})]
+        })
+    
+    return items
+
+def parse_result_item(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Turns a raw result item into video information.
+    
+    Args:
+        item (dict): Raw item from NEW_RESULTS_SCRIPT or extract_result_items()
+        
+    Returns:
+        dict: Video information, or None if the item is not a video
+    """
+    # Get video title and ID
+    title = item.get('title', '')
+    if not title:
+        title = item.get('text', '').strip()
+        
+    video_url = item.get('href', '')
+    if not video_url or not video_url.startswith('/watch?v='):
+        return None
+        
+    video_id = video_url.split('v=')[1].split('&')[0]
+    
+    # Get view count
+    view_count = 0
+    
+    # Check different HTML structures
+    # 1. In new YouTube structure, view info is usually in a span
+    for span_text in item.get('view_spans', []):
+        parsed = parse_view_count(span_text.strip())
+        if parsed is not None:
+            view_count = parsed
+            break
+    
+    # 2. Alternatively, check in aria-label
+    if view_count == 0:
+        aria_label = item.get('aria_label', '')
+        if aria_label:
+            view_count = parse_view_count(aria_label) or 0
+    
+    # 3. Check in metadata
+    if view_count == 0:
+        for span_text in item.get('metadata_spans', []):
+            parsed = parse_view_count(span_text.strip())
+            if parsed is not None:
+                view_count = parsed
+                break
+    
+    return {
+        'title': title,
+        'video_id': video_id,
+        'view_count': view_count,
+        'embed_url': f'https://www.youtube.com/embed/{video_id}',
+        'watch_url': f'https://www.youtube.com/watch?v={video_id}'
+    }
+
+def parse_view_count(text: str) -> Optional[int]:
+    """
+    Parses a view count text such as "1.4M views" or "1,4 Mn görüntüleme".
+    
+    Args:
+        text (str): Text that may contain a view count
+        
+    Returns:
+        int: Number of views, or None if the text has no parsable view count
+    """
+    # Check view count formats (1,4 Mn views, 1.4M views, 756 B views, etc.)
+    view_match = re.search(r'([\d,.]+)\s*(?:B|K|M|Mn|bin|milyon|milyar)?\s*(?:görüntüleme|views)', text)
+    if not view_match:
+        return None
+    
+    try:
+        # Get the base number first
+        if ',' in view_match.group(1) and '.' not in view_match.group(1):
+            # Turkish format: 1,4 Mn
+            view_base = float(view_match.group(1).replace(',', '.'))
+        else:
+            # English format: 1.4M or plain number: 1400
+            view_base = float(view_match.group(1).replace(',', ''))
+    except ValueError:
+        return None
+    
+    # Determine multiplier
+    multiplier = 1
+    if 'B ' in text or 'bin' in text:
+        multiplier = 1000
+    elif 'K' in text:
+        multiplier = 1000
+    elif 'M' in text or 'Mn' in text or 'milyon' in text:
+        multiplier = 1000000
+    elif 'milyar' in text:
+        multiplier = 1000000000
+    
+    return int(view_base * multiplier)
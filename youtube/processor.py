@@ -3,29 +3,167 @@ Process lecture video information from schools, courses, and lectures.
 """
 
 import sys
-from typing import List, Dict, Any
-from .search import get_youtube_videos
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Dict, Any, Optional, Set, Tuple
+from .search import SearchFailed, finish_shared_embed_checks, get_youtube_videos, start_shared_embed_checks
+from .embed_cache import get_embed_cache
+from .rate_limiter import YouTubeThrottled
 
 # Import configuration
 sys.path.append('..')
 import config
+from utils.checkpoint import CheckpointJournal, get_checkpoint_journal
+from utils.metrics import LECTURES, stage_timer
+from utils.lecture_state import (
+    diff_search_results, filter_lectures, get_lecture_state_store, iter_all_lecture_videos, iter_lectures,
+    select_stale_lectures
+)
 
-def get_lecture_videos(schools: List[Dict[str, Any]], max_results_per_lecture: int = None) -> List[Dict[str, Any]]:
+# Receives (lectures done, lectures total, videos found) after each lecture search
+ProgressCallback = Callable[[int, int, int], None]
+
+class SearchCancelled(Exception):
+    """
+    Raised when a lecture search run is cancelled before all lectures were searched.
+    """
+
+def sync_lecture_videos(schools: List[Dict[str, Any]], save: Callable[[List[Dict[str, Any]]], bool],
+                        max_results_per_lecture: int = None, progress: Optional[ProgressCallback] = None,
+                        cancel_event: Optional[threading.Event] = None) -> Tuple[List[Dict[str, Any]], Iterable[Dict[str, Any]], bool]:
+    """
+    Searches only the lectures whose results are stale and saves the lecture videos that changed.
+    
+    Lectures searched within the last LECTURE_FRESHNESS_HOURS keep their previous results.
+    The new results are recorded only if saving the changes succeeds, so failed saves
+    are retried on the next run. If delta sync is disabled (empty LECTURE_STATE_PATH)
+    every lecture is searched and every row is saved.
+    
+    Each finished lecture search is checkpointed to CHECKPOINT_PATH. A run that was
+    interrupted (crash, restart, cancel) or whose save failed resumes from there and
+    only searches the remaining lectures; the checkpoints are removed once saved.
+    
+    Lectures whose search failed or was throttled by YouTube keep their previous
+    results and stay stale, so they are searched again on the next run. A search
+    that worked but found no videos is a real result: it is recorded, and removes
+    the lecture's previous videos.
+    
+    Args:
+        schools (list): List containing school, course, and lecture information
+        save (callable): Saves a list of changed lecture video rows, returns True on success
+        max_results_per_lecture (int): Maximum number of videos to search for per lecture
+        progress (callable): Called after each lecture search, see get_lecture_videos()
+        cancel_event (threading.Event): Set to cancel the run; nothing is saved then
+        
+    Returns:
+        tuple: Changed lecture video rows (with a "changeType"), all current lecture video rows
+               (an iterable to be consumed once, e.g. by save_results_to_json()), and whether
+               saving succeeded (True if there was nothing to save)
+    
+    Raises:
+        SearchCancelled: If `cancel_event` was set before all lectures were searched
+    """
+    store = get_lecture_state_store()
+    checkpoint = get_checkpoint_journal()
+    
+    if store is None:
+        searched_schools = schools
+    else:
+        searched_schools = select_stale_lectures(schools, store)
+        stale_count = sum(1 for _ in iter_lectures(searched_schools))
+        total_count = sum(1 for _ in iter_lectures(schools))
+        print(f"{stale_count} of {total_count} lectures are stale or new and will be searched.")
+    
+    failed: Set[str] = set()
+    lecture_videos = get_lecture_videos(searched_schools, max_results_per_lecture=max_results_per_lecture,
+                                        progress=progress, cancel_event=cancel_event, checkpoint=checkpoint,
+                                        failed=failed)
+    if failed:
+        print(f"{len(failed)} lectures could not be searched (errors or throttling) and keep their previous results.")
+        searched_schools = filter_lectures(searched_schools, lambda lecture: str(lecture["lectureId"]) not in failed)
+    changed_videos, all_videos, saved = save_search_results(schools, searched_schools, lecture_videos, save)
+    
+    if saved and checkpoint is not None:
+        checkpoint.clear()
+    return changed_videos, all_videos, saved
+
+def save_search_results(schools: List[Dict[str, Any]], searched_schools: List[Dict[str, Any]],
+                        lecture_videos: List[Dict[str, Any]], save: Callable[[List[Dict[str, Any]]], bool]
+                        ) -> Tuple[List[Dict[str, Any]], Iterable[Dict[str, Any]], bool]:
+    """
+    Saves the lecture videos that changed in a search and records the new results.
+    
+    Args:
+        schools (list): The whole school, course, and lecture catalog
+        searched_schools (list): Tree of the lectures that were searched
+        lecture_videos (list): Lecture video rows found by the search
+        save (callable): Saves a list of changed lecture video rows, returns True on success
+        
+    Returns:
+        tuple: Changed lecture video rows, all current lecture video rows, and whether saving
+               succeeded (see sync_lecture_videos())
+    """
+    store = get_lecture_state_store()
+    if store is None:
+        return lecture_videos, lecture_videos, (save(lecture_videos) if lecture_videos else True)
+    
+    changed_videos, results = diff_search_results(store, searched_schools, lecture_videos)
+    
+    saved = save(changed_videos) if changed_videos else True
+    if saved:
+        store.put_many(results)
+    
+    return changed_videos, iter_all_lecture_videos(schools, store, results), saved
+
+def get_lecture_videos(schools: List[Dict[str, Any]], max_results_per_lecture: int = None,
+                       max_workers: int = None, progress: Optional[ProgressCallback] = None,
+                       cancel_event: Optional[threading.Event] = None,
+                       checkpoint: Optional[CheckpointJournal] = None,
+                       failed: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
     """
     Searches for YouTube videos for all schools, courses, and lectures and collects the results.
     
+    Lectures with the same search query (e.g. the same course and lecture names
+    under different schools) are searched once and share the results. Embed
+    verdicts are shared across lectures too, so a video found for several lectures
+    is only checked once. Queries are searched by up to `max_workers` threads at
+    once. Results keep the school → course → lecture order regardless of which
+    search finishes first.
+    
     Args:
         schools (list): List containing school, course, and lecture information
         max_results_per_lecture (int): Maximum number of videos to search for per lecture
+        max_workers (int): Number of lecture searches to run in parallel
+        progress (callable): Called with (lectures done, lectures total, videos found)
+                             after each lecture search
+        cancel_event (threading.Event): Set to stop starting new lecture searches
+        checkpoint (CheckpointJournal): Journal that each lecture result is appended to;
+                                        lectures already in it (same query and
+                                        max results) are restored instead of searched.
+                                        Failed searches are not checkpointed, so they
+                                        are searched again on resume.
+        failed (set): Filled with the IDs (as str) of lectures whose search failed or
+                      was throttled by YouTube; they have no rows in the result, which
+                      does not mean that no videos exist for them
         
     Returns:
         list: List of lecture videos
+    
+    Raises:
+        SearchCancelled: If `cancel_event` was set before all lectures were searched
     """
-    # Use configuration default if not provided
+    # Use configuration defaults if not provided
     if max_results_per_lecture is None:
         max_results_per_lecture = config.MAX_RESULTS_PER_LECTURE
+    if max_workers is None:
+        max_workers = config.SEARCH_WORKERS
         
-    lecture_video_list = []
+    # Count embed cache hits for this job only
+    embed_cache = get_embed_cache()
+    if embed_cache is not None:
+        embed_cache.reset_stats()
+        
+    lectures = []
     
     for school in schools:
         school_type = school.get("schoolType", "")
@@ -34,28 +172,175 @@ def get_lecture_videos(schools: List[Dict[str, Any]], max_results_per_lecture: i
             course_name = course["courseName"]
             
             for lecture in course["Lectures"]:
-                lecture_id = lecture["lectureId"]
                 lecture_name = lecture["lectureName"]
-                
+
                 # Create search query - can include school type
-                query = f"{school_type} - {course_name} - {lecture_name}"
-                print(f"\nSearching for: {query}")
-                
-                # Search YouTube
-                videos = get_youtube_videos(query, max_results=max_results_per_lecture)
-                
-                # Add results to list
-                for video in videos:
-                    video_info = {
-                        "lectureId": lecture_id,
-                        "videoName": video["title"],
-                        "youtubeVideoID": video["video_id"],
-                        "url": video["watch_url"],
-                        "embedUrl": video["embed_url"],
-                        "viewCount": video["view_count"]
-                    }
-                    lecture_video_list.append(video_info)
-                    
-                print(f"Found {len(videos)} videos for {lecture_name}.")
-    
-    return lecture_video_list 
\ No newline at end of file
+                lectures.append({
+                    "lectureId": lecture["lectureId"],
+                    "lectureName": lecture_name,
+                    "query": f"{school_type} - {course_name} - {lecture_name}"
+                })
+    
+    # Plan one search per distinct query; lectures with the same query share its results
+    query_groups: Dict[str, List[Dict[str, Any]]] = {}
+    for lecture in lectures:
+        query_groups.setdefault(normalize_query(lecture["query"]), []).append(lecture)
+    groups = list(query_groups.values())
+    
+    # Results of an interrupted run, for lectures searched the same way
+    checkpoints = checkpoint.load() if checkpoint is not None else {}
+    restored = {}
+    for lecture in lectures:
+        entry = checkpoints.get(str(lecture["lectureId"]))
+        if entry and entry["query"] == lecture["query"] and entry["maxResults"] == max_results_per_lecture:
+            restored[str(lecture["lectureId"])] = entry["videos"]
+    if restored:
+        print(f"Resuming from checkpoint: {len(restored)} of {len(lectures)} lectures already searched.")
+    
+    counts = {"lectures": 0, "videos": 0, "skipped": 0, "searches": 0, "shared": 0}
+    counts_lock = threading.Lock()
+    
+    def search(group: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        restored_videos = next(
+            (restored[str(lecture["lectureId"])] for lecture in group if str(lecture["lectureId"]) in restored), None
+        )
+        if restored_videos is not None:
+            found_videos = restored_videos
+            LECTURES.inc(len(group), outcome="restored")
+        # Searches already running finish, but no new ones start after a cancel
+        elif cancel_event is not None and cancel_event.is_set():
+            with counts_lock:
+                counts["skipped"] += len(group)
+            return [[] for _ in group]
+        else:
+            try:
+                with stage_timer("lecture_search"):
+                    found_videos = search_lecture_videos(group[0], max_results_per_lecture)
+            except (SearchFailed, YouTubeThrottled):
+                with counts_lock:
+                    if failed is not None:
+                        failed.update(str(lecture["lectureId"]) for lecture in group)
+                    counts["lectures"] += len(group)
+                    if progress is not None:
+                        progress(counts["lectures"], len(lectures), counts["videos"])
+                return [[] for _ in group]
+            with counts_lock:
+                counts["searches"] += 1
+                counts["shared"] += len(group) - 1
+            LECTURES.inc(outcome="searched")
+            if len(group) > 1:
+                LECTURES.inc(len(group) - 1, outcome="shared")
+        
+        # Fan the shared results out to every lecture of the group
+        group_results = []
+        for lecture in group:
+            lecture_videos = [dict(video, lectureId=lecture["lectureId"]) for video in found_videos]
+            if checkpoint is not None and str(lecture["lectureId"]) not in restored:
+                checkpoint.append(lecture, max_results_per_lecture, lecture_videos)
+            group_results.append(lecture_videos)
+        
+        with counts_lock:
+            counts["lectures"] += len(group)
+            counts["videos"] += len(found_videos) * len(group)
+            if progress is not None:
+                progress(counts["lectures"], len(lectures), counts["videos"])
+        return group_results
+    
+    if progress is not None:
+        progress(0, len(lectures), 0)
+    
+    if len(groups) < len(lectures):
+        print(f"{len(lectures)} lectures share {len(groups)} distinct search queries.")
+    
+    start_shared_embed_checks()
+    try:
+        with stage_timer("crawl"):
+            if max_workers <= 1:
+                group_results = [search(group) for group in groups]
+            else:
+                print(f"Searching {len(groups)} queries with {max_workers} parallel workers...")
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    group_results = list(executor.map(search, groups))
+    finally:
+        shared_stats = finish_shared_embed_checks()
+    
+    if counts["skipped"]:
+        raise SearchCancelled(f"Search cancelled, {counts['skipped']} of {len(lectures)} lectures were not searched")
+    
+    # Restore the school → course → lecture order
+    results_by_lecture = {}
+    for group, results in zip(groups, group_results):
+        for lecture, lecture_videos in zip(group, results):
+            results_by_lecture[id(lecture)] = lecture_videos
+    
+    lecture_video_list = []
+    for lecture in lectures:
+        lecture_video_list.extend(results_by_lecture[id(lecture)])
+    
+    print(f"Ran {counts['searches']} searches for {len(lectures)} lectures "
+          f"(saved {counts['shared']} by sharing identical queries), "
+          f"checked {shared_stats['checks']} distinct videos for embeddability "
+          f"(saved {shared_stats['reused']} checks by sharing verdicts across lectures).")
+    
+    if embed_cache is not None:
+        cache_stats = embed_cache.stats()
+        print(f"Embed cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+              f"saved up to {cache_stats['saved_requests']} HTTP requests.")
+    
+    return lecture_video_list
+
+def normalize_query(query: str) -> str:
+    """
+    Returns the form of a search query used to find identical queries (case and spacing ignored).
+    """
+    return " ".join(query.casefold().split())
+
+def search_lecture_videos(lecture: Dict[str, Any], max_results: int) -> List[Dict[str, Any]]:
+    """
+    Searches YouTube for a single lecture and converts the results to lecture videos.
+    
+    Errors and throttling raise instead of returning an empty result, which would
+    replace the lecture's previous videos; get_lecture_videos() records the lecture
+    as failed and carries on with the others.
+    
+    Args:
+        lecture (dict): Lecture with "lectureId", "lectureName" and "query" keys
+        max_results (int): Maximum number of videos to search for
+        
+    Returns:
+        list: List of lecture videos for this lecture
+    
+    Raises:
+        SearchFailed: If the search failed
+        YouTubeThrottled: If YouTube throttled the search
+    """
+    print(f"\nSearching for: {lecture['query']}")
+    
+    try:
+        # Search YouTube
+        videos = get_youtube_videos(lecture["query"], max_results=max_results)
+    except YouTubeThrottled as e:
+        LECTURES.inc(outcome="throttled")
+        print(f"Search for {lecture['lectureName']} was throttled: {str(e)}")
+        raise
+    except Exception as e:
+        LECTURES.inc(outcome="failed")
+        print(f"Error searching for {lecture['lectureName']}: {str(e)}")
+        if isinstance(e, SearchFailed):
+            raise
+        raise SearchFailed(str(e)) from e
+    
+    lecture_video_list = []
+    for video in videos:
+        video_info = {
+            "lectureId": lecture["lectureId"],
+            "videoName": video["title"],
+            "youtubeVideoID": video["video_id"],
+            "url": video["watch_url"],
+            "embedUrl": video["embed_url"],
+            "viewCount": video["view_count"]
+        }
+        lecture_video_list.append(video_info)
+        
+    print(f"Found {len(videos)} videos for {lecture['lectureName']}.")
+    return lecture_video_list
@@ -0,0 +1,240 @@
+"""
+Process-wide adaptive rate limiter for requests to YouTube.
+"""
+
+import sys
+import time
+import threading
+from typing import Optional
+from urllib.parse import urlparse
+
+# Import configuration
+sys.path.append('..')
+import config
+from utils.metrics import HTTP_ERRORS, THROTTLED_REQUESTS, stage_timer
+
+# Requests per second added to the rate for every second of requests without throttling
+ADDITIVE_INCREASE = 1.0
+
+# Factor applied to the rate when YouTube throttles or fails a request
+MULTIPLICATIVE_DECREASE = 0.5
+
+# Gentler factor applied when responses are slower than YOUTUBE_LATENCY_TARGET
+LATENCY_DECREASE = 0.9
+
+# Longest pause after consecutive throttled responses, in seconds
+MAX_BACKOFF = 300
+
+# Hosts and paths YouTube redirects to instead of serving a page (cookie consent, bot check)
+THROTTLE_HOSTS = ("consent.youtube.com", "consent.google.com")
+THROTTLE_PATHS = ("/sorry/",)
+
+
+class YouTubeThrottled(Exception):
+    """
+    Raised when YouTube answers with a rate limit (429) or a consent/bot check page
+    instead of a result. This is not a verdict about the query or video.
+    """
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket whose rate is adapted with additive increase, multiplicative decrease (AIMD).
+
+    Every request takes a token. Each successful response raises the rate slightly,
+    up to `max_rate`; a throttled or failed response halves it, down to `min_rate`,
+    and a throttled one also pauses all requests (Retry-After, or a backoff that
+    doubles while throttling continues). Responses slower than `latency_target`
+    lower the rate a little. Requests sent before the last decrease do not decrease
+    it again, so a burst of in-flight failures counts as one congestion signal.
+    """
+
+    def __init__(self, rate: float = None, min_rate: float = None, max_rate: float = None,
+                 latency_target: float = None, backoff: float = None):
+        """
+        Args:
+            rate (float): Initial requests per second
+            min_rate (float): Lowest rate the limiter decreases to
+            max_rate (float): Highest rate the limiter increases to
+            latency_target (float): Response time in seconds above which the rate is lowered (0 disables)
+            backoff (float): Seconds to pause after a throttled response without Retry-After
+        """
+        # Use configuration defaults if not provided
+        if rate is None:
+            rate = config.YOUTUBE_RATE_LIMIT
+        if min_rate is None:
+            min_rate = config.YOUTUBE_RATE_MIN
+        if max_rate is None:
+            max_rate = config.YOUTUBE_RATE_MAX
+        if latency_target is None:
+            latency_target = config.YOUTUBE_LATENCY_TARGET
+        if backoff is None:
+            backoff = config.YOUTUBE_THROTTLE_BACKOFF
+
+        self.min_rate = min_rate
+        self.max_rate = max(min_rate, max_rate)
+        self.rate = min(self.max_rate, max(min_rate, rate))
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self._tokens = 1.0
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._throttle_streak = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Blocks until a request may be sent.
+
+        Returns:
+            float: Time the request is sent (time.monotonic()), to pass to record()
+        """
+        with stage_timer("rate_limit_wait"):
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    # The bucket holds at most one second of requests
+                    self._tokens = min(max(1.0, self.rate), self._tokens + (now - self._updated_at) * self.rate)
+                    self._updated_at = now
+
+                    if now >= self._paused_until and self._tokens >= 1:
+                        self._tokens -= 1
+                        return now
+
+                    wait = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+                time.sleep(wait)
+
+    def record(self, sent_at: float, outcome: str, latency: Optional[float] = None,
+               retry_after: Optional[float] = None) -> None:
+        """
+        Adapts the rate to the outcome of a request.
+
+        Args:
+            sent_at (float): Value returned by acquire() for the request
+            outcome (str): "ok", "throttled" (429, consent or bot check page) or "error" (5xx, network error)
+            latency (float): Response time in seconds, if it should be compared with the latency target
+            retry_after (float): Seconds the server asked to wait (throttled responses)
+        """
+        with self._lock:
+            now = time.monotonic()
+
+            if outcome == "ok":
+                self._throttle_streak = 0
+                if self.latency_target and latency is not None and latency > self.latency_target:
+                    self._decrease(sent_at, now, LATENCY_DECREASE)
+                else:
+                    self.rate = min(self.max_rate, self.rate + ADDITIVE_INCREASE / self.rate)
+                return
+
+            if not self._decrease(sent_at, now, MULTIPLICATIVE_DECREASE):
+                return
+
+            if outcome == "throttled":
+                pause = retry_after if retry_after is not None else min(
+                    MAX_BACKOFF, self.backoff * 2 ** self._throttle_streak
+                )
+                self._throttle_streak += 1
+                self._paused_until = max(self._paused_until, now + pause)
+                print(f"YouTube is throttling requests, pausing for {pause:.0f}s "
+                      f"and lowering the rate to {self.rate:.2f}/s.")
+
+    def _decrease(self, sent_at: float, now: float, factor: float) -> bool:
+        # Signals from requests sent before the last decrease were already acted on
+        if sent_at < self._last_decrease:
+            return False
+        self.rate = max(self.min_rate, self.rate * factor)
+        self._tokens = min(self._tokens, 1.0)
+        self._last_decrease = now
+        return True
+
+
+def classify_response(response) -> str:
+    """
+    Classifies a YouTube response for the rate limiter.
+
+    Returns:
+        str: "throttled" for 429 or a consent/bot check page (also after redirects),
+             "error" for 5xx and "ok" otherwise
+    """
+    if response.status_code == 429 or is_throttle_url(response.url):
+        return "throttled"
+
+    return "error" if response.status_code >= 500 else "ok"
+
+
+def is_throttle_url(url: str) -> bool:
+    """
+    Returns True if a request (or the browser) ended up on a consent or bot check page instead of the requested one.
+    """
+    parsed = urlparse(url or "")
+    return parsed.hostname in THROTTLE_HOSTS or any(parsed.path.startswith(path) for path in THROTTLE_PATHS)
+
+
+def limited_request(session, method: str, url: str, target: str, **kwargs):
+    """
+    Sends a request to YouTube through the rate limiter.
+
+    Args:
+        session (requests.Session): Session to send the request with
+        method (str): HTTP method
+        url (str): URL of the request
+        target (str): Target name for the metrics, e.g. "youtube_embed"
+        **kwargs: Passed on to session.request()
+
+    Returns:
+        requests.Response: Response, which may still be a 5xx error
+
+    Raises:
+        YouTubeThrottled: If YouTube throttled the request
+        requests.RequestException: If the request failed without a response
+    """
+    limiter = get_rate_limiter()
+    sent_at = limiter.acquire() if limiter else None
+
+    try:
+        response = session.request(method, url, **kwargs)
+    except Exception:
+        if limiter:
+            limiter.record(sent_at, "error")
+        raise
+
+    outcome = classify_response(response)
+    if limiter:
+        limiter.record(sent_at, outcome, latency=response.elapsed.total_seconds(),
+                       retry_after=_retry_after(response))
+
+    if outcome == "throttled":
+        THROTTLED_REQUESTS.inc(target=target)
+        HTTP_ERRORS.inc(target=target, status=str(response.status_code) if response.status_code == 429 else "consent")
+        raise YouTubeThrottled(f"YouTube throttled the request to {urlparse(url).path}")
+    return response
+
+
+def _retry_after(response) -> Optional[float]:
+    try:
+        return max(0.0, float(response.headers.get("Retry-After")))
+    except (TypeError, ValueError):
+        return None
+
+
+_rate_limiter: Optional[AdaptiveRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> Optional[AdaptiveRateLimiter]:
+    """
+    Returns the process-wide YouTube rate limiter, creating it on first use.
+
+    Returns:
+        AdaptiveRateLimiter: Shared limiter, or None if rate limiting is disabled (YOUTUBE_RATE_LIMIT of 0)
+    """
+    global _rate_limiter
+
+    if config.YOUTUBE_RATE_LIMIT <= 0:
+        return None
+
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = AdaptiveRateLimiter()
+        return _rate_limiter
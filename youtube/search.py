@@ -3,281 +3,459 @@ YouTube search functionality to find embeddable videos.
 """
 
 import time
-import re
-import os
-import tempfile
-from typing import List, Dict, Any, Set
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from bs4 import BeautifulSoup
-import requests
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Set
 import sys
+from .backends import SearchBackend, get_search_backend
+from .embed_cache import get_embed_cache
+from .http_session import get_http_session
+from .parsing import parse_result_item
+from .rate_limiter import YouTubeThrottled, limited_request
 
 # Import configuration
 sys.path.append('..')
 import config
+from utils.metrics import CANDIDATES, EMBED_CHECKS, HTTP_ERRORS, QUERIES, RESULT_PAGES, stage_timer
 
-def get_youtube_videos(query: str, max_results: int = 15) -> List[Dict[str, Any]]:
+# Shared worker pool for embeddability checks
+_embed_executor: Optional[ThreadPoolExecutor] = None
+_embed_lock = threading.Lock()
+
+# Embed verdicts shared by all lectures of the current run (see start_shared_embed_checks)
+_shared_verdicts: Optional[Dict[str, Future]] = None
+_shared_stats = {"checks": 0, "reused": 0}
+_shared_lock = threading.Lock()
+
+class SearchFailed(Exception):
+    """
+    Raised when a search failed on every backend. An empty result list, in contrast,
+    means that the search worked and found no embeddable videos.
+    """
+
+def new_query_stats() -> Dict[str, float]:
+    """
+    Creates empty per-query stats.
+    
+    Returns:
+        dict: "total_time", "wait_time" (waiting for result pages), "work_time"
+              (everything else: parsing, embed checks) in seconds, "pages", and
+              "peak_rss", the browser's peak memory (PSS) in bytes (0 without a browser)
+    """
+    return {"total_time": 0.0, "wait_time": 0.0, "work_time": 0.0, "pages": 0, "peak_rss": 0}
+
+def get_youtube_videos(query: str, max_results: int = 15, stats: Dict[str, float] = None) -> List[Dict[str, Any]]:
     """
     Searches YouTube for a specific query, finds embeddable videos and sorts them by view count.
     
+    The search runs on the SEARCH_BACKEND backend. If it fails, the search is retried
+    on SEARCH_FALLBACK_BACKEND. If every backend fails, or YouTube throttles the search,
+    it raises instead of returning a partial or empty result.
+    
     Args:
         query (str): Search query
         max_results (int): Maximum number of videos to return
+        stats (dict): Optional stats from new_query_stats(), filled with this query's timings
         
     Returns:
         list: List of dictionaries containing video information
+    
+    Raises:
+        SearchFailed: If the search failed on every backend
+        YouTubeThrottled: If YouTube throttled the search or its embed checks
     """
-    # Configure Chrome settings
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")  # Run browser in invisible mode
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    
-    # Specify a unique user data directory
-    temp_dir = os.path.join(tempfile.gettempdir(), f"chrome_temp_{os.getpid()}")
-    chrome_options.add_argument(f"--user-data-dir={temp_dir}")
-    
-    # Additional settings
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--disable-setuid-sandbox")
-    chrome_options.add_argument("--remote-debugging-port=9222")
-    chrome_options.add_argument("--window-size=1920,1080")
-    
-    # Heroku-specific configuration
-    chrome_bin = os.environ.get("GOOGLE_CHROME_BIN", "chrome")
-    chrome_driver_path = os.environ.get("CHROMEDRIVER_PATH", None)
+    if stats is None:
+        stats = new_query_stats()
     
+    backend_names = [config.SEARCH_BACKEND]
+    if config.SEARCH_FALLBACK_BACKEND and config.SEARCH_FALLBACK_BACKEND != config.SEARCH_BACKEND:
+        backend_names.append(config.SEARCH_FALLBACK_BACKEND)
+    
+    start = time.perf_counter()
+    errors = []
     try:
-        # Start WebDriver
-        if chrome_driver_path:
-            driver = webdriver.Chrome(executable_path=chrome_driver_path, options=chrome_options)
-        else:
-            driver = webdriver.Chrome(options=chrome_options)
-        
-        # Go to YouTube search page and search for query (by relevance)
-        driver.get("https://www.youtube.com/results?search_query=" + query.replace(" ", "+"))
-        # Note: CAMSAhAB parameter removed to use default relevance sorting
+        for backend_name in backend_names:
+            try:
+                videos = search_throttled_with_retries(get_search_backend(backend_name), query, max_results, stats)
+            except YouTubeThrottled:
+                # Another backend would hit the same throttling
+                raise
+            except Exception as e:
+                QUERIES.inc(backend=backend_name, outcome="error")
+                print(f"Error while searching with the {backend_name} backend: {str(e)}")
+                errors.append(f"{backend_name}: {str(e)}")
+                continue
+            QUERIES.inc(backend=backend_name, outcome="ok")
+            return videos
         
-        # Wait for page to load
-        time.sleep(3)
-        
-        embeddable_videos = []
-        processed_video_ids: Set[str] = set()  # Track processed video IDs
-        scroll_count = 0
-        min_scrolls = config.MIN_SCROLLS
-        max_scrolls = config.MAX_SCROLLS
+        raise SearchFailed(f"Search for {query!r} failed ({'; '.join(errors)})")
+    finally:
+        stats["total_time"] = time.perf_counter() - start
+        stats["work_time"] = stats["total_time"] - stats["wait_time"]
+        peak_memory = f", peak browser memory {stats['peak_rss'] / 1024 / 1024:.0f}MB" if stats.get("peak_rss") else ""
+        print(f"Query took {stats['total_time']:.1f}s: {stats['wait_time']:.1f}s waiting for "
+              f"{stats['pages']} result pages, {stats['work_time']:.1f}s working{peak_memory}.")
+
+def search_throttled_with_retries(backend: SearchBackend, query: str, max_results: int,
+                                  stats: Dict[str, float]) -> List[Dict[str, Any]]:
+    """
+    Runs search_with_backend(), retrying up to YOUTUBE_THROTTLE_RETRIES times while
+    YouTube throttles it (the rate limiter pauses before each retry).
+    
+    Raises:
+        YouTubeThrottled: If the last attempt was throttled too
+    """
+    for attempt in range(config.YOUTUBE_THROTTLE_RETRIES + 1):
+        try:
+            return search_with_backend(backend, query, max_results, stats)
+        except YouTubeThrottled:
+            QUERIES.inc(backend=backend.name, outcome="throttled")
+            if attempt == config.YOUTUBE_THROTTLE_RETRIES:
+                raise
+            print(f"Search for {query!r} was throttled, retrying.")
+
+def search_with_backend(backend: SearchBackend, query: str, max_results: int,
+                        stats: Dict[str, float] = None) -> List[Dict[str, Any]]:
+    """
+    Runs a search on one backend and collects the embeddable videos.
+    
+    In the "eager" EMBED_CHECK_MODE every new video is checked as soon as its page is read.
+    In the "lazy" mode candidates are collected first and only checked, in descending
+    view count order, once the scroll loop needs to know whether enough embeddable
+    videos exist. Both modes return the same videos.
+    
+    Args:
+        backend (SearchBackend): Backend that fetches the result pages
+        query (str): Search query
+        max_results (int): Maximum number of videos to return
+        stats (dict): Optional stats from new_query_stats(), updated while searching
         
+    Returns:
+        list: List of dictionaries containing video information
+    """
+    if stats is None:
+        stats = new_query_stats()
+    lazy = config.EMBED_CHECK_MODE == "lazy"
+    embeddable_videos = []
+    candidates = []  # Every video seen so far, in page order
+    verdicts: Dict[str, bool] = {}  # Embeddability of checked videos
+    processed_video_ids: Set[str] = set()  # Track processed video IDs
+    scroll_count = 0
+    min_scrolls = config.MIN_SCROLLS
+    max_scrolls = config.MAX_SCROLLS
+    pages = backend.search_pages(query, stats)
+    
+    try:
         # Loop condition: (Not enough videos AND minimum scroll not reached) OR maximum scroll not reached
         while ((len(embeddable_videos) < max_results and scroll_count < min_scrolls) or scroll_count < max_scrolls):
-            # Get page content
-            page_source = driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
+            # Collect video information (the backend scrolls to the next page)
+            raw_items = next(pages, None)
+            if raw_items is None:
+                print("No more result pages.")
+                break
+            stats["pages"] += 1
+            RESULT_PAGES.inc(backend=backend.name)
             
-            # Collect video information
-            video_elements = soup.find_all('div', {'id': 'dismissible'})
+            new_candidates = []  # Videos first seen on this page
             
-            for element in video_elements:
-                # Get video title and ID
-                title_element = element.find('a', {'id': 'video-title'})
-                if not title_element:
+            for item in raw_items:
+                video = parse_result_item(item)
+                if video is None:
                     continue
-                    
-                title = title_element.get('title', '')
-                if not title:
-                    title = title_element.text.strip()
-                    
-                video_url = title_element.get('href', '')
-                if not video_url or not video_url.startswith('/watch?v='):
-                    continue
-                    
-                video_id = video_url.split('v=')[1].split('&')[0]
                 
                 # Has this video ID already been checked?
-                if video_id in processed_video_ids:
+                if video['video_id'] in processed_video_ids:
                     continue
                 
-                processed_video_ids.add(video_id)  # Mark ID as processed
-                
-                # Get view count
-                view_count = 0
-                
-                # Check different HTML structures
-                # 1. In new YouTube structure, view info is usually in a span
-                view_spans = element.find_all('span', {'class': 'style-scope'})
-                for span in view_spans:
-                    span_text = span.text.strip()
-                    # Check view count formats (1,4 Mn views, 1.4M views, 756 B views, etc.)
-                    view_match = re.search(r'([\d,.]+)\s*(?:B|K|M|Mn|bin|milyon|milyar)?\s*(?:görüntüleme|views)', span_text)
-                    if view_match:
-                        try:
-                            # Get the base number first
-                            if ',' in view_match.group(1) and '.' not in view_match.group(1):
-                                # Turkish format: 1,4 Mn
-                                view_base = float(view_match.group(1).replace(',', '.'))
-                            else:
-                                # English format: 1.4M or plain number: 1400
-                                view_base = float(view_match.group(1).replace(',', ''))
-                            
-                            # Determine multiplier
-                            multiplier = 1
-                            if 'B ' in span_text or 'bin' in span_text:
-                                multiplier = 1000
-                            elif 'K' in span_text:
-                                multiplier = 1000
-                            elif 'M' in span_text or 'Mn' in span_text or 'milyon' in span_text:
-                                multiplier = 1000000
-                            elif 'milyar' in span_text:
-                                multiplier = 1000000000
-                            
-                            view_count = int(view_base * multiplier)
-                            break
-                        except ValueError:
-                            continue
-                
-                # 2. Alternatively, check in aria-label
-                if view_count == 0:
-                    aria_label = title_element.get('aria-label', '')
-                    if aria_label:
-                        view_match = re.search(r'([\d,.]+)\s*(?:B|K|M|Mn|bin|milyon|milyar)?\s*(?:görüntüleme|views)', aria_label)
-                        if view_match:
-                            try:
-                                # Get the base number first
-                                if ',' in view_match.group(1) and '.' not in view_match.group(1):
-                                    # Turkish format: 1,4 Mn
-                                    view_base = float(view_match.group(1).replace(',', '.'))
-                                else:
-                                    # English format: 1.4M or plain number: 1400
-                                    view_base = float(view_match.group(1).replace(',', ''))
-                                
-                                # Determine multiplier
-                                multiplier = 1
-                                if 'B ' in aria_label or 'bin' in aria_label:
-                                    multiplier = 1000
-                                elif 'K' in aria_label:
-                                    multiplier = 1000
-                                elif 'M' in aria_label or 'Mn' in aria_label or 'milyon' in aria_label:
-                                    multiplier = 1000000
-                                elif 'milyar' in aria_label or 'Mr' in aria_label:
-                                    multiplier = 1000000000
-                                
-                                view_count = int(view_base * multiplier)
-                            except ValueError:
-                                view_count = 0
-                
-                # 3. Check in metadata
-                if view_count == 0:
-                    meta_spans = element.find_all('span', {'class': 'inline-metadata-item'})
-                    for span in meta_spans:
-                        span_text = span.text.strip()
-                        view_match = re.search(r'([\d,.]+)\s*(?:B|K|M|Mn|bin|milyon|milyar)?\s*(?:görüntüleme|views)', span_text)
-                        if view_match:
-                            try:
-                                # Get the base number first
-                                if ',' in view_match.group(1) and '.' not in view_match.group(1):
-                                    # Turkish format: 1,4 Mn
-                                    view_base = float(view_match.group(1).replace(',', '.'))
-                                else:
-                                    # English format: 1.4M or plain number: 1400
-                                    view_base = float(view_match.group(1).replace(',', ''))
-                                
-                                # Determine multiplier
-                                multiplier = 1
-                                if 'B ' in span_text or 'bin' in span_text:
-                                    multiplier = 1000
-                                elif 'K' in span_text:
-                                    multiplier = 1000
-                                elif 'M' in span_text or 'Mn' in span_text or 'milyon' in span_text:
-                                    multiplier = 1000000
-                                elif 'milyar' in span_text or 'Mr' in span_text:
-                                    multiplier = 1000000000
-                                
-                                view_count = int(view_base * multiplier)
-                                break
-                            except ValueError:
-                                continue
-                
-                # Check embeddability immediately
-                if check_embeddable(video_id):
-                    video_info = {
-                        'title': title,
-                        'video_id': video_id,
-                        'view_count': view_count,
-                        'embed_url': f'https://www.youtube.com/embed/{video_id}',
-                        'watch_url': f'https://www.youtube.com/watch?v={video_id}'
-                    }
-                    embeddable_videos.append(video_info)
-                    print(f"Found embeddable video ({len(embeddable_videos)}/{max_results}): {title}")
+                processed_video_ids.add(video['video_id'])  # Mark ID as processed
+                new_candidates.append(video)
+            
+            candidates.extend(new_candidates)
+            CANDIDATES.inc(len(new_candidates))
+            
+            # A page without new videos means more scrolling will not help
+            stop_early = config.ADAPTIVE_SCROLL and not new_candidates
+            
+            if not lazy:
+                # Check this page's new videos together
+                verdicts.update(check_embeddable_batch([video['video_id'] for video in new_candidates]))
+                for video_info in new_candidates:
+                    if verdicts[video_info['video_id']]:
+                        embeddable_videos.append(video_info)
+                        print(f"Found embeddable video ({len(embeddable_videos)}/{max_results}): {video_info['title']}")
             
-            # Scroll down to load more videos
-            driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.END)
-            time.sleep(2)
             scroll_count += 1
-            print(f"Page scrolled ({scroll_count}/{max_scrolls}), found {len(embeddable_videos)} embeddable videos so far.")
+            
+            # The loop only needs the embeddable count from here on
+            if lazy and (scroll_count >= min_scrolls or scroll_count >= max_scrolls or stop_early):
+                embeddable_videos = find_top_embeddable(candidates, verdicts, max_results)
+            
+            print(f"Results page processed ({scroll_count}/{max_scrolls}), {len(candidates)} candidates, "
+                  f"found {len(embeddable_videos)} embeddable videos so far.")
             
             # Check if we've scrolled the minimum number of times and found enough videos
             if scroll_count >= min_scrolls and len(embeddable_videos) >= max_results:
                 print(f"Exceeded minimum scroll count ({min_scrolls}) and found enough videos ({len(embeddable_videos)}). Stopping.")
                 break
-                
-        # Sort results by view count
-        embeddable_videos.sort(key=lambda x: x['view_count'], reverse=True)
-        return embeddable_videos[:max_results]  # Return only the requested number of videos
+            
+            if stop_early:
+                print("Page added no new videos. Stopping.")
+                break
+    finally:
+        pages.close()
+    
+    if lazy:
+        embeddable_videos = find_top_embeddable(candidates, verdicts, max_results)
+        for index, video_info in enumerate(embeddable_videos, 1):
+            print(f"Found embeddable video ({index}/{max_results}): {video_info['title']}")
+        print(f"Checked {len(verdicts)} of {len(candidates)} candidates for embeddability.")
+            
+    # Sort results by view count
+    embeddable_videos.sort(key=lambda x: x['view_count'], reverse=True)
+    return embeddable_videos[:max_results]  # Return only the requested number of videos
+
+def find_top_embeddable(candidates: List[Dict[str, Any]], verdicts: Dict[str, bool],
+                        max_results: int) -> List[Dict[str, Any]]:
+    """
+    Finds the most viewed embeddable candidates, checking as few videos as possible.
+    
+    Candidates are checked in descending view count order (page order breaks ties),
+    one batch per round. A round only checks as many videos as could still fill the
+    remaining slots, so checking stops once `max_results` videos are confirmed.
+    
+    Args:
+        candidates (list): Videos in page order
+        verdicts (dict): Known embeddability by video ID, updated with new checks
+        max_results (int): Number of embeddable videos wanted
         
-    except Exception as e:
-        print(f"Error while starting WebDriver: {str(e)}")
-        return []
+    Returns:
+        list: Up to `max_results` embeddable videos, most viewed first
+    """
+    ranked = sorted(candidates, key=lambda x: x['view_count'], reverse=True)
+    
+    while True:
+        found = []
+        to_check = []
         
-    finally:
-        try:
-            driver.quit()
-        except:
-            pass
+        for video in ranked:
+            if len(found) + len(to_check) >= max_results:
+                break
+            
+            verdict = verdicts.get(video['video_id'])
+            if verdict is None:
+                to_check.append(video['video_id'])
+            elif verdict:
+                found.append(video)
         
-        # Try to clean up temporary directory
-        try:
-            import shutil
-            shutil.rmtree(temp_dir, ignore_errors=True)
-        except:
-            pass
+        if not to_check:
+            return found
+        
+        verdicts.update(check_embeddable_batch(to_check))
+
+def start_shared_embed_checks() -> None:
+    """
+    Starts sharing embed verdicts between lectures until finish_shared_embed_checks().
+    
+    While sharing, each video is checked at most once: a video that shows up for
+    several lectures, or in parallel searches at the same time, reuses the first
+    check's verdict instead of checking again.
+    """
+    global _shared_verdicts
+    
+    with _shared_lock:
+        _shared_verdicts = {}
+        _shared_stats.update(checks=0, reused=0)
+
+def finish_shared_embed_checks() -> Dict[str, int]:
+    """
+    Stops sharing embed verdicts.
+    
+    Returns:
+        dict: "checks" (videos checked) and "reused" (checks saved by reusing a verdict)
+    """
+    global _shared_verdicts
+    
+    with _shared_lock:
+        _shared_verdicts = None
+        return dict(_shared_stats)
 
 def check_embeddable(video_id: str) -> bool:
     """
-    Checks if a video is embeddable.
+    Checks if a video is embeddable, reusing verdicts shared within the current run
+    and the persistent embed cache when enabled.
+    
+    A check that YouTube throttles is retried up to YOUTUBE_THROTTLE_RETRIES times
+    (the rate limiter pauses in between). Throttling and network errors are never
+    taken for a negative verdict: they are neither cached nor shared, and raise so
+    that the lecture fails and keeps its previous videos. Lectures waiting for the
+    same check get the same error.
     
     Args:
         video_id (str): YouTube video ID
         
     Returns:
         bool: True if video is embeddable, False otherwise
+    
+    Raises:
+        YouTubeThrottled: If no verdict could be obtained because YouTube kept throttling
+        requests.RequestException: If a request failed before returning a response
     """
+    shared = None
+    future = None
+    with _shared_lock:
+        if _shared_verdicts is not None:
+            shared = _shared_verdicts.get(video_id)
+            if shared is None:
+                future = _shared_verdicts[video_id] = Future()
+                _shared_stats["checks"] += 1
+            else:
+                _shared_stats["reused"] += 1
+    
+    if shared is not None:
+        # Checked (or being checked) for another lecture
+        return shared.result()
+    
     try:
-        # Make direct request to embed URL and check status code
-        embed_url = f'https://www.youtube.com/embed/{video_id}'
-        response = requests.get(embed_url, timeout=5, allow_redirects=True)
-        
-        # 401 Unauthorized or other error codes mean not embeddable
-        if response.status_code != 200:
-            print(f"Video ID {video_id} not embeddable. HTTP status code: {response.status_code}")
-            return False
-            
-        # Check response content for "Video unavailable" or similar phrases
-        if "Video unavailable" in response.text or "UNPLAYABLE" in response.text:
-            print(f"Video ID {video_id} not embeddable. Content unavailable.")
-            return False
-            
-        # Additional check: also use oEmbed API
-        oembed_url = f'https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json'
-        oembed_response = requests.get(oembed_url, timeout=5)
-        
-        if oembed_response.status_code != 200:
-            print(f"oEmbed API error for Video ID {video_id}: {oembed_response.status_code}")
-            return False
-            
-        return True
+        embeddable = _check_embeddable_unshared(video_id)
+    except BaseException as e:
+        if future is not None:
+            # Resolve the shared check whatever went wrong, so waiting lectures never hang
+            _forget_shared_verdict(video_id, future)
+            future.set_exception(e)
+        raise
+    
+    if future is not None:
+        future.set_result(embeddable)
+    return embeddable
+
+def _check_embeddable_unshared(video_id: str) -> bool:
+    cache = get_embed_cache()
+    if cache is not None:
+        cached = cache.get(video_id)
+        if cached is not None:
+            return cached
+    
+    try:
+        with stage_timer("embed_check"):
+            embeddable = fetch_embeddable(video_id)
+            for _ in range(config.YOUTUBE_THROTTLE_RETRIES):
+                if embeddable is not None:
+                    break
+                embeddable = fetch_embeddable(video_id)
     except Exception as e:
+        # Network errors are not a verdict
+        EMBED_CHECKS.inc(result="error")
+        HTTP_ERRORS.inc(target="youtube_embed", status=type(e).__name__)
         print(f"Error during embed check for Video ID {video_id}: {str(e)}")
-        return False 
\ No newline at end of file
+        raise
+    
+    if embeddable is None:
+        EMBED_CHECKS.inc(result="throttled")
+        raise YouTubeThrottled(f"YouTube kept throttling the embed check for Video ID {video_id}")
+    
+    EMBED_CHECKS.inc(result="embeddable" if embeddable else "not_embeddable")
+    if cache is not None:
+        cache.set(video_id, embeddable)
+    return embeddable
+
+def _forget_shared_verdict(video_id: str, future: Future) -> None:
+    with _shared_lock:
+        if _shared_verdicts is not None and _shared_verdicts.get(video_id) is future:
+            del _shared_verdicts[video_id]
+
+def check_embeddable_batch(video_ids: List[str]) -> Dict[str, bool]:
+    """
+    Checks several videos concurrently.
+    
+    Checks run on a shared thread pool of EMBED_CHECK_CONCURRENCY workers, which caps
+    the number of checks in flight across all callers, and reuse pooled keep-alive
+    connections from the shared HTTP session.
+    
+    Args:
+        video_ids (list): YouTube video IDs (duplicates are checked once)
+        
+    Returns:
+        dict: Mapping of video ID to True if embeddable, False otherwise
+    
+    Raises:
+        YouTubeThrottled: If YouTube kept throttling one of the checks
+        requests.RequestException: If one of the checks failed on the network
+    """
+    unique_ids = list(dict.fromkeys(video_ids))
+    if not unique_ids:
+        return {}
+    
+    if len(unique_ids) == 1:
+        return {unique_ids[0]: check_embeddable(unique_ids[0])}
+    
+    verdicts = _get_embed_executor().map(check_embeddable, unique_ids)
+    return dict(zip(unique_ids, verdicts))
+
+def fetch_embeddable(video_id: str) -> bool:
+    """
+    Checks over HTTP if a video is embeddable, bypassing the cache.
+    
+    Both requests go through the shared YouTube rate limiter.
+    
+    Args:
+        video_id (str): YouTube video ID
+        
+    Returns:
+        bool: True if video is embeddable, False if not, and None if there is no verdict
+              because YouTube throttled a request or answered with a server error
+        
+    Raises:
+        requests.RequestException: If a request fails before returning a response
+    """
+    # Make direct request to embed URL and check status code
+    embed_url = f'{config.YOUTUBE_BASE_URL}/embed/{video_id}'
+    session = get_http_session()
+    try:
+        response = limited_request(session, "GET", embed_url, "youtube_embed", timeout=5, allow_redirects=True)
+    except YouTubeThrottled:
+        print(f"Embed check for Video ID {video_id} was throttled.")
+        return None
+    
+    if response.status_code >= 500:
+        HTTP_ERRORS.inc(target="youtube_embed", status=str(response.status_code))
+        print(f"Embed check for Video ID {video_id} failed. HTTP status code: {response.status_code}")
+        return None
+    
+    # 401 Unauthorized or other error codes mean not embeddable
+    if response.status_code != 200:
+        print(f"Video ID {video_id} not embeddable. HTTP status code: {response.status_code}")
+        return False
+        
+    # Check response content for "Video unavailable" or similar phrases
+    if "Video unavailable" in response.text or "UNPLAYABLE" in response.text:
+        print(f"Video ID {video_id} not embeddable. Content unavailable.")
+        return False
+        
+    # Additional check: also use oEmbed API
+    oembed_url = f'{config.YOUTUBE_BASE_URL}/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json'
+    try:
+        oembed_response = limited_request(session, "GET", oembed_url, "youtube_oembed", timeout=5)
+    except YouTubeThrottled:
+        print(f"oEmbed check for Video ID {video_id} was throttled.")
+        return None
+    
+    if oembed_response.status_code >= 500:
+        HTTP_ERRORS.inc(target="youtube_oembed", status=str(oembed_response.status_code))
+        print(f"oEmbed API error for Video ID {video_id}: {oembed_response.status_code}")
+        return None
+    
+    if oembed_response.status_code != 200:
+        print(f"oEmbed API error for Video ID {video_id}: {oembed_response.status_code}")
+        return False
+        
+    return True
+
+def _get_embed_executor() -> ThreadPoolExecutor:
+    global _embed_executor
+    
+    with _embed_lock:
+        if _embed_executor is None:
+            _embed_executor = ThreadPoolExecutor(
+                max_workers=config.EMBED_CHECK_CONCURRENCY, thread_name_prefix="embed-check"
+            )
+        return _embed_executor